@@ -7,8 +7,12 @@ With Background Scheduler for Real-time Job Scraping
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from logging.handlers import QueueHandler, QueueListener
+import atexit
 import logging
 import os
+import queue
+import threading
 import time
 from dotenv import load_dotenv
 
@@ -20,6 +24,24 @@ logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
+
+
+class _DeferredFormatQueueHandler(QueueHandler):
+    """QueueHandler that enqueues the record as-is (the stock prepare() formats it first)"""
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The queue is in-process, so nothing needs to be pickled
+        return record
+
+
+# Log calls only enqueue the record; a listener thread does the formatting + I/O
+_log_queue = queue.SimpleQueue()
+_root_logger = logging.getLogger()
+_log_listener = QueueListener(_log_queue, *_root_logger.handlers, respect_handler_level=True)
+_root_logger.handlers = [_DeferredFormatQueueHandler(_log_queue)]
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 logger = logging.getLogger(__name__)
 
 # ========================================
@@ -161,17 +183,14 @@ async def startup_event():
         logger.error(f"❌ Database initialization failed: {e}")
         logger.warning("⚠️  API will run in limited mode")
     
-    # Preload AI model
-    logger.info("🤖 Loading BAAI High-Accuracy AI Model...")
-    logger.info("   📥 First time download may take 2-3 minutes...")
-    try:
-        from app.services.ai_matcher import get_matcher
-        matcher = get_matcher()
-        logger.info("✅ BAAI AI model loaded successfully!")
+    # Preload AI model in the background (set MATCHER_PRELOAD=false to disable)
+    # Started here rather than at import time so no loader thread is running
+    # when a prefork server/worker forks; CUDA warmup runs inside the loader
+    if os.getenv("MATCHER_PRELOAD", "true").lower() == "true":
+        logger.info("🤖 Loading BAAI High-Accuracy AI Model in the background...")
         logger.info(f"   Model: {os.getenv('EMBEDDING_MODEL', 'BAAI/bge-base-en-v1.5')}")
-        logger.info(f"   Dimensions: 768 (High Accuracy)")
-    except Exception as e:
-        logger.error(f"❌ AI model loading failed: {e}")
+        from app.services.ai_matcher import _preload_matcher
+        threading.Thread(target=_preload_matcher, name="matcher-preload", daemon=True).start()
     
     # Check Pinecone connection
     logger.info("🔢 Checking Pinecone connection...")
@@ -234,6 +253,15 @@ async def shutdown_event():
     except Exception as e:
         logger.error(f"❌ Error stopping scheduler: {e}")
     
+    # Close pooled SMTP connections
+    try:
+        from app.services.email_service import get_email_service
+        email_service = get_email_service()
+        await email_service.close_async()
+        email_service.close_all()
+    except Exception as e:
+        logger.error(f"❌ Error closing SMTP connections: {e}")
+    
     logger.info("✅ Cleanup complete")
     logger.info("👋 Goodbye!")
 
@@ -470,8 +498,8 @@ async def get_api_stats():
         firebase = get_firebase_service()
         
         # Get counts
-        jobs = firebase.get_all_jobs(limit=1000)
-        internships = firebase.get_all_internships(limit=1000)
+        jobs = firebase.get_all_jobs(limit=1000, fields=["is_active", "source"])
+        internships = firebase.get_all_internships(limit=1000, fields=["is_active"])
         
         return {
             "total_jobs": len(jobs),
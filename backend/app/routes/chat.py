@@ -5,9 +5,10 @@ AI chat interface for user queries
 
 from fastapi import APIRouter, HTTPException, status
 from pydantic import BaseModel
+import asyncio
 import logging
 
-from app.services.database import get_firebase_service
+from app.services.database import get_firebase_async_service
 from app.services.chat_service import get_chat_service
 
 router = APIRouter(prefix="/api/chat", tags=["chat"])
@@ -42,10 +43,14 @@ async def send_message(chat: ChatMessage):
     
     logger.info(f"💬 Chat message from user {chat.user_id}: {chat.message[:50]}...")
     
-    firebase = get_firebase_service()
+    firebase = get_firebase_async_service()
     
-    # Get user
-    user = firebase.get_user(chat.user_id)
+    # Independent reads, awaited together - latency is the slowest RPC, not the sum
+    user, applications, rejections = await asyncio.gather(
+        firebase.get_user_async(chat.user_id),
+        firebase.get_user_applications_async(chat.user_id),
+        firebase.get_user_rejections_async(chat.user_id)
+    )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -58,31 +63,31 @@ async def send_message(chat: ChatMessage):
         "full_name": user.get("full_name", "User"),
         "email": user.get("email"),
         "skills": user.get("skills", []),
+        "skills_csv": user.get("skills_csv"),
         "experience_level": user.get("experience_level", "entry"),
         "interests": user.get("interests", ""),
         "career_goals": user.get("career_goals", ""),
-        "total_applications": 0
+        "total_applications": len(applications)
     }
     
-    # Get user's applications
-    applications = firebase.get_user_applications(chat.user_id)
-    user_data["total_applications"] = len(applications)
-    
-    # Get rejections
+    # Index rejection details by application
     rejections_data = []
+    rejections_by_application = {}
+    for rejection in rejections:
+        rejections_by_application.setdefault(rejection.get("application_id"), []).append(rejection)
+    
     for app in applications:
         if app.get("status") == "rejected":
             # Get rejection details
-            rejections = firebase.get_user_rejections(chat.user_id)
-            for rejection in rejections:
-                if rejection.get("application_id") == app.get("id"):
-                    rejections_data.append({
-                        "job_id": app.get("job_id"),
-                        "internship_id": app.get("internship_id"),
-                        "skill_gaps": rejection.get("skill_gaps", []),
-                        "reason": rejection.get("reason"),
-                        "job_experience_required": "mid"  # Simplified
-                    })
+            for rejection in rejections_by_application.get(app.get("id"), []):
+                rejections_data.append({
+                    "job_id": app.get("job_id"),
+                    "internship_id": app.get("internship_id"),
+                    "skill_gaps": rejection.get("skill_gaps", []),
+                    "reason": rejection.get("reason"),
+                    "created_at": rejection.get("created_at"),
+                    "job_experience_required": "mid"  # Simplified
+                })
     
     # Get top missing skills
     all_skill_gaps = []
@@ -103,7 +108,7 @@ async def send_message(chat: ChatMessage):
     
     # Get chat service and process
     chat_service = get_chat_service()
-    response_text = chat_service.process_message(
+    response_text = await chat_service.process_message(
         chat.message,
         user_data,
         context,
@@ -126,10 +131,10 @@ async def get_chat_history(user_id: str):
     (Optional feature - not implemented in MVP)
     """
     
-    firebase = get_firebase_service()
+    firebase = get_firebase_async_service()
     
     # Verify user exists
-    user = firebase.get_user(user_id)
+    user = await firebase.get_user_async(user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
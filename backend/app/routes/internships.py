@@ -71,6 +71,13 @@ async def create_internship(internship_data: InternshipCreate):
         "is_active": True
     }
     
+    # Reject duplicates explicitly (manual listings get auto-IDs, so Firestore won't)
+    if firebase.check_internship_exists(internship_data.title, internship_data.company):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Internship already exists: {internship_data.title} at {internship_data.company}"
+        )
+    
     # Create in Firebase
     internship_id = firebase.create_internship(internship_dict)
     
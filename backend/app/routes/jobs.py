@@ -82,6 +82,13 @@ async def create_job(job_data: JobCreate, notify_users: bool = True):
         "is_active": True
     }
     
+    # Reject duplicates explicitly (manual listings get auto-IDs, so Firestore won't)
+    if firebase.check_job_exists(job_data.title, job_data.company):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job already exists: {job_data.title} at {job_data.company}"
+        )
+    
     # Create in Firebase
     job_id = firebase.create_job(job_dict)
     
@@ -124,7 +131,10 @@ async def create_job(job_data: JobCreate, notify_users: bool = True):
                 job_data=job_dict,
                 job_id=job_id
             )
-            logger.info(f"📧 Notifications sent: {notification_stats['emails_sent']}")
+            logger.info(
+                f"📧 Notifications sent: {notification_stats['emails_sent']}, "
+                f"queued: {notification_stats.get('emails_queued', 0)}"
+            )
         except Exception as e:
             logger.error(f"⚠️ Notification error: {e}")
     
@@ -269,8 +279,8 @@ async def update_job(job_id: str, job_data: JobUpdate):
     
     logger.info(f"✅ Job updated: {job_id}")
     
-    # Re-generate embedding if description changed
-    if job_data.description is not None or job_data.required_skills is not None:
+    # Re-generate embedding if the embedded text changed
+    if job_data.title is not None or job_data.description is not None or job_data.required_skills is not None:
         try:
             matcher = get_matcher()
             pinecone = get_pinecone_service()
@@ -281,6 +291,9 @@ async def update_job(job_id: str, job_data: JobUpdate):
             # Create new embedding
             job_embedding = matcher.create_job_embedding(updated_job)
             
+            # Refresh the in-memory ranking corpus with the same vector
+            matcher.upsert_jobs([{**updated_job, 'id': job_id}], embeddings=job_embedding)
+            
             # Update in Pinecone
             pinecone.upsert_job_embedding(
                 job_id=job_id,
@@ -343,6 +356,9 @@ async def delete_job(job_id: str):
             detail="Failed to delete job"
         )
     
+    # Drop from the in-memory ranking corpus
+    get_matcher().remove_jobs([job_id])
+    
     return {
         "message": "Job deleted successfully",
         "job_id": job_id
@@ -416,68 +432,57 @@ async def trigger_job_scraping(
     skipped_count = 0
     total_emails_sent = 0
     
+    # Ensure URL field exists
     for job_data in all_jobs:
+        if "url" not in job_data or not job_data["url"]:
+            job_data["url"] = job_data.get("external_url", "")
+    
+    # Store in Firebase with batched writes - document IDs are derived from
+    # (title, company), so Firestore itself skips jobs we already have
+    job_ids = firebase.bulk_create_jobs(all_jobs)
+    stored_jobs = []
+    
+    for job_data, job_id in zip(all_jobs, job_ids):
+        if not job_id:
+            skipped_count += 1
+            continue
+        
+        logger.info(f"💾 Stored: {job_data['title']} at {job_data['company']}")
+        stored_count += 1
+        stored_jobs.append((job_data, job_id))
+    
+    # Embed all new jobs in one forward pass and store them in batched upserts
+    if stored_jobs:
         try:
-            # Check if job already exists (avoid duplicates)
-            if firebase.check_job_exists(job_data["title"], job_data["company"]):
-                skipped_count += 1
-                continue
-            
-            # Ensure URL field exists
-            if "url" not in job_data or not job_data["url"]:
-                job_data["url"] = job_data.get("external_url", "")
-            
-            # Store in Firebase
-            job_id = firebase.create_job(job_data)
+            job_embeddings = matcher.create_job_embeddings([job_data for job_data, _ in stored_jobs])
             
-            if not job_id:
-                logger.warning(f"⚠️ Failed to store job: {job_data['title']}")
-                continue
-            
-            logger.info(f"💾 Stored: {job_data['title']} at {job_data['company']}")
+            pinecone.upsert_job_embeddings([
+                (job_id, job_embedding, {
+                    "job_id": job_id,
+                    "title": job_data["title"],
+                    "company": job_data["company"],
+                    "type": "job",
+                    "source": job_data.get("source", "unknown")
+                })
+                for (job_data, job_id), job_embedding in zip(stored_jobs, job_embeddings)
+            ])
+            logger.debug(f"   📊 {len(stored_jobs)} embeddings stored in Pinecone")
             
-            # Create embedding
-            try:
-                job_embedding = matcher.create_job_embedding(job_data)
-                
-                # Store in Pinecone
-                pinecone.upsert_job_embedding(
-                    job_id=job_id,
-                    embedding=job_embedding,
-                    metadata={
-                        "job_id": job_id,
-                        "title": job_data["title"],
-                        "company": job_data["company"],
-                        "type": "job",
-                        "source": job_data.get("source", "unknown")
-                    }
-                )
-                logger.debug(f"   📊 Embedding stored in Pinecone")
+        except Exception as e:
+            logger.error(f"⚠️ Embedding error: {e}")
+    
+    # 🔔 Notify matching users via email (one batched embedding + search for all new jobs)
+    if notify_users and stored_jobs:
+        try:
+            for stats in notification_service.notify_matching_users_for_jobs(stored_jobs):
+                emails_sent = stats.get("emails_sent", 0)
+                total_emails_sent += emails_sent
                 
-            except Exception as e:
-                logger.error(f"⚠️ Embedding error for {job_data['title']}: {e}")
-            
-            stored_count += 1
-            
-            # 🔔 Notify matching users via email
-            if notify_users:
-                try:
-                    stats = notification_service.notify_matching_users_for_job(
-                        job_data=job_data,
-                        job_id=job_id
-                    )
-                    emails_sent = stats.get("emails_sent", 0)
-                    total_emails_sent += emails_sent
+                if emails_sent > 0:
+                    logger.info(f"   📧 Notified {emails_sent} users for {stats['job_title']}")
                     
-                    if emails_sent > 0:
-                        logger.info(f"   📧 Notified {emails_sent} users")
-                        
-                except Exception as e:
-                    logger.error(f"⚠️ Notification error: {e}")
-            
         except Exception as e:
-            logger.error(f"❌ Error processing job: {e}")
-            continue
+            logger.error(f"⚠️ Notification error: {e}")
     
     logger.info("=" * 50)
     logger.info(f"🎉 Job scraping complete!")
@@ -531,7 +536,11 @@ async def get_job_sources_stats():
     firebase = get_firebase_service()
     
     # Get all jobs
-    all_jobs = firebase.get_all_jobs(limit=500, is_active=True)
+    all_jobs = firebase.get_all_jobs(
+        limit=500,
+        is_active=True,
+        fields=["source", "job_type", "location"]
+    )
     
     # Count by source
     sources = {}
@@ -606,7 +615,8 @@ async def search_jobs(
     results = pinecone.find_matching_jobs(
         user_embedding=query_embedding,
         top_k=limit * 2,  # Get extra for filtering
-        filter_dict=filter_dict
+        filter_dict=filter_dict,
+        fields=[]  # full jobs are read from Firebase
     )
     
     if not results:
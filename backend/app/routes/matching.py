@@ -3,7 +3,7 @@ Matching Routes
 AI-powered job matching
 """
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, status
 from pydantic import BaseModel
 from typing import List, Optional
 import logging
@@ -11,6 +11,7 @@ import logging
 from app.services.database import get_firebase_service
 from app.services.ai_matcher import get_matcher
 from app.services.pinecone_service import get_pinecone_service
+from app.services.statistics_service import get_statistics_service
 
 router = APIRouter(prefix="/api/matching", tags=["matching"])
 logger = logging.getLogger(__name__)
@@ -231,6 +232,8 @@ async def create_application(application: ApplicationCreate):
             detail="Failed to record application"
         )
     
+    get_statistics_service().invalidate(application.user_id)
+    
     logger.info(f"✅ Application recorded: {app_id}")
     
     return {
@@ -243,7 +246,7 @@ async def create_application(application: ApplicationCreate):
 @router.put("/application/{application_id}/status")
 async def update_application_status(
     application_id: str,
-    status: str,
+    new_status: str = Query(..., alias="status"),
     skill_gaps: Optional[List[str]] = None
 ):
     """
@@ -253,13 +256,22 @@ async def update_application_status(
     - If rejected, creates rejection record for analysis
     """
     
-    logger.info(f"📝 Updating application {application_id} to {status}")
+    logger.info(f"📝 Updating application {application_id} to {new_status}")
     
     firebase = get_firebase_service()
     
-    # Update application
-    updates = {"status": status}
-    success = firebase.update_application(application_id, updates)
+    # Owner is needed for the rejection record and the stats invalidation
+    application = firebase.get_application(application_id)
+    if not application:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Application not found"
+        )
+    
+    user_id = application.get("user_id")
+    
+    # Update application (also drops the owner's cached statistics)
+    success = firebase.update_application_status(application_id, new_status, user_id=user_id)
     
     if not success:
         raise HTTPException(
@@ -268,10 +280,9 @@ async def update_application_status(
         )
     
     # If rejected, create rejection record
-    if status == "rejected":
-        # Get application details (simplified - you'd fetch from Firebase)
+    if new_status == "rejected":
         rejection_data = {
-            "user_id": "user_id_here",  # You'd get this from application
+            "user_id": user_id,
             "application_id": application_id,
             "reason": "skill_gap" if skill_gaps else "other",
             "skill_gaps": skill_gaps or [],
@@ -284,7 +295,7 @@ async def update_application_status(
     return {
         "message": "Application status updated",
         "application_id": application_id,
-        "status": status
+        "status": new_status
     }
 
 
@@ -3,14 +3,19 @@ Unified Job & Internship Scraper
 Combines Adzuna + JSearch + Internship sources
 """
 
-from typing import List, Dict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Dict, Tuple
 import logging
+import os
 from app.scrapers.adzuna_scraper import get_adzuna_scraper
 from app.scrapers.jsearch_scraper import get_jsearch_scraper
 from app.scrapers.internship_scraper import get_internship_scraper
 
 logger = logging.getLogger(__name__)
 
+# Concurrent source requests per scraper (keywords x sources share this pool)
+SCRAPE_FETCH_WORKERS = int(os.getenv("SCRAPE_FETCH_WORKERS", "8"))
+
 class UnifiedJobScraper:
     """
     Unified scraper for Jobs
@@ -20,6 +25,8 @@ class UnifiedJobScraper:
     def __init__(self):
         self.adzuna = get_adzuna_scraper()
         self.jsearch = get_jsearch_scraper()
+        # Source requests are blocking HTTP - run (keyword, source) pairs concurrently
+        self._fetch_pool = ThreadPoolExecutor(max_workers=SCRAPE_FETCH_WORKERS)
     
     def search_all_sources(
         self,
@@ -27,35 +34,9 @@ class UnifiedJobScraper:
         location: str = "India",
         max_results_per_source: int = 50
     ) -> List[Dict]:
-        """Search jobs from ALL sources (Adzuna + JSearch)"""
-        
-        all_jobs = []
+        """Search jobs from ALL sources (Adzuna + JSearch) in parallel"""
         
-        # Fetch from Adzuna
-        logger.info("🔄 Fetching from Adzuna...")
-        try:
-            adzuna_jobs = self.adzuna.search_jobs(
-                keywords=keywords,
-                location=location,
-                results_per_page=max_results_per_source
-            )
-            all_jobs.extend(adzuna_jobs)
-            logger.info(f"✅ Adzuna: {len(adzuna_jobs)} jobs")
-        except Exception as e:
-            logger.error(f"❌ Adzuna failed: {e}")
-        
-        # Fetch from JSearch (Google Jobs)
-        logger.info("🔄 Fetching from JSearch (Google Jobs)...")
-        try:
-            jsearch_jobs = self.jsearch.search_jobs(
-                keywords=keywords,
-                location=location,
-                results_per_page=max_results_per_source
-            )
-            all_jobs.extend(jsearch_jobs)
-            logger.info(f"✅ JSearch: {len(jsearch_jobs)} jobs")
-        except Exception as e:
-            logger.error(f"❌ JSearch failed: {e}")
+        all_jobs = self._collect(self._submit_sources(keywords, location, max_results_per_source))
         
         # Remove duplicates
         all_jobs = self._remove_duplicates(all_jobs)
@@ -69,20 +50,14 @@ class UnifiedJobScraper:
         location: str = "India",
         max_results_per_keyword: int = 30
     ) -> List[Dict]:
-        """Search multiple keywords across all sources"""
-        
-        all_jobs = []
+        """Search multiple keywords across all sources (every request in flight at once)"""
         
+        futures = []
         for keywords in keywords_list:
             logger.info(f"🔍 Searching for: {keywords}")
-            
-            jobs = self.search_all_sources(
-                keywords=keywords,
-                location=location,
-                max_results_per_source=max_results_per_keyword
-            )
-            
-            all_jobs.extend(jobs)
+            futures.extend(self._submit_sources(keywords, location, max_results_per_keyword))
+        
+        all_jobs = self._collect(futures)
         
         # Remove duplicates
         all_jobs = self._remove_duplicates(all_jobs)
@@ -90,6 +65,35 @@ class UnifiedJobScraper:
         logger.info(f"🎉 Total unique jobs: {len(all_jobs)}")
         return all_jobs
     
+    def _submit_sources(
+        self,
+        keywords: str,
+        location: str,
+        max_results_per_source: int
+    ) -> List[Tuple[str, Future]]:
+        """Start one fetch per source for a keyword"""
+        return [
+            (name, self._fetch_pool.submit(
+                source.search_jobs,
+                keywords=keywords,
+                location=location,
+                results_per_page=max_results_per_source
+            ))
+            for name, source in (("Adzuna", self.adzuna), ("JSearch", self.jsearch))
+        ]
+    
+    def _collect(self, futures: List[Tuple[str, Future]]) -> List[Dict]:
+        """Gather fetch results in submission order; a failed source is skipped"""
+        all_jobs = []
+        for name, future in futures:
+            try:
+                jobs = future.result()
+                all_jobs.extend(jobs)
+                logger.info(f"✅ {name}: {len(jobs)} jobs")
+            except Exception as e:
+                logger.error(f"❌ {name} failed: {e}")
+        return all_jobs
+    
     def _remove_duplicates(self, jobs: List[Dict]) -> List[Dict]:
         """Remove duplicate jobs"""
         
@@ -0,0 +1,218 @@
+"""
+Shared Description Extractors
+Single-pass description parsing used by the JSearch + Internship scrapers
+
+Every keyword we look for (skills, duration, year, education, type,
+experience) lives in one Aho-Corasick automaton tagged with
+(category, value), so each description is scanned exactly once.
+"""
+
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Set, Tuple
+import ahocorasick
+import logging
+import sys
+
+logger = logging.getLogger(__name__)
+
+# Canonical attribute values - every parsed job shares these objects
+REMOTE, HYBRID, ONSITE = sys.intern('remote'), sys.intern('hybrid'), sys.intern('onsite')
+ENTRY, MID, SENIOR = sys.intern('entry'), sys.intern('mid'), sys.intern('senior')
+PURSUING, GRADUATED = sys.intern('pursuing'), sys.intern('graduated')
+YEAR_1ST, YEAR_2ND, YEAR_3RD, YEAR_4TH = (
+    sys.intern('1st'), sys.intern('2nd'), sys.intern('3rd'), sys.intern('4th')
+)
+ANY_YEAR = sys.intern('any')
+
+
+JOB_SKILL_KEYWORDS: Tuple[str, ...] = (
+    'python', 'java', 'javascript', 'typescript', 'react', 'angular', 'vue',
+    'node.js', 'nodejs', 'express', 'django', 'flask', 'fastapi',
+    'sql', 'mysql', 'postgresql', 'mongodb', 'redis',
+    'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins',
+    'machine learning', 'deep learning', 'ai', 'data science',
+    'html', 'css', 'bootstrap', 'tailwind',
+    'git', 'github', 'gitlab', 'jira', 'agile', 'scrum',
+    'rest api', 'graphql', 'microservices'
+)
+
+INTERNSHIP_SKILL_KEYWORDS: Tuple[str, ...] = (
+    'python', 'java', 'javascript', 'typescript', 'react', 'angular', 'vue',
+    'node.js', 'nodejs', 'express', 'django', 'flask', 'fastapi',
+    'sql', 'mysql', 'postgresql', 'mongodb', 'redis',
+    'aws', 'azure', 'docker', 'kubernetes',
+    'machine learning', 'deep learning', 'ai', 'data science',
+    'html', 'css', 'bootstrap', 'tailwind',
+    'git', 'github', 'jira', 'agile',
+    'rest api', 'graphql', 'react native', 'flutter',
+    'pandas', 'numpy', 'tensorflow', 'pytorch'
+)
+
+# Work-mode phrases shared by jobs and internships
+TYPE_KEYWORDS = (
+    ('remote', REMOTE), ('work from home', REMOTE), ('wfh', REMOTE),
+    ('hybrid', HYBRID)
+)
+
+EXPERIENCE_KEYWORDS = (
+    ('senior', SENIOR), ('5+ years', SENIOR), ('7+ years', SENIOR),
+    ('lead', SENIOR), ('architect', SENIOR),
+    ('mid', MID), ('2-4 years', MID), ('3+ years', MID), ('intermediate', MID)
+)
+
+DURATION_KEYWORDS = (
+    ('3 month', 3), ('3-month', 3),
+    ('6 month', 6), ('6-month', 6),
+    ('12 month', 12), ('1 year', 12)
+)
+
+EDUCATION_KEYWORDS = (
+    ('graduated', GRADUATED), ('degree holder', GRADUATED)
+)
+
+YEAR_KEYWORDS = (
+    ('final year', YEAR_4TH), ('4th year', YEAR_4TH),
+    ('3rd year', YEAR_3RD), ('third year', YEAR_3RD),
+    ('2nd year', YEAR_2ND), ('second year', YEAR_2ND),
+    ('1st year', YEAR_1ST), ('first year', YEAR_1ST)
+)
+
+
+def _build_automaton(entries: Iterable[Tuple[str, str, object]]) -> ahocorasick.Automaton:
+    """
+    Build an automaton from (keyword, category, value) entries
+
+    A keyword may carry several (category, value) tags.
+    """
+    tags = defaultdict(list)
+    for keyword, category, value in entries:
+        tags[keyword].append((category, value))
+
+    automaton = ahocorasick.Automaton()
+    for keyword, keyword_tags in tags.items():
+        automaton.add_word(keyword, tuple(keyword_tags))
+    automaton.make_automaton()
+    return automaton
+
+
+def _tagged(category: str, pairs: Iterable[Tuple[str, object]]):
+    return ((keyword, category, value) for keyword, value in pairs)
+
+
+def _skills(keywords: Iterable[str]):
+    return ((keyword, 'skill', sys.intern(keyword.title())) for keyword in keywords)
+
+
+_JOB_AUTOMATON = _build_automaton([
+    *_skills(JOB_SKILL_KEYWORDS),
+    *_tagged('experience', EXPERIENCE_KEYWORDS)
+])
+
+_INTERNSHIP_AUTOMATON = _build_automaton([
+    *_skills(INTERNSHIP_SKILL_KEYWORDS),
+    *_tagged('type', TYPE_KEYWORDS),
+    *_tagged('duration', DURATION_KEYWORDS),
+    *_tagged('education', EDUCATION_KEYWORDS),
+    *_tagged('year', YEAR_KEYWORDS)
+])
+
+
+def _scan(automaton: ahocorasick.Automaton, description: str) -> Dict[str, Set]:
+    """
+    Walk the lowercased description once, bucketing every hit by category
+
+    Repeated keywords collapse into one `hits` entry before bucketing, so
+    the priority checks in the parsers are plain set membership tests.
+    """
+    hits = {keyword_tags for _, keyword_tags in automaton.iter(description.lower())}
+
+    buckets = defaultdict(set)
+    for keyword_tags in hits:
+        for category, value in keyword_tags:
+            buckets[category].add(value)
+    return buckets
+
+
+def _first(found: Set, priority: Tuple, default):
+    """Return the highest-priority value that was found"""
+    for value in priority:
+        if value in found:
+            return value
+    return default
+
+
+# Defaults for empty descriptions - shared, never mutated (records copy on to_dict)
+EMPTY_JOB_ATTRS: Dict = {"required_skills": [], "experience_required": ENTRY}
+
+EMPTY_INTERNSHIP_ATTRS: Dict = {
+    "internship_type": ONSITE,
+    "required_skills": [],
+    "duration_months": 6,
+    "education_required": PURSUING,
+    "year_of_study": ANY_YEAR
+}
+
+
+def parse_job_description(description: str) -> Dict:
+    """
+    Extract job attributes from a description in one pass
+
+    Returns:
+        Dict with required_skills and experience_required
+    """
+    if not description:
+        return EMPTY_JOB_ATTRS
+
+    hits = _scan(_JOB_AUTOMATON, description)
+
+    return {
+        "required_skills": list(hits['skill']),
+        "experience_required": _first(hits['experience'], (SENIOR, MID), ENTRY)
+    }
+
+
+def parse_internship_description(description: str) -> Dict:
+    """
+    Extract internship attributes from a description in one pass
+
+    Returns:
+        Dict with internship_type, required_skills, duration_months,
+        education_required and year_of_study
+    """
+    if not description:
+        return EMPTY_INTERNSHIP_ATTRS
+
+    hits = _scan(_INTERNSHIP_AUTOMATON, description)
+
+    return {
+        "internship_type": _first(hits['type'], (REMOTE, HYBRID), ONSITE),
+        "required_skills": list(hits['skill']),
+        "duration_months": _first(hits['duration'], (3, 6, 12), 6),
+        "education_required": _first(hits['education'], (GRADUATED,), PURSUING),
+        "year_of_study": _first(hits['year'], (YEAR_4TH, YEAR_3RD, YEAR_2ND, YEAR_1ST), ANY_YEAR)
+    }
+
+
+_EMPTY_ATTRS = {
+    parse_job_description: EMPTY_JOB_ATTRS,
+    parse_internship_description: EMPTY_INTERNSHIP_ATTRS
+}
+
+
+def parse_many(parse_fn: Callable[[str], Dict], descriptions: List[str]) -> List[Dict]:
+    """
+    Parse a batch of descriptions in-process
+
+    Empty descriptions never reach parse_fn - they get the prebuilt defaults.
+    One automaton pass takes ~0.1 ms for a 3.5 KB description, so a process
+    pool only added pickling/IPC (and can't be created in daemonic Celery workers).
+
+    Args:
+        parse_fn: parse_job_description or parse_internship_description
+        descriptions: Raw description texts
+
+    Returns:
+        Parsed attribute dicts, in input order
+    """
+    empty = _EMPTY_ATTRS[parse_fn]
+    return [parse_fn(description) if description else empty for description in descriptions]
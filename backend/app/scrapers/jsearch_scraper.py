@@ -5,25 +5,123 @@ Coverage: Google for Jobs data (Indeed, LinkedIn, ZipRecruiter, etc.)
 Sign up: https://rapidapi.com/letscrape-6bRBa3QguO5/api/jsearch
 """
 
-import requests
-from typing import List, Dict, Optional
+import httpx
+import ijson
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Iterator, List, Dict, Optional
 import os
 from dotenv import load_dotenv
 import logging
+from tenacity import retry, stop_after_attempt, wait_exponential_jitter, retry_if_exception_type, retry_if_result
+from app.scrapers.records import ParsedJob
+from app.scrapers._extractors import parse_job_description, parse_many, REMOTE, HYBRID, ONSITE
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+# Read once at import - shared by the job and internship scrapers
+JSEARCH_API_KEY = os.getenv("JSEARCH_API_KEY")
+JSEARCH_URL = "https://jsearch.p.rapidapi.com/search"
+JSEARCH_HEADERS = {
+    "X-RapidAPI-Key": JSEARCH_API_KEY,
+    "X-RapidAPI-Host": "jsearch.p.rapidapi.com"
+}
+
+# Transient statuses worth spending another attempt on
+RETRY_STATUS_CODES = (429, 502, 503, 504)
+
+_backoff = wait_exponential_jitter(initial=1, max=10)
+
+# One HTTP/2 client shared by every JSearch request - concurrent searches
+# multiplex over a single TLS connection instead of opening a socket each
+_client = httpx.Client(
+    http2=True,
+    timeout=httpx.Timeout(15.0, connect=5.0),
+    limits=httpx.Limits(max_connections=20, max_keepalive_connections=10)
+)
+
+
+def _is_transient(response: httpx.Response) -> bool:
+    return response.status_code in RETRY_STATUS_CODES
+
+
+def _wait_retry_after(retry_state) -> float:
+    """Honor the Retry-After header when present, else exponential backoff + jitter"""
+    if retry_state.outcome.failed:
+        return _backoff(retry_state)
+    retry_after = retry_state.outcome.result().headers.get('Retry-After', '')
+    if retry_after.isdigit():
+        return min(float(retry_after), 10.0)
+    return _backoff(retry_state)
+
+
+def _discard_response(retry_state) -> None:
+    """Release the streamed connection before sleeping for the next attempt"""
+    if retry_state.outcome.failed:
+        logger.warning(f"⚠️ JSearch request failed ({retry_state.outcome.exception()}), retrying (attempt {retry_state.attempt_number})")
+        return
+    response = retry_state.outcome.result()
+    logger.warning(f"⚠️ JSearch returned {response.status_code}, retrying (attempt {retry_state.attempt_number})")
+    response.close()
+
+
+@retry(
+    stop=stop_after_attempt(3),
+    wait=_wait_retry_after,
+    retry=retry_if_result(_is_transient) | retry_if_exception_type((httpx.TransportError,)),
+    before_sleep=_discard_response,
+    retry_error_callback=lambda retry_state: retry_state.outcome.result()
+)
+def _send(url: str, headers: Dict, params: Dict) -> httpx.Response:
+    request = _client.build_request("GET", url, headers=headers, params=params)
+    return _client.send(request, stream=True)
+
+
+@contextmanager
+def jsearch_get(url: str, headers: Dict, params: Dict) -> Iterator[httpx.Response]:
+    """
+    GET a JSearch endpoint (streamed), retrying 429/5xx and transport errors up to 3 attempts
+
+    Yields the last response once attempts are exhausted so callers can
+    report the final status code. The stream is closed on exit.
+    """
+    response = _send(url, headers, params)
+    try:
+        yield response
+    finally:
+        response.close()
+
+
+def read_items(response: httpx.Response, limit: int) -> List[Dict]:
+    """
+    Stream-parse the "data" array of a JSearch response
+
+    Stops reading the body as soon as `limit` items have been parsed.
+    """
+    items: List[Dict] = []
+    events = ijson.sendable_list()
+    parser = ijson.items_coro(events, 'data.item', use_float=True)
+
+    for chunk in response.iter_bytes():
+        parser.send(chunk)
+        items.extend(events)
+        del events[:]
+        if len(items) >= limit:
+            return items[:limit]
+
+    parser.close()
+    items.extend(events)
+    return items[:limit]
+
+
 class JSearchJobScraper:
     """Scrape jobs from JSearch API (Google Jobs)"""
     
     def __init__(self):
-        self.api_key = os.getenv("JSEARCH_API_KEY")
-        self.base_url = "https://jsearch.p.rapidapi.com/search"
-        self.headers = {
-            "X-RapidAPI-Key": self.api_key,
-            "X-RapidAPI-Host": "jsearch.p.rapidapi.com"
-        }
+        self.api_key = JSEARCH_API_KEY
+        self.base_url = JSEARCH_URL
+        self.headers = JSEARCH_HEADERS
     
     def search_jobs(
         self, 
@@ -67,117 +165,77 @@ class JSearchJobScraper:
         
         try:
             logger.info(f"🔍 Searching JSearch for: {keywords}")
-            response = requests.get(
-                self.base_url, 
-                headers=self.headers, 
-                params=params, 
-                timeout=15
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
+            with self._do_request(params) as response:
+                if response.status_code == 200:
+                    # Stream-parse the "data" array, stopping after results_per_page items
+                    items = read_items(response, results_per_page)
+                    
+                    # Parse the page's descriptions in one in-process batch
+                    descriptions = [job.get('job_description', '') or '' for job in items]
+                    parsed_attrs = self._parse_batch(descriptions)
+                    
+                    jobs = [
+                        ParsedJob(
+                            title=job.get('job_title', ''),
+                            company=job.get('employer_name', 'Unknown'),
+                            description=description,
+                            location=job.get('job_city', location),
+                            url=job.get('job_apply_link', ''),
+                            created=job.get('job_posted_at_datetime_utc', ''),
+                            job_type=self._map_job_type(job.get('job_employment_type', '')),
+                            required_skills=attrs["required_skills"],
+                            experience_required=attrs["experience_required"]
+                        )
+                        for job, description, attrs in zip(items, descriptions, parsed_attrs)
+                    ]
+                    
+                    if not jobs:
+                        logger.warning("⚠️ JSearch: No results found")
+                        return []
+                    
+                    logger.info(f"✅ JSearch: Fetched {len(jobs)} jobs")
+                    return [job.to_dict() for job in jobs]
                 
-                if 'data' not in data:
-                    logger.warning("⚠️ JSearch: No results found")
+                elif response.status_code == 429:
+                    logger.error("❌ JSearch: Rate limit exceeded")
                     return []
                 
-                jobs = []
-                for job in data.get('data', [])[:results_per_page]:
-                    parsed_job = {
-                        "title": job.get('job_title', ''),
-                        "company": job.get('employer_name', 'Unknown'),
-                        "description": job.get('job_description', ''),
-                        "location": job.get('job_city', location),
-                        "salary_min": None,  # Parse if available
-                        "salary_max": None,
-                        "url": job.get('job_apply_link', ''),
-                        "created": job.get('job_posted_at_datetime_utc', ''),
-                        "job_type": self._map_job_type(job.get('job_employment_type', '')),
-                        "required_skills": self._extract_skills(job.get('job_description', '')),
-                        "experience_required": self._extract_experience(job.get('job_description', '')),
-                        "source": "jsearch",
-                        "category": "Technology"
-                    }
-                    jobs.append(parsed_job)
-                
-                logger.info(f"✅ JSearch: Fetched {len(jobs)} jobs")
-                return jobs
-            
-            elif response.status_code == 429:
-                logger.error("❌ JSearch: Rate limit exceeded")
-                return []
-            
-            else:
-                logger.error(f"❌ JSearch API error: {response.status_code}")
-                return []
+                else:
+                    logger.error(f"❌ JSearch API error: {response.status_code}")
+                    return []
                 
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             logger.error("❌ JSearch: Request timeout")
             return []
         except Exception as e:
             logger.error(f"❌ JSearch error: {e}")
             return []
     
-    def _extract_skills(self, description: str) -> List[str]:
-        """Extract skills from job description"""
-        if not description:
-            return []
-        
-        description_lower = description.lower()
-        
-        skill_keywords = [
-            'python', 'java', 'javascript', 'typescript', 'react', 'angular', 'vue',
-            'node.js', 'nodejs', 'express', 'django', 'flask', 'fastapi',
-            'sql', 'mysql', 'postgresql', 'mongodb', 'redis',
-            'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins',
-            'machine learning', 'deep learning', 'ai', 'data science',
-            'html', 'css', 'bootstrap', 'tailwind',
-            'git', 'github', 'gitlab', 'jira', 'agile', 'scrum',
-            'rest api', 'graphql', 'microservices'
-        ]
-        
-        found_skills = []
-        for skill in skill_keywords:
-            if skill in description_lower:
-                found_skills.append(skill.title())
-        
-        return list(set(found_skills))
+    def _do_request(self, params: Dict):
+        """Call the JSearch search endpoint with retry on transient errors"""
+        return jsearch_get(self.base_url, self.headers, params)
     
-    def _extract_experience(self, description: str) -> str:
-        """Determine experience level from description"""
-        if not description:
-            return 'entry'
-        
-        description_lower = description.lower()
-        
-        if any(word in description_lower for word in ['senior', '5+ years', '7+ years', 'lead', 'architect']):
-            return 'senior'
-        elif any(word in description_lower for word in ['mid', '2-4 years', '3+ years', 'intermediate']):
-            return 'mid'
-        else:
-            return 'entry'
+    def _parse_batch(self, descriptions: List[str]) -> List[Dict]:
+        """Extract attributes for every description in a page"""
+        return parse_many(parse_job_description, descriptions)
     
     def _map_job_type(self, employment_type: str) -> str:
         """Map JSearch job type to our format"""
         if not employment_type:
-            return 'onsite'
+            return ONSITE
         
         employment_type_lower = employment_type.lower()
         
         if 'remote' in employment_type_lower:
-            return 'remote'
+            return REMOTE
         elif 'hybrid' in employment_type_lower:
-            return 'hybrid'
+            return HYBRID
         else:
-            return 'onsite'
+            return ONSITE
 
 
 # Global instance
-jsearch_scraper_instance = None
-
+@lru_cache(maxsize=1)
 def get_jsearch_scraper() -> JSearchJobScraper:
     """Get or create JSearch scraper instance"""
-    global jsearch_scraper_instance
-    if jsearch_scraper_instance is None:
-        jsearch_scraper_instance = JSearchJobScraper()
-    return jsearch_scraper_instance
\ No newline at end of file
+    return JSearchJobScraper()
@@ -0,0 +1,58 @@
+"""
+Parsed Scraper Records
+Compact, slotted records for jobs/internships parsed from JSearch
+
+Records stay as dataclasses while a page is being processed and are
+converted with to_dict() only at the boundary (Firebase, API responses).
+"""
+
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional
+
+
+@dataclass(slots=True, frozen=True)
+class ParsedJob:
+    """Job parsed from a JSearch result"""
+
+    title: str
+    company: str
+    description: str
+    location: str
+    url: str
+    created: str
+    job_type: str
+    required_skills: List[str]
+    experience_required: str
+    salary_min: Optional[int] = None
+    salary_max: Optional[int] = None
+    source: str = "jsearch"
+    category: str = "Technology"
+
+    def to_dict(self) -> Dict:
+        """Convert to the dict shape stored in Firebase"""
+        return asdict(self)
+
+
+@dataclass(slots=True, frozen=True)
+class ParsedInternship:
+    """Internship parsed from a JSearch result"""
+
+    title: str
+    company: str
+    description: str
+    location: str
+    url: str
+    created: str
+    internship_type: str
+    required_skills: List[str]
+    duration_months: int
+    education_required: str
+    year_of_study: str
+    stipend_min: Optional[int] = None
+    stipend_max: Optional[int] = None
+    source: str = "jsearch"
+    category: str = "Technology"
+
+    def to_dict(self) -> Dict:
+        """Convert to the dict shape stored in Firebase"""
+        return asdict(self)
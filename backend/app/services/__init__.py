@@ -1,17 +1,25 @@
 """
 Services Package
 All business logic and external integrations
+
+Service getters are imported lazily (PEP 562) so importing the package
+does not load every heavy dependency (sentence-transformers, pinecone, ...)
 """
 
-from app.services.database import get_firebase_service, init_db
-from app.services.ai_matcher import get_matcher
-from app.services.pinecone_service import get_pinecone_service
-from app.services.resume_parser import get_resume_parser
-from app.services.rejection_analyzer import get_rejection_analyzer
-from app.services.chat_service import get_chat_service
-from app.services.statistics_service import get_statistics_service
-from app.services.email_service import get_email_service
-from app.services.notification_service import get_notification_service
+import importlib
+
+_LAZY = {
+    'get_firebase_service': 'app.services.database',
+    'init_db': 'app.services.database',
+    'get_matcher': 'app.services.ai_matcher',
+    'get_pinecone_service': 'app.services.pinecone_service',
+    'get_resume_parser': 'app.services.resume_parser',
+    'get_rejection_analyzer': 'app.services.rejection_analyzer',
+    'get_chat_service': 'app.services.chat_service',
+    'get_statistics_service': 'app.services.statistics_service',
+    'get_email_service': 'app.services.email_service',
+    'get_notification_service': 'app.services.notification_service'
+}
 
 __all__ = [
     'get_firebase_service',
@@ -23,5 +31,20 @@ __all__ = [
     'get_chat_service',
     'get_statistics_service',
     'get_email_service',
-    'get_notification_service' 
-]
\ No newline at end of file
+    'get_notification_service'
+]
+
+
+def __getattr__(name):
+    """Import the owning service module on first access"""
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module = importlib.import_module(_LAZY[name])
+    obj = getattr(module, name)
+    globals()[name] = obj
+    return obj
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -5,34 +5,344 @@ Uses BAAI/bge-base-en-v1.5 for HIGH ACCURACY semantic matching
 """
 
 from sentence_transformers import SentenceTransformer
+from cachetools import LRUCache
+from contextlib import nullcontext
 import numpy as np
+import torch
 from typing import List, Dict, Tuple, Optional
+import atexit
 import logging
+import math
 import os
+import threading
+
+try:
+    import simsimd  # SIMD dot products (AVX-512/NEON); optional
+except ImportError:
+    simsimd = None
 
 logger = logging.getLogger(__name__)
 
+
+def _quantize(embeddings: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Quantize float embeddings to int8 with a per-row scale
+    
+    Returns:
+        (int8 rows, float32 factors) where row * factor ~= original row
+    """
+    factors = np.abs(embeddings).max(axis=-1) / 127.0
+    factors[factors == 0] = 1.0
+    rows = np.rint(embeddings / factors[..., None]).astype(np.int8)
+    return rows, factors.astype(np.float32)
+
+
+def _dot_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Pairwise dot products a @ b.T, via SimSIMD when installed"""
+    if simsimd is not None and a.dtype == b.dtype and a.dtype in (np.float32, np.int8):
+        return np.asarray(simsimd.cdist(a, b, metric="dot"))
+    if a.dtype == np.int8:
+        return a.astype(np.int32) @ b.astype(np.int32).T
+    return a @ b.T
+
+
+# Max skill embeddings kept in memory (least recently used evicted first)
+SKILL_CACHE_SIZE = 4096
+
+# Longest skills list (in chars) put into an embedding text
+MAX_SKILLS_CHARS = 500
+
+# BGE instruction prepended to search queries
+QUERY_INSTRUCTION = "Represent this sentence for searching relevant passages: "
+
+# Inference precision: float32 (default), float16 (CUDA only) or bfloat16 (CPU autocast)
+EMBEDDING_DTYPE = os.getenv("EMBEDDING_DTYPE", "float32").lower()
+
+# Set to "int8" to dynamically quantize the encoder's Linear layers (CPU only)
+EMBEDDING_QUANTIZE = os.getenv("EMBEDDING_QUANTIZE", "").lower()
+
+# Intra-op threads for CPU inference (defaults to physical cores)
+MATCHER_THREADS = os.getenv("MATCHER_THREADS") or os.getenv("OMP_NUM_THREADS")
+
+# Storage for the in-memory job corpus: float32 or int8 (4x smaller, int8 dot kernels)
+CORPUS_DTYPE = os.getenv("CORPUS_DTYPE", "float32").lower()
+
+# Max jobs kept in the in-memory corpus; the oldest rows are dropped past this
+CORPUS_MAX_JOBS = int(os.getenv("CORPUS_MAX_JOBS", "50000"))
+
+# Shard large encodes across processes/GPUs (MATCHER_MULTIPROC=1)
+MATCHER_MULTIPROC = os.getenv("MATCHER_MULTIPROC", "0") == "1"
+
+# Below this many texts a single-process encode beats the pool's IPC overhead
+MULTIPROC_MIN_TEXTS = 256
+
+# Inference engine: torch (SentenceTransformer) or onnx (ONNX Runtime via optimum)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch").lower()
+
+# Where the exported (and, with EMBEDDING_QUANTIZE=int8, quantized) ONNX model is kept
+ONNX_MODEL_DIR = os.getenv(
+    "ONNX_MODEL_DIR", os.path.join(os.path.expanduser("~"), ".cache", "job-matcher-onnx")
+)
+
 class IntelligentMatcher:
     """AI-powered semantic job matching using BAAI model (High Accuracy)"""
     
-    def __init__(self, model_name: str = 'BAAI/bge-base-en-v1.5'):
+    def __init__(self, model_name: str = 'BAAI/bge-base-en-v1.5', backend: str = 'torch'):
         """
         Initialize the AI matcher with BAAI high-accuracy model
         
         Args:
             model_name: BAAI model for better semantic understanding
                        'BAAI/bge-base-en-v1.5' - 768 dimensions, HIGH accuracy
+            backend: 'torch' (SentenceTransformer) or 'onnx' (ONNX Runtime, CPU)
         """
         try:
             logger.info(f"🤖 Loading BAAI High-Accuracy Model: {model_name}")
             logger.info("📥 First time download may take a few minutes...")
-            self.model = SentenceTransformer(model_name)
+            self._configure_threads()
+            # (skill, is_query) -> embedding; shared by request threads, scheduler and notifications
+            self._skill_cache = LRUCache(maxsize=SKILL_CACHE_SIZE)
+            self._skill_cache_lock = threading.Lock()
+            
+            # Stored job embeddings, one row per job id (see upsert_jobs)
+            self.job_ids: List[str] = []
+            self.job_matrix: Optional[np.ndarray] = None
+            self.job_scales: Optional[np.ndarray] = None  # Per-row dequantization factors
+            self._job_rows: Dict[str, int] = {}
+            self._corpus_lock = threading.RLock()
+            
+            self._autocast = False
+            self.backend = backend
+            self.device = "cpu"
+            self.pool = None
+            
+            if backend == 'onnx':
+                self._load_onnx(model_name)
+                logger.info("✅ BAAI Model loaded successfully! (ONNX Runtime)")
+                return
+            
+            self.device = self._pick_device()
+            if self.device == "cuda":
+                # Allow TF32 matmuls on Ampere+
+                torch.set_float32_matmul_precision("high")
+            
+            self.model = SentenceTransformer(model_name, device=self.device)
+            
+            # Tokenize the query instruction once (see _encode_queries)
+            self._query_head_ids, self._query_tail_ids = self._split_query_template()
+            
+            if EMBEDDING_DTYPE == "float16" and self.device == "cuda":
+                self.model = self.model.half()
+            elif EMBEDDING_DTYPE == "bfloat16" and self.device == "cpu":
+                self._autocast = True
+            elif EMBEDDING_DTYPE != "float32":
+                logger.warning(f"⚠️ EMBEDDING_DTYPE={EMBEDDING_DTYPE} not supported on this device, using float32")
+            
+            if EMBEDDING_QUANTIZE == "int8" and self.device == "cpu":
+                transformer = self.model[0]
+                transformer.auto_model = torch.quantization.quantize_dynamic(
+                    transformer.auto_model, {torch.nn.Linear}, dtype=torch.qint8
+                )
+                self._autocast = False  # Quantized kernels take float32 input
+                logger.info("   Quantized encoder to INT8")
+            
+            if self.device == "cuda":
+                self._warmup_cuda()
+            
+            if MATCHER_MULTIPROC:
+                self.pool = self.model.start_multi_process_pool()
+                atexit.register(self.model.stop_multi_process_pool, self.pool)
+                logger.info("   Multi-process encode pool started")
+            
             logger.info("✅ BAAI Model loaded successfully!")
             logger.info(f"   Model dimensions: 768 (High Accuracy)")
+            logger.info(f"   Device: {self.device}, inference dtype: {EMBEDDING_DTYPE}")
         except Exception as e:
             logger.error(f"❌ Failed to load BAAI model: {e}")
             raise
     
+    @staticmethod
+    def _configure_threads():
+        """Pin torch's CPU thread pools - container defaults are often wrong"""
+        num_threads = int(MATCHER_THREADS) if MATCHER_THREADS else max(1, (os.cpu_count() or 2) // 2)
+        torch.set_num_threads(num_threads)
+        try:
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            # Can only be set once, before any inter-op work has started
+            pass
+        
+        logger.info(f"   Torch threads: {num_threads}")
+    
+    def _warmup_cuda(self):
+        """Run a throwaway batch on a side stream so cuBLAS/kernels are initialized"""
+        stream = torch.cuda.Stream()
+        with torch.cuda.stream(stream):
+            self.model.encode(["warmup"] * 8, show_progress_bar=False)
+        stream.synchronize()
+    
+    @staticmethod
+    def _pick_device() -> str:
+        """Use the best available accelerator, falling back to CPU"""
+        if torch.cuda.is_available():
+            return "cuda"
+        mps = getattr(torch.backends, "mps", None)
+        if mps is not None and mps.is_available():
+            return "mps"
+        return "cpu"
+    
+    def _load_onnx(self, model_name: str):
+        """
+        Export/load the model as an optimized ONNX Runtime session
+        
+        With EMBEDDING_QUANTIZE=int8 the exported graph is dynamically
+        quantized (VNNI int8 GEMMs) once and the result reused from
+        ONNX_MODEL_DIR on later starts.
+        """
+        from optimum.onnxruntime import ORTModelForFeatureExtraction
+        from transformers import AutoTokenizer
+        
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        
+        if EMBEDDING_QUANTIZE != "int8":
+            self.model = ORTModelForFeatureExtraction.from_pretrained(
+                model_name,
+                export=True,
+                provider="CPUExecutionProvider"
+            )
+            return
+        
+        quantized_dir = os.path.join(ONNX_MODEL_DIR, model_name.replace("/", "--") + "-int8")
+        if not os.path.isdir(quantized_dir):
+            from optimum.onnxruntime import ORTQuantizer
+            from optimum.onnxruntime.configuration import AutoQuantizationConfig
+            
+            exported = ORTModelForFeatureExtraction.from_pretrained(model_name, export=True)
+            quantizer = ORTQuantizer.from_pretrained(exported)
+            quantizer.quantize(
+                save_dir=quantized_dir,
+                quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+            )
+            logger.info(f"   Quantized ONNX encoder to INT8 ({quantized_dir})")
+        
+        self.model = ORTModelForFeatureExtraction.from_pretrained(
+            quantized_dir,
+            file_name="model_quantized.onnx",
+            provider="CPUExecutionProvider"
+        )
+    
+    def _encode_onnx(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        """
+        Embed texts with the ONNX Runtime session
+        
+        BGE pools on the [CLS] token, so we take the first hidden state
+        and L2-normalize it (same output as SentenceTransformer.encode).
+        """
+        chunks = []
+        for start in range(0, len(texts), batch_size):
+            inputs = self.tokenizer(
+                texts[start:start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=512,
+                return_tensors="np"
+            )
+            hidden = self.model(**inputs).last_hidden_state
+            chunks.append(np.asarray(hidden[:, 0], dtype=np.float32))
+        
+        if not chunks:
+            return np.zeros((0, 768), dtype=np.float32)
+        
+        embeddings = np.concatenate(chunks)
+        embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings
+    
+    def _encode(self, inputs, **kwargs) -> np.ndarray:
+        """
+        Run model.encode at the configured precision
+        
+        Results are always cast back to float32 so similarity math
+        stays well-conditioned.
+        """
+        if self.backend == 'onnx':
+            if isinstance(inputs, str):
+                return self._encode_onnx([inputs])[0]
+            return self._encode_onnx(inputs, batch_size=kwargs.get('batch_size', 32))
+        
+        with self._precision():
+            embeddings = self.model.encode(inputs, normalize_embeddings=True, **kwargs)
+        return np.asarray(embeddings, dtype=np.float32)
+    
+    def _precision(self):
+        """Autocast context for the configured inference dtype"""
+        if self._autocast:
+            return torch.autocast(device_type="cpu", dtype=torch.bfloat16)
+        return nullcontext()
+    
+    def _split_query_template(self) -> Tuple[List[int], List[int]]:
+        """
+        Token ids that go before / after a query's own tokens
+        
+        Head is the leading special tokens plus the instruction, tail is the
+        closing special tokens (e.g. [CLS] + instruction, [SEP] for BERT).
+        """
+        tokenizer = self.model.tokenizer
+        prefix_ids = tokenizer(QUERY_INSTRUCTION, add_special_tokens=False)["input_ids"]
+        full_ids = tokenizer(QUERY_INSTRUCTION)["input_ids"]
+        
+        for start in range(len(full_ids) - len(prefix_ids) + 1):
+            if full_ids[start:start + len(prefix_ids)] == prefix_ids:
+                end = start + len(prefix_ids)
+                return full_ids[:end], full_ids[end:]
+        
+        raise ValueError("Could not locate the query instruction in its own encoding")
+    
+    def _encode_queries(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        """
+        Embed search queries, reusing the pre-tokenized BGE instruction
+        
+        Only the query texts are tokenized; the instruction's token ids
+        are spliced in front, which matches tokenizing the concatenated
+        string (the instruction ends on a word boundary).
+        
+        Returns:
+            (N, dim) float32 array of normalized embeddings
+        """
+        tokenizer = self.model.tokenizer
+        head, tail = self._query_head_ids, self._query_tail_ids
+        
+        # Leave room for the instruction and the special tokens
+        max_text_tokens = self.model.max_seq_length - len(head) - len(tail)
+        text_ids = tokenizer(
+            texts, add_special_tokens=False, truncation=True, max_length=max_text_tokens
+        )["input_ids"]
+        
+        chunks = []
+        for start in range(0, len(text_ids), batch_size):
+            rows = [head + ids + tail for ids in text_ids[start:start + batch_size]]
+            width = max(len(row) for row in rows)
+            
+            input_ids = torch.full((len(rows), width), tokenizer.pad_token_id, dtype=torch.long)
+            attention_mask = torch.zeros((len(rows), width), dtype=torch.long)
+            for i, row in enumerate(rows):
+                input_ids[i, :len(row)] = torch.tensor(row)
+                attention_mask[i, :len(row)] = 1
+            
+            features = {
+                "input_ids": input_ids.to(self.device),
+                "attention_mask": attention_mask.to(self.device)
+            }
+            
+            with torch.no_grad(), self._precision():
+                embeddings = self.model(features)["sentence_embedding"]
+            
+            embeddings = torch.nn.functional.normalize(embeddings.float(), p=2, dim=1)
+            chunks.append(embeddings.cpu().numpy())
+        
+        if not chunks:
+            return np.zeros((0, self.model.get_sentence_embedding_dimension()), dtype=np.float32)
+        return np.concatenate(chunks)
+    
     def _get_embedding(self, text: str, is_query: bool = False) -> np.ndarray:
         """
         Create embedding using BAAI model
@@ -48,19 +358,40 @@ class IntelligentMatcher:
         Returns:
             768-dimensional numpy array (normalized)
         """
-        try:
-            if is_query:
-                # BAAI instruction for search queries
-                instruction = "Represent this sentence for searching relevant passages: "
-                text = instruction + text
+        if is_query:
+            if self.backend == 'torch':
+                return self._encode_queries([text])[0]
             
-            # Normalize embeddings for better cosine similarity
-            embedding = self.model.encode(text, normalize_embeddings=True)
-            return embedding
-            
-        except Exception as e:
-            logger.error(f"❌ Embedding error: {e}")
-            raise
+            # BAAI instruction for search queries
+            text = QUERY_INSTRUCTION + text
+        
+        # Normalize embeddings for better cosine similarity
+        # (errors propagate to the public create_*/rank callers, which log them)
+        return self._encode(text)
+    
+    def _embed_skill(self, skill: str, is_query: bool = False) -> np.ndarray:
+        """
+        Embed a skill name, reusing cached vectors for repeated skills
+        
+        Args:
+            skill: Skill name (case-insensitive)
+            is_query: True if searching, False if storing
+        
+        Returns:
+            768-dimensional numpy array (normalized)
+        """
+        key = (skill.lower(), is_query)
+        with self._skill_cache_lock:
+            embedding = self._skill_cache.get(key)
+        
+        if embedding is None:
+            # Model runs outside the lock; a concurrent miss just stores the same vector
+            embedding = self._get_embedding(skill, is_query=is_query)
+            embedding.setflags(write=False)  # shared by every caller of the cached entry
+            with self._skill_cache_lock:
+                self._skill_cache[key] = embedding
+        
+        return embedding
     
     def create_user_embedding(self, user_data: Dict, for_search: bool = True) -> np.ndarray:
         """
@@ -81,36 +412,82 @@ class IntelligentMatcher:
         else:
             skills_text = str(skills)
         
-        profile_text = f"""
-        Professional Profile:
-        Skills: {skills_text}
-        Experience Level: {user_data.get('experience_level', 'entry')}
-        Interests: {user_data.get('interests', 'software development')}
-        Career Goals: {user_data.get('career_goals', 'grow as developer')}
-        Education: {', '.join(user_data.get('education', []))}
-        """
+        # BGE truncates at 512 tokens anyway - don't tokenize what it ignores
+        profile_text = "\n".join((
+            "Professional Profile:",
+            f"Skills: {skills_text[:MAX_SKILLS_CHARS]}",
+            f"Experience Level: {user_data.get('experience_level', 'entry')}",
+            f"Interests: {user_data.get('interests', 'software development')}",
+            f"Career Goals: {user_data.get('career_goals', 'grow as developer')}",
+            f"Education: {', '.join(user_data.get('education', []))}"
+        ))
         
         try:
-            embedding = self._get_embedding(profile_text.strip(), is_query=for_search)
-            logger.debug(f"✅ User embedding created: shape {embedding.shape}")
+            embedding = self._get_embedding(profile_text, is_query=for_search)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"✅ User embedding created: shape {embedding.shape}")
             return embedding
         except Exception as e:
             logger.error(f"❌ Error creating user embedding: {e}")
             raise
     
-    def create_job_embedding(self, job_data: Dict, for_search: bool = False) -> np.ndarray:
+    def embed_texts(self, texts: List[str], is_query: bool = False) -> np.ndarray:
         """
-        Convert job posting to semantic vector
+        Embed arbitrary texts with the shared model (e.g. for LangChain)
         
         Args:
-            job_data: Job dict with title, description, skills
-            for_search: False for storing (default), True for searching
+            texts: Texts to embed
+            is_query: True to add the BAAI search instruction
         
         Returns:
-            768-dimensional numpy array
+            (N, 768) float32 array of normalized embeddings
+        """
+        return self._embed_batch(list(texts), is_query=is_query)
+    
+    def _embed_batch(self, texts: List[str], is_query: bool = False) -> np.ndarray:
         """
+        Embed many texts with a single model.encode call
+        
+        Args:
+            texts: Texts to embed
+            is_query: True if searching, False if storing
+        
+        Returns:
+            (N, 768) float32 array of normalized embeddings
+        """
+        if is_query and self.backend != 'torch':
+            texts = [QUERY_INSTRUCTION + text for text in texts]
+        
+        # Sort by length so each batch pads to similar-sized texts, then unsort
+        order = np.argsort([len(text) for text in texts], kind='stable')
+        
+        if is_query and self.backend == 'torch':
+            embeddings = self._encode_queries([texts[i] for i in order])
+            return embeddings[np.argsort(order)]
+        
+        if self.pool is not None and len(texts) > MULTIPROC_MIN_TEXTS:
+            embeddings = np.asarray(self.model.encode_multi_process(
+                [texts[i] for i in order],
+                self.pool,
+                batch_size=64,
+                normalize_embeddings=True
+            ), dtype=np.float32)
+            return embeddings[np.argsort(order)]
+        
+        # show_progress_bar=False skips the per-call tqdm setup
+        embeddings = self._encode(
+            [texts[i] for i in order],
+            batch_size=32,
+            device=self.device,
+            convert_to_numpy=True,
+            show_progress_bar=False
+        )
+        
+        return embeddings[np.argsort(order)]
+    
+    def _build_job_text(self, job_data: Dict) -> str:
+        """Build the text that represents a job posting for embedding"""
         
-        # Build comprehensive job text
         required_skills = job_data.get('required_skills', [])
         if isinstance(required_skills, list):
             skills_text = ', '.join(required_skills)
@@ -120,24 +497,185 @@ class IntelligentMatcher:
         # Limit description length for better embedding
         description = job_data.get('description', '')[:1000]
         
-        job_text = f"""
-        Job Position: {job_data.get('title', '')}
-        Company: {job_data.get('company', '')}
-        Job Description: {description}
-        Required Skills: {skills_text}
-        Experience Required: {job_data.get('experience_required', 'entry')}
-        Location: {job_data.get('location', 'India')}
-        Job Type: {job_data.get('job_type', 'remote')}
+        return "\n".join((
+            f"Job Position: {job_data.get('title', '')}",
+            f"Company: {job_data.get('company', '')}",
+            f"Job Description: {description}",
+            f"Required Skills: {skills_text[:MAX_SKILLS_CHARS]}",
+            f"Experience Required: {job_data.get('experience_required', 'entry')}",
+            f"Location: {job_data.get('location', 'India')}",
+            f"Job Type: {job_data.get('job_type', 'remote')}"
+        ))
+    
+    def create_job_embedding(self, job_data: Dict, for_search: bool = False) -> np.ndarray:
+        """
+        Convert job posting to semantic vector
+        
+        Args:
+            job_data: Job dict with title, description, skills
+            for_search: False for storing (default), True for searching
+        
+        Returns:
+            768-dimensional numpy array
         """
         
         try:
-            embedding = self._get_embedding(job_text.strip(), is_query=for_search)
-            logger.debug(f"✅ Job embedding created: shape {embedding.shape}")
+            embedding = self._get_embedding(self._build_job_text(job_data), is_query=for_search)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"✅ Job embedding created: shape {embedding.shape}")
             return embedding
         except Exception as e:
             logger.error(f"❌ Error creating job embedding: {e}")
             raise
     
+    def create_job_embeddings(self, jobs: List[Dict], for_search: bool = False) -> np.ndarray:
+        """
+        Convert many job postings to vectors in one batched forward pass
+        
+        Args:
+            jobs: Job dicts with title, description, skills
+            for_search: False for storing (default), True for searching
+        
+        Returns:
+            (N, 768) numpy array, one row per job
+        """
+        return self._embed_batch([self._build_job_text(job) for job in jobs], is_query=for_search)
+    
+    def _to_corpus(self, embeddings: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Convert embeddings to corpus storage: (rows, per-row scale factors)"""
+        if CORPUS_DTYPE == "int8":
+            return _quantize(embeddings)
+        return embeddings, np.ones(len(embeddings), dtype=np.float32)
+    
+    def upsert_jobs(self, jobs: List[Dict], embeddings: Optional[np.ndarray] = None) -> int:
+        """
+        Embed jobs into the in-memory corpus matrix (re-embeds existing ids)
+        
+        Call this when a job's content changes so ranking uses fresh vectors.
+        
+        Args:
+            jobs: Job dicts with an 'id'
+            embeddings: Storage embeddings aligned with jobs (e.g. from
+                create_job_embedding); embedded here if None
+        
+        Returns:
+            Number of jobs stored
+        """
+        # Last occurrence wins if an id repeats
+        picks = list({job['id']: i for i, job in enumerate(jobs) if job.get('id')}.values())
+        if not picks:
+            return 0
+        
+        # Embed before taking the lock; it is only held to write the rows
+        if embeddings is None:
+            embeddings = self._embed_batch([self._build_job_text(jobs[i]) for i in picks])
+        else:
+            embeddings = np.asarray(embeddings, dtype=np.float32).reshape(len(jobs), -1)[picks]
+        rows, scales = self._to_corpus(embeddings)
+        
+        with self._corpus_lock:
+            self._store_rows([jobs[i]['id'] for i in picks], rows, scales)
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"✅ Upserted {len(picks)} jobs into corpus ({len(self.job_ids)} total)")
+        return len(picks)
+    
+    def remove_jobs(self, job_ids: List[str]) -> int:
+        """
+        Drop jobs from the in-memory corpus matrix
+        
+        Args:
+            job_ids: Ids of jobs to remove
+        
+        Returns:
+            Number of jobs removed
+        """
+        with self._corpus_lock:
+            drop = set(job_ids) & self._job_rows.keys()
+            if drop:
+                self._drop_rows(drop)
+        
+        return len(drop)
+    
+    def _store_rows(self, job_ids: List[str], embeddings: np.ndarray, scales: np.ndarray) -> None:
+        """Write embedded rows into the corpus, capped at CORPUS_MAX_JOBS (caller holds _corpus_lock)"""
+        new_rows = []
+        for i, job_id in enumerate(job_ids):
+            row = self._job_rows.get(job_id)
+            if row is None:
+                self._job_rows[job_id] = len(self.job_ids)
+                self.job_ids.append(job_id)
+                new_rows.append(i)
+            else:
+                self.job_matrix[row] = embeddings[i]
+                self.job_scales[row] = scales[i]
+        
+        if new_rows:
+            if self.job_matrix is None:
+                self.job_matrix, self.job_scales = embeddings[new_rows], scales[new_rows]
+            else:
+                self.job_matrix = np.vstack([self.job_matrix, embeddings[new_rows]])
+                self.job_scales = np.concatenate([self.job_scales, scales[new_rows]])
+        
+        # Rows are kept in insertion order, so the overflow is the oldest jobs
+        overflow = len(self.job_ids) - CORPUS_MAX_JOBS
+        if overflow > 0:
+            self._drop_rows(set(self.job_ids[:overflow]))
+    
+    def _drop_rows(self, drop: set) -> None:
+        """Remove the given job ids from the corpus (caller holds _corpus_lock)"""
+        keep = [row for row, job_id in enumerate(self.job_ids) if job_id not in drop]
+        self.job_matrix = self.job_matrix[keep]
+        self.job_scales = self.job_scales[keep]
+        self.job_ids = [self.job_ids[row] for row in keep]
+        self._job_rows = {job_id: row for row, job_id in enumerate(self.job_ids)}
+    
+    def _job_embeddings(self, jobs: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get embeddings for jobs, reusing stored corpus rows
+        
+        Jobs with an id not yet in the corpus are embedded and stored;
+        jobs without an id are embedded on the fly. The model runs outside
+        _corpus_lock, so concurrent rankers only queue on row copies.
+        
+        Returns:
+            (rows, per-row scale factors) in corpus storage format
+        """
+        vectors: Dict[str, Tuple[np.ndarray, float]] = {}
+        
+        with self._corpus_lock:
+            stored = list({job['id'] for job in jobs if job.get('id') and job['id'] in self._job_rows})
+            if stored:
+                # Fancy indexing copies, so the rows stay valid after the lock is released
+                picks = [self._job_rows[job_id] for job_id in stored]
+                vectors.update(zip(stored, zip(self.job_matrix[picks], self.job_scales[picks])))
+        
+        unseen = list({job['id']: job for job in jobs if job.get('id') and job['id'] not in vectors}.values())
+        adhoc = [job for job in jobs if not job.get('id')]
+        
+        if unseen or adhoc:
+            embeddings, new_scales = self._to_corpus(
+                self._embed_batch([self._build_job_text(job) for job in unseen + adhoc])
+            )
+            
+            if unseen:
+                unseen_ids = [job['id'] for job in unseen]
+                with self._corpus_lock:
+                    self._store_rows(unseen_ids, embeddings[:len(unseen)], new_scales[:len(unseen)])
+                vectors.update(zip(unseen_ids, zip(embeddings, new_scales)))
+        
+        rows, scales, next_adhoc = [], [], len(unseen)
+        for job in jobs:
+            if job.get('id'):
+                row, scale = vectors[job['id']]
+            else:
+                row, scale = embeddings[next_adhoc], new_scales[next_adhoc]
+                next_adhoc += 1
+            rows.append(row)
+            scales.append(scale)
+        
+        return np.stack(rows), np.array(scales, dtype=np.float32)
+    
     def create_resume_embedding(self, resume_text: str, skills: List[str], for_search: bool = False) -> np.ndarray:
         """
         Convert resume to semantic vector
@@ -152,22 +690,27 @@ class IntelligentMatcher:
         """
         
         # Combine resume text with skills for better context
-        combined_text = f"""
-        Resume:
-        {resume_text[:2000]}
-        
-        Key Skills: {', '.join(skills)}
-        """
+        combined_text = "\n".join((
+            "Resume:",
+            resume_text[:2000].strip(),
+            "",
+            f"Key Skills: {', '.join(skills)[:MAX_SKILLS_CHARS]}"
+        ))
         
         try:
-            embedding = self._get_embedding(combined_text.strip(), is_query=for_search)
-            logger.debug(f"✅ Resume embedding created")
+            embedding = self._get_embedding(combined_text, is_query=for_search)
+            logger.debug("✅ Resume embedding created")
             return embedding
         except Exception as e:
             logger.error(f"❌ Error creating resume embedding: {e}")
             raise
     
-    def calculate_similarity(self, embedding1: np.ndarray, embedding2: np.ndarray) -> float:
+    def calculate_similarity(
+        self,
+        embedding1: np.ndarray,
+        embedding2: np.ndarray,
+        normalized: bool = True
+    ) -> float:
         """
         Calculate cosine similarity between two embeddings
         
@@ -176,27 +719,55 @@ class IntelligentMatcher:
         Args:
             embedding1: First vector (768-dim)
             embedding2: Second vector (768-dim)
+            normalized: False if the vectors may not be unit length
         
         Returns:
             Similarity score (0-100%)
         """
         
-        try:
-            # Since embeddings are normalized, dot product = cosine similarity
-            similarity = np.dot(embedding1, embedding2)
-            
-            # Convert to percentage (0-100)
-            score = float(similarity * 100)
-            
-            # Clamp to valid range
-            score = max(0, min(100, score))
-            
+        # Contiguous float32 so the dot dispatches to the SIMD BLAS kernel
+        e1 = np.ascontiguousarray(embedding1, dtype=np.float32)
+        e2 = np.ascontiguousarray(embedding2, dtype=np.float32)
+        
+        # Since embeddings are normalized, dot product = cosine similarity
+        similarity = float(np.vdot(e1, e2))
+        if not normalized:
+            norms = math.sqrt(float(np.vdot(e1, e1)) * float(np.vdot(e2, e2)))
+            similarity = similarity / norms if norms else 0.0
+        
+        # Convert to percentage (0-100)
+        score = float(similarity * 100)
+        
+        # Clamp to valid range
+        score = max(0, min(100, score))
+        
+        if logger.isEnabledFor(logging.DEBUG):
             logger.debug(f"✅ Similarity calculated: {score:.2f}%")
-            return score
-            
-        except Exception as e:
-            logger.error(f"❌ Error calculating similarity: {e}")
-            return 0.0
+        return score
+    
+    def calculate_similarities(
+        self,
+        query: np.ndarray,
+        matrix: np.ndarray,
+        scales: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Score many embeddings against one query in a single matrix multiply
+        
+        Args:
+            query: Query vector (768-dim, float)
+            matrix: (N, 768) matrix of normalized embeddings (float or int8)
+            scales: Per-row dequantization factors for an int8 matrix
+        
+        Returns:
+            (N,) array of similarity scores (0-100%)
+        """
+        if matrix.dtype == np.int8:
+            query_row, query_scale = _quantize(query[None, :])
+            scores = _dot_matrix(query_row, matrix)[0] * query_scale[0] * scales
+        else:
+            scores = _dot_matrix(query[None, :], matrix)[0]
+        return np.clip(scores, 0.0, 1.0) * 100.0
     
     def find_skill_gaps(self, user_skills: List[str], required_skills: List[str]) -> List[str]:
         """
@@ -216,33 +787,29 @@ class IntelligentMatcher:
         
         try:
             # Create embeddings for all skills
-            user_skill_embeddings = [
-                self._get_embedding(skill, is_query=True) 
+            user_matrix = np.stack([
+                self._embed_skill(skill, is_query=True) 
                 for skill in user_skills
-            ]
+            ])
             
-            required_skill_embeddings = [
-                self._get_embedding(skill, is_query=False) 
+            required_matrix = np.stack([
+                self._embed_skill(skill, is_query=False) 
                 for skill in required_skills
-            ]
+            ])
             
-            gaps = []
             threshold = 0.65  # Higher threshold for BAAI model (more accurate)
             
-            for i, req_skill in enumerate(required_skills):
-                req_embedding = required_skill_embeddings[i]
-                
-                # Calculate similarity with all user skills
-                max_similarity = 0
-                for user_embedding in user_skill_embeddings:
-                    sim = np.dot(user_embedding, req_embedding)
-                    max_similarity = max(max_similarity, sim)
-                
-                # If no user skill is similar enough, it's a gap
-                if max_similarity < threshold:
-                    gaps.append(req_skill)
+            # Best user-skill similarity for every required skill, in one matmul
+            max_similarity = _dot_matrix(required_matrix, user_matrix).max(axis=1)
             
-            logger.debug(f"✅ Skill gaps identified: {len(gaps)} out of {len(required_skills)}")
+            # If no user skill is similar enough, it's a gap
+            gaps = [
+                req_skill for req_skill, sim in zip(required_skills, max_similarity)
+                if sim < threshold
+            ]
+            
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"✅ Skill gaps identified: {len(gaps)} out of {len(required_skills)}")
             return gaps
             
         except Exception as e:
@@ -254,7 +821,9 @@ class IntelligentMatcher:
         user_data: Dict, 
         job_data: Dict, 
         score: float, 
-        skill_gaps: List[str]
+        skill_gaps: List[str],
+        user_skills: Optional[set] = None,
+        user_exp: Optional[str] = None
     ) -> str:
         """
         Generate human-readable explanation for the match
@@ -264,6 +833,8 @@ class IntelligentMatcher:
             job_data: Job posting
             score: Match score (0-100)
             skill_gaps: List of missing skills
+            user_skills: Lowercased user skills (precomputed when ranking many jobs)
+            user_exp: Lowercased user experience level (precomputed likewise)
         
         Returns:
             Formatted reasoning text
@@ -271,7 +842,8 @@ class IntelligentMatcher:
         
         try:
             # Find matching skills
-            user_skills = set(s.lower() for s in user_data.get('skills', []))
+            if user_skills is None:
+                user_skills = set(s.lower() for s in user_data.get('skills', []))
             required_skills = set(s.lower() for s in job_data.get('required_skills', []))
             matching_skills = user_skills.intersection(required_skills)
             
@@ -296,7 +868,8 @@ class IntelligentMatcher:
                 reasoning_parts.append("\n✅ All required skills covered!")
             
             # Experience level match
-            user_exp = user_data.get('experience_level', '').lower()
+            if user_exp is None:
+                user_exp = user_data.get('experience_level', '').lower()
             job_exp = job_data.get('experience_required', '').lower()
             
             if user_exp == job_exp:
@@ -342,127 +915,178 @@ class IntelligentMatcher:
             # Create user embedding once (for searching)
             user_embedding = self.create_user_embedding(user_data, for_search=True)
             
+            # Skip jobs in rejection history
+            rejection_history = user_data.get('rejection_history', [])
+            if isinstance(rejection_history, (list, set)) and rejection_history:
+                rejected = set(rejection_history)
+                jobs = [job for job in jobs if job.get('id') not in rejected]
+            
+            if not jobs:
+                return []
+            
+            # Stored job vectors (new jobs embedded in one batched pass), scored together
+            job_embeddings, job_scales = self._job_embeddings(jobs)
+            scores = self.calculate_similarities(user_embedding, job_embeddings, job_scales)
+            
+            # Normalize the user's profile once, not per job
+            user_skills = user_data.get('skills', [])
+            user_skills_lower = set(s.lower() for s in user_skills)
+            user_exp = user_data.get('experience_level', '').lower()
+            
+            # Only include decent matches (50%+ with BAAI is meaningful)
+            candidates = np.flatnonzero(scores >= 50)
+            k = min(top_k, len(candidates))
+            
+            if k <= 0:
+                logger.info(f"✅ Ranked {len(candidates)} matches using BAAI model, returning top {top_k}")
+                return []
+            
+            # Pull the top k in O(n), then sort just those by score descending.
+            # Ranking uses the rounded score and ties keep input order.
+            ranked = np.round(scores, 2)
+            top = candidates
+            if k < len(candidates):
+                cutoff = np.partition(ranked[candidates], len(candidates) - k)[len(candidates) - k]
+                above = candidates[ranked[candidates] > cutoff]
+                tied = candidates[ranked[candidates] == cutoff][:k - len(above)]
+                top = np.sort(np.concatenate([above, tied]))
+            top = top[np.argsort(-ranked[top], kind='stable')]
+            
+            top_jobs = [jobs[index] for index in top.tolist()]
+            top_scores = scores[top].astype(np.float64)
+            
+            # Gaps/reasoning/rejection odds are only built for the returned jobs
+            skill_gaps = [
+                self.find_skill_gaps(user_skills, job.get('required_skills', []))
+                for job in top_jobs
+            ]
+            
+            # Rejection odds, risk labels and actions for all k jobs at once
+            rejection_probs = self._calculate_rejection_probabilities(
+                top_scores, np.array([len(gaps) for gaps in skill_gaps]), user_data, top_jobs
+            )
+            risk_levels = self._get_risk_levels(rejection_probs).tolist()
+            actions = self._get_actions(top_scores, rejection_probs).tolist()
+            
             matches = []
             
-            for job in jobs:
-                # Skip jobs in rejection history
-                rejection_history = user_data.get('rejection_history', [])
-                if isinstance(rejection_history, list) and job.get('id') in rejection_history:
-                    continue
+            for i, (job, score) in enumerate(zip(top_jobs, top_scores.tolist())):
+                # Generate reasoning
+                reasoning = self.generate_match_reasoning(
+                    user_data, job, score, skill_gaps[i],
+                    user_skills=user_skills_lower,
+                    user_exp=user_exp
+                )
                 
-                # Create job embedding (for matching against)
-                job_embedding = self.create_job_embedding(job, for_search=False)
-                
-                # Calculate similarity
-                score = self.calculate_similarity(user_embedding, job_embedding)
-                
-                # Only include decent matches (50%+ with BAAI is meaningful)
-                if score >= 50:
-                    # Find skill gaps
-                    skill_gaps = self.find_skill_gaps(
-                        user_data.get('skills', []),
-                        job.get('required_skills', [])
-                    )
-                    
-                    # Generate reasoning
-                    reasoning = self.generate_match_reasoning(
-                        user_data, job, score, skill_gaps
-                    )
-                    
-                    # Calculate rejection probability
-                    rejection_prob = self._calculate_rejection_probability(
-                        score, len(skill_gaps), user_data, job
-                    )
-                    
-                    matches.append({
-                        'job': job,
-                        'match_score': round(score, 2),
-                        'rejection_probability': rejection_prob,
-                        'rejection_risk': self._get_risk_level(rejection_prob),
-                        'skill_gaps': skill_gaps,
-                        'reasoning': reasoning,
-                        'recommended_action': self._get_action(score, rejection_prob),
-                        'ai_model': 'BAAI/bge-base-en-v1.5'
-                    })
-            
-            # Sort by score descending
-            matches.sort(key=lambda x: x['match_score'], reverse=True)
-            
-            logger.info(f"✅ Ranked {len(matches)} matches using BAAI model, returning top {top_k}")
-            
-            return matches[:top_k]
+                matches.append({
+                    'job': job,
+                    'match_score': round(score, 2),
+                    'rejection_probability': float(rejection_probs[i]),
+                    'rejection_risk': risk_levels[i],
+                    'skill_gaps': skill_gaps[i],
+                    'reasoning': reasoning,
+                    'recommended_action': actions[i],
+                    'ai_model': 'BAAI/bge-base-en-v1.5'
+                })
+            
+            logger.info(f"✅ Ranked {len(candidates)} matches using BAAI model, returning top {top_k}")
+            
+            return matches
             
         except Exception as e:
             logger.error(f"❌ Error ranking matches: {e}")
             return []
     
-    def _calculate_rejection_probability(
+    def _calculate_rejection_probabilities(
         self, 
-        match_score: float, 
-        skill_gap_count: int,
+        match_scores: np.ndarray, 
+        skill_gap_counts: np.ndarray,
         user_data: Dict,
-        job_data: Dict
-    ) -> float:
+        jobs: List[Dict]
+    ) -> np.ndarray:
         """
-        Calculate probability of rejection based on BAAI scores
+        Calculate probability of rejection based on BAAI scores (vectorized)
         
         Note: BAAI gives more accurate scores, so we adjust thresholds
+        
+        Args:
+            match_scores: (k,) match scores
+            skill_gap_counts: (k,) number of missing skills per job
+            user_data: User profile
+            jobs: The k jobs, aligned with the arrays
+        
+        Returns:
+            (k,) rejection probabilities, rounded to 0.1
         """
         
         # Base calculation from match score (BAAI is more accurate)
-        if match_score >= 85:
-            score_penalty = 5  # Very low penalty for high BAAI scores
-        elif match_score >= 70:
-            score_penalty = 15
-        elif match_score >= 55:
-            score_penalty = 30
-        else:
-            score_penalty = (100 - match_score) * 0.5
+        score_penalty = np.select(
+            [match_scores >= 85, match_scores >= 70, match_scores >= 55],
+            [5, 15, 30],  # Very low penalty for high BAAI scores
+            default=(100 - match_scores) * 0.5
+        )
         
         # Skill gap penalty
-        skill_gap_penalty = min(skill_gap_count * 8, 45)  # Max 45%
+        skill_gap_penalty = np.minimum(skill_gap_counts * 8, 45)  # Max 45%
         
         # Experience mismatch penalty
         exp_levels = {'entry': 1, 'mid': 2, 'senior': 3}
         user_level = exp_levels.get(user_data.get('experience_level', 'entry'), 1)
-        job_level = exp_levels.get(job_data.get('experience_required', 'entry'), 1)
-        exp_gap = abs(user_level - job_level) * 12  # 12% per level gap
+        job_levels = np.array([
+            exp_levels.get(job.get('experience_required', 'entry'), 1) for job in jobs
+        ])
+        exp_gap = np.abs(user_level - job_levels) * 12  # 12% per level gap
         
         # Total probability (capped at 95%)
-        total = min(score_penalty + skill_gap_penalty + exp_gap, 95)
+        total = np.minimum(score_penalty + skill_gap_penalty + exp_gap, 95)
         
-        return round(total, 1)
+        return np.array([round(value, 1) for value in total.tolist()])
     
-    def _get_risk_level(self, rejection_prob: float) -> str:
-        """Get risk level label"""
-        if rejection_prob < 25:
-            return "Low"
-        elif rejection_prob < 50:
-            return "Medium"
-        else:
-            return "High"
-    
-    def _get_action(self, score: float, rejection_prob: float) -> str:
-        """Get recommended action based on BAAI scores"""
-        if score >= 85 and rejection_prob < 25:
-            return "Apply Now - Excellent Match!"
-        elif score >= 75 and rejection_prob < 40:
-            return "Strongly Consider Applying"
-        elif score >= 65 and rejection_prob < 55:
-            return "Apply with Portfolio"
-        elif score >= 55:
-            return "Consider After Skill Improvement"
-        else:
-            return "Build Skills First"
-
+    def _get_risk_levels(self, rejection_probs: np.ndarray) -> np.ndarray:
+        """Get risk level labels"""
+        return np.select(
+            [rejection_probs < 25, rejection_probs < 50],
+            ["Low", "Medium"],
+            default="High"
+        )
+    
+    def _get_actions(self, scores: np.ndarray, rejection_probs: np.ndarray) -> np.ndarray:
+        """Get recommended actions based on BAAI scores"""
+        return np.select(
+            [
+                (scores >= 85) & (rejection_probs < 25),
+                (scores >= 75) & (rejection_probs < 40),
+                (scores >= 65) & (rejection_probs < 55),
+                scores >= 55
+            ],
+            [
+                "Apply Now - Excellent Match!",
+                "Strongly Consider Applying",
+                "Apply with Portfolio",
+                "Consider After Skill Improvement"
+            ],
+            default="Build Skills First"
+        )
 
 # Global instance
 matcher_instance = None
+_matcher_lock = threading.Lock()
 
 def get_matcher() -> IntelligentMatcher:
     """Get or create matcher instance with BAAI model"""
     global matcher_instance
     if matcher_instance is None:
-        model_name = os.getenv("EMBEDDING_MODEL", "BAAI/bge-base-en-v1.5")
-        matcher_instance = IntelligentMatcher(model_name)
-    return matcher_instance
\ No newline at end of file
+        with _matcher_lock:
+            if matcher_instance is None:
+                model_name = os.getenv("EMBEDDING_MODEL", "BAAI/bge-base-en-v1.5")
+                matcher_instance = IntelligentMatcher(model_name, backend=EMBEDDING_BACKEND)
+    return matcher_instance
+
+
+def _preload_matcher():
+    """Load the model in the background so the first request doesn't pay for it"""
+    try:
+        get_matcher()
+        logger.info("✅ BAAI AI model loaded successfully!")
+    except Exception as e:
+        logger.error(f"❌ Background model preload failed: {e}")
@@ -4,26 +4,186 @@ Handles conversational interactions with users
 Provides rejection analysis, job recommendations, and guidance
 """
 
-from typing import Dict, List
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, List, Final, Optional, Set
 from app.services.rejection_analyzer import get_rejection_analyzer
-from app.services.rag_engine import ask_career_coach
+from app.services.rag_engine import ask_career_coach_async
+import asyncio
+import hashlib
 import logging
 import json
+import os
+from collections import OrderedDict
+import ahocorasick
 
 logger = logging.getLogger(__name__)
 
+# Max RAG answers kept in memory (LRU)
+RAG_CACHE_SIZE = int(os.getenv("RAG_CACHE_SIZE", "1024"))
+
+# Job lines in the RAG context are clipped to this many characters
+MAX_JOB_LINE_CHARS = 120
+
+# Static lead of the RAG user context - identical for every request, so it
+# stays first and LLM prefix caches can reuse it; per-user text goes after
+_RAG_CONTEXT_PREFIX: Final[str] = (
+    "General Context:\n"
+    "- This user is using the Intelligent Job Matcher platform.\n"
+)
+
+
+# Intent keywords (plain substring match on the lowercased message, like `in`)
+_INTENT_KEYWORDS = {
+    'rejection': ['reject', 'rejection', 'why', 'failed', 'denied'],
+    'job': ['job', 'apply', 'recommend', 'suggest', 'find'],
+    'skill': ['skill', 'learn', 'improve', 'study', 'course'],
+    'resume': ['resume', 'cv', 'profile', 'update'],
+    'salary': ['salary', 'pay', 'compensation', 'package'],
+    'motivation': ['sad', 'depressed', 'frustrated', 'tired', 'give up'],
+    'greeting': ['hi', 'hello', 'hey', 'start'],
+    'help': ['help', 'what can you', 'features'],
+}
+
+# Fallback intents in priority order - the first one present wins
+_FALLBACK_PRIORITY = (
+    'skill',
+    'resume',
+    'salary',
+    'motivation',
+    # 'greeting',
+    'help',
+)
+
+
+def _build_intent_automaton() -> ahocorasick.Automaton:
+    """One automaton over every intent keyword; a keyword carries all its intents"""
+    intents_by_keyword = defaultdict(set)
+    for intent, keywords in _INTENT_KEYWORDS.items():
+        for keyword in keywords:
+            intents_by_keyword[keyword].add(intent)
+    
+    automaton = ahocorasick.Automaton()
+    for keyword, intents in intents_by_keyword.items():
+        automaton.add_word(keyword, frozenset(intents))
+    automaton.make_automaton()
+    return automaton
+
+
+_INTENT_AUTOMATON = _build_intent_automaton()
+
+
+def _detect_intents(message_lower: str) -> Set[str]:
+    """Every intent with a keyword in the message - a single pass over the text"""
+    return {
+        intent
+        for _, intents in _INTENT_AUTOMATON.iter(message_lower)
+        for intent in intents
+    }
+
+
+def _match_intent(intents: Set[str]) -> str:
+    """Highest-priority fallback intent among the detected ones ('' if none)"""
+    for intent in _FALLBACK_PRIORITY:
+        if intent in intents:
+            return intent
+    return ''
+
+# Static fallback replies, built once at import instead of on every call
+# (the greeting only interpolates the user's name in front of _GREETING_BODY)
+_GREETING_BODY: Final[str] = """
+I'm your AI Job Matcher - here to help you land your dream job!
+
+**What I can do:**
+
+1️⃣ **Rejection Analysis** 
+   → "Why am I getting rejected?"
+
+2️⃣ **Smart Job Matching**
+   → "Show me jobs regarding Python"
+
+3️⃣ **Skill Recommendations**
+   → "What skills should I learn?"
+
+4️⃣ **Career Guidance**
+   → "How do I negotiate salary?"
+
+**What would you like help with today?** 🎯
+        """.strip()
+
+_MOTIVATION_RESPONSE: Final[str] = """
+💪 **You've Got This!**
+
+I know job hunting is tough, but don't give up!
+
+**Remember:**
+• Every rejection is a learning opportunity
+• Even top engineers faced 10+ rejections
+
+**Success Stories:**
+• Applied to 50 jobs → Got 3 offers
+• Learned new skill → Match rate jumped 60%
+
+**Next Steps:**
+1. Take a 15-minute break
+2. Apply to 3 HIGH-MATCH jobs today
+
+**Your dream job is waiting - let's find it together!** 🚀
+        """.strip()
+
+_HELP_RESPONSE: Final[str] = """
+🤖 **I'm Your AI Career Assistant!**
+
+**I can help you with:**
+
+📊 **Rejection Analysis**
+• Understand why you're getting rejected
+
+🎯 **Smart Job Matching**
+• Find jobs with HIGH match scores
+
+📚 **Learning Recommendations**
+• Identify skills to learn
+
+💼 **Career Guidance**
+• Resume optimization tips
+
+**Just ask me anything!**
+        """.strip()
+
+_DEFAULT_RESPONSE: Final[str] = """
+🤔 **I can help you with:**
+
+• 📊 **Rejection Analysis**
+• 🎯 **Job Recommendations**
+• 📚 **Skill Suggestions**
+• 📄 **Resume Help**
+
+**Try asking me one of these questions!**
+        """.strip()
+
 class ChatService:
     """Handle chat interactions with users"""
     
     def __init__(self):
         self.rejection_analyzer = get_rejection_analyzer()
+        # blake2b(message, RAG user context) -> RAG answer, oldest first
+        self._rag_cache: "OrderedDict[bytes, str]" = OrderedDict()
+        # Fallback intent -> handler(user_data, context)
+        self._dispatch = {
+            'skill': self._handle_skill_query,
+            'resume': self._handle_resume_query,
+            'salary': self._handle_salary_query,
+            'motivation': self._handle_motivation_query,
+            'help': self._handle_help_query
+        }
     
-    def process_message(
+    async def process_message(
         self, 
         message: str, 
         user_data: Dict, 
-        context: Dict = {},
-        chat_history: List[Dict] = []
+        context: Optional[Dict] = None,
+        chat_history: Optional[List[Dict]] = None
     ) -> str:
         """
         Process user message and generate AI response
@@ -38,43 +198,46 @@ class ChatService:
             AI response text
         """
         
+        # Fresh containers per call - shared mutable defaults leak across requests
+        context = context or {}
+        chat_history = chat_history or []
+        
         message_lower = message.lower()
+        intents = _detect_intents(message_lower)
         
         logger.info(f"💬 Processing message: {message[:50]}...")
         
         # 1. Specialized Handlers (Logic-based)
         # Rejection analysis query
-        if any(word in message_lower for word in ['reject', 'rejection', 'why', 'failed', 'denied']):
+        if 'rejection' in intents:
             return self._handle_rejection_query(user_data, context)
         
         # Job recommendation query
-        elif any(word in message_lower for word in ['job', 'apply', 'recommend', 'suggest', 'find']):
+        elif 'job' in intents:
             # We can let RAG handle this too if it has job context, 
             # but let's keep the structured response for now as a base
             # return self._handle_job_query(user_data, context)
             pass # Fall through to RAG for better natural language responses
             
         # 2. RAG Engine (AI-based)
+        rag_context = self._build_rag_context(user_data, context)
+        
+        # Follow-ups depend on the conversation, so only first-turn questions are cached
+        cache_key = None if chat_history else self._rag_cache_key(message_lower, rag_context)
+        if cache_key is not None:
+            cached = self._rag_cache.get(cache_key)
+            if cached is not None:
+                self._rag_cache.move_to_end(cache_key)
+                logger.info("✅ RAG answer served from cache")
+                return cached
+        
         try:
-            # Enrich context for RAG
-            rag_context = f"""
-            User Profile:
-            - Name: {user_data.get('full_name')}
-            - Skills: {', '.join(user_data.get('skills', []))}
-            - Experience: {user_data.get('experience_level')}
-            - Interests: {user_data.get('interests')}
-            
-            Available Jobs (Top Matches):
-            {self._format_jobs_for_context(context.get('matched_jobs', [])[:5])}
-            
-            General Context:
-            - This user is using the Intelligent Job Matcher platform.
-            """
-            
-            response = ask_career_coach(message, chat_history, rag_context)
+            response = await ask_career_coach_async(message, chat_history, rag_context)
             
             if response and "answer" in response and not response.get("error"):
                 logger.info("✅ RAG Engine provided response")
+                if cache_key is not None:
+                    self._remember_answer(cache_key, response["answer"])
                 return response["answer"]
             elif response.get("error"):
                 logger.warning(f"⚠️ RAG Engine error: {response.get('error')}")
@@ -84,47 +247,65 @@ class ChatService:
             # Fallback continues below
             
         # 3. Fallback Handlers (if RAG fails or for specific keywords)
+        handler = self._dispatch.get(_match_intent(intents), self._handle_default_query)
+        return handler(user_data, context)
+    
+    def _rag_cache_key(self, message_lower: str, rag_context: str) -> bytes:
+        """Stable 16-byte digest of the message plus the user context the answer depends on"""
+        raw = f"{message_lower}|{rag_context}"
+        return hashlib.blake2b(raw.encode(), digest_size=16).digest()
+    
+    def _build_rag_context(self, user_data: Dict, context: Dict) -> str:
+        """User context for the RAG prompt: static lead first, per-user details last"""
+        skills = user_data.get('skills_csv') or ', '.join(user_data.get('skills', []))
+        jobs_block = self._format_jobs_for_context(context.get('matched_jobs', [])[:5])
+        
+        return (
+            f"{_RAG_CONTEXT_PREFIX}\n"
+            f"User Profile:\n"
+            f"- Name: {user_data.get('full_name')}\n"
+            f"- Skills: {skills}\n"
+            f"- Experience: {user_data.get('experience_level')}\n"
+            f"- Interests: {user_data.get('interests')}\n"
+            f"\n"
+            f"Available Jobs (Top Matches):\n"
+            f"{jobs_block}"
+        )
+    
+    def _remember_answer(self, cache_key: bytes, answer: str) -> None:
+        """Insert a RAG answer, evicting the least recently used beyond RAG_CACHE_SIZE"""
+        self._rag_cache[cache_key] = answer
+        self._rag_cache.move_to_end(cache_key)
+        while len(self._rag_cache) > RAG_CACHE_SIZE:
+            self._rag_cache.popitem(last=False)
+    
+    async def process_messages_batch(self, batch: List[Dict]) -> List[str]:
+        """
+        Process several chat messages concurrently
         
-        # Skill improvement query
-        if any(word in message_lower for word in ['skill', 'learn', 'improve', 'study', 'course']):
-             return self._handle_skill_query(user_data, context)
-        
-        # Resume query
-        elif any(word in message_lower for word in ['resume', 'cv', 'profile', 'update']):
-            return self._handle_resume_query(user_data)
-        
-        # Salary/compensation query
-        elif any(word in message_lower for word in ['salary', 'pay', 'compensation', 'package']):
-            return self._handle_salary_query(user_data)
-        
-        # Motivation/encouragement
-        elif any(word in message_lower for word in ['sad', 'depressed', 'frustrated', 'tired', 'give up']):
-            return self._handle_motivation_query(user_data)
-        
-        # General greeting
-        # elif any(word in message_lower for word in ['hi', 'hello', 'hey', 'start']):
-        #     return self._handle_greeting(user_data)
-        
-        # Help query
-        elif any(word in message_lower for word in ['help', 'what can you', 'features']):
-            return self._handle_help_query()
+        Args:
+            batch: List of process_message kwargs
+                   (message, user_data, optional context and chat_history)
         
-        # Default response
-        else:
-            return self._handle_default_query()
+        Returns:
+            AI responses, in the same order as batch
+        """
+        return await asyncio.gather(*(self.process_message(**item) for item in batch))
     
     def _format_jobs_for_context(self, jobs: List[Dict]) -> str:
         """Format jobs list for AI context"""
         if not jobs:
             return "No specific job matches found yet."
             
-        formatted = ""
+        # Collect one line per field and join once (linear, no repeated concatenation);
+        # each line is clipped so long skill lists can't blow up the prompt
+        parts = []
         for job in jobs:
-            formatted += f"- {job.get('title')} at {job.get('company')} ({job.get('location')})\n"
-            formatted += f"  Skills: {', '.join(job.get('skills_required', []))}\n"
-            formatted += f"  Match Score: {job.get('match_score')}%\n"
+            parts.append(f"- {job.get('title')} at {job.get('company')} ({job.get('location')})"[:MAX_JOB_LINE_CHARS])
+            parts.append(f"  Skills: {', '.join(job.get('skills_required', []))}"[:MAX_JOB_LINE_CHARS])
+            parts.append(f"  Match Score: {job.get('match_score')}%")
             
-        return formatted
+        return "\n".join(parts) + "\n"
 
     def _handle_rejection_query(self, user_data: Dict, context: Dict) -> str:
         """Handle rejection analysis queries"""
@@ -197,25 +378,25 @@ Go to the Jobs tab to see your personalized matches! 🎯
         # Show top 3 jobs
         top_jobs = matched_jobs[:3]
         
-        response = f"""
+        parts = [f"""
 🎯 **Found {len(matched_jobs)} jobs for you!**
 
 **Top 3 Recommendations:**
 
-"""
+"""]
         
         for i, job in enumerate(top_jobs, 1):
-            response += f"""
+            parts.append(f"""
 **{i}. {job.get('title')}** at {job.get('company')}
    • Match Score: {job.get('match_score', 0)}%
    • Rejection Risk: {job.get('rejection_risk', 'Low')} 🟢
    • Location: {job.get('location', 'Remote')}
    
-"""
+""")
         
-        response += "\n📋 Check the Jobs tab for all matches!"
+        parts.append("\n📋 Check the Jobs tab for all matches!")
         
-        return response.strip()
+        return "".join(parts).strip()
     
     def _handle_skill_query(self, user_data: Dict, context: Dict) -> str:
         """Handle skill learning queries"""
@@ -246,7 +427,7 @@ Learning these will increase your job match rate significantly! 📈
         
         return response
     
-    def _handle_resume_query(self, user_data: Dict) -> str:
+    def _handle_resume_query(self, user_data: Dict, context: Dict) -> str:
         """Handle resume-related queries"""
         
         skills = user_data.get('skills', [])
@@ -287,7 +468,7 @@ Want me to analyze which skills to add for better matches?
         
         return response
     
-    def _handle_salary_query(self, user_data: Dict) -> str:
+    def _handle_salary_query(self, user_data: Dict, context: Dict) -> str:
         """Handle salary/compensation queries"""
         
         experience = user_data.get('experience_level', 'entry')
@@ -316,92 +497,27 @@ Want me to analyze which skills to add for better matches?
 **Pro Tip:** Companies with 80%+ match scores are more likely to offer competitive packages!
         """.strip()
     
-    def _handle_motivation_query(self, user_data: Dict) -> str:
+    def _handle_motivation_query(self, user_data: Dict, context: Dict) -> str:
         """Handle motivation/encouragement queries"""
         
-        return """
-💪 **You've Got This!**
-
-I know job hunting is tough, but don't give up!
-
-**Remember:**
-• Every rejection is a learning opportunity
-• Even top engineers faced 10+ rejections
-
-**Success Stories:**
-• Applied to 50 jobs → Got 3 offers
-• Learned new skill → Match rate jumped 60%
-
-**Next Steps:**
-1. Take a 15-minute break
-2. Apply to 3 HIGH-MATCH jobs today
-
-**Your dream job is waiting - let's find it together!** 🚀
-        """.strip()
+        return _MOTIVATION_RESPONSE
     
     def _handle_greeting(self, user_data: Dict) -> str:
         """Handle greeting messages"""
         
         name = user_data.get('full_name', 'there')
         
-        return f"""
-👋 **Hi {name}!**
-
-I'm your AI Job Matcher - here to help you land your dream job!
-
-**What I can do:**
-
-1️⃣ **Rejection Analysis** 
-   → "Why am I getting rejected?"
-
-2️⃣ **Smart Job Matching**
-   → "Show me jobs regarding Python"
-
-3️⃣ **Skill Recommendations**
-   → "What skills should I learn?"
-
-4️⃣ **Career Guidance**
-   → "How do I negotiate salary?"
-
-**What would you like help with today?** 🎯
-        """.strip()
+        return f"👋 **Hi {name}!**\n\n{_GREETING_BODY}"
     
-    def _handle_help_query(self) -> str:
+    def _handle_help_query(self, user_data: Dict, context: Dict) -> str:
         """Handle help queries"""
         
-        return """
-🤖 **I'm Your AI Career Assistant!**
-
-**I can help you with:**
-
-📊 **Rejection Analysis**
-• Understand why you're getting rejected
-
-🎯 **Smart Job Matching**
-• Find jobs with HIGH match scores
-
-📚 **Learning Recommendations**
-• Identify skills to learn
-
-💼 **Career Guidance**
-• Resume optimization tips
-
-**Just ask me anything!**
-        """.strip()
+        return _HELP_RESPONSE
     
-    def _handle_default_query(self) -> str:
+    def _handle_default_query(self, user_data: Dict, context: Dict) -> str:
         """Default response for unrecognized queries"""
         
-        return """
-🤔 **I can help you with:**
-
-• 📊 **Rejection Analysis**
-• 🎯 **Job Recommendations**
-• 📚 **Skill Suggestions**
-• 📄 **Resume Help**
-
-**Try asking me one of these questions!**
-        """.strip()
+        return _DEFAULT_RESPONSE
     
     def _format_list(self, items: List[str]) -> str:
         """Format list items with bullets"""
@@ -409,11 +525,7 @@ I'm your AI Job Matcher - here to help you land your dream job!
 
 
 # Global instance
-chat_service_instance = None
-
+@lru_cache(maxsize=1)
 def get_chat_service() -> ChatService:
     """Get or create chat service instance"""
-    global chat_service_instance
-    if chat_service_instance is None:
-        chat_service_instance = ChatService()
-    return chat_service_instance
\ No newline at end of file
+    return ChatService()
\ No newline at end of file
@@ -4,16 +4,81 @@ Handles all Firestore operations for jobs, internships, users
 """
 
 import firebase_admin
-from firebase_admin import credentials, firestore
-from datetime import datetime
-from typing import Dict, List, Optional
+from firebase_admin import credentials, firestore, firestore_async
+from google.api_core.exceptions import AlreadyExists, Aborted, DeadlineExceeded, ServiceUnavailable
+from cachetools import TTLCache
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+import hashlib
 import os
+import threading
 from dotenv import load_dotenv
 import logging
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
+from app.services.statistics_service import get_statistics_service
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+# Sentinel resolved to commit time by Firestore (one clock for every writer)
+_SERVER_TS = firestore.SERVER_TIMESTAMP
+
+# Firestore caps a WriteBatch at 500 operations
+BATCH_WRITE_LIMIT = 500
+
+# Point-read cache for users/jobs/internships (per process)
+DOC_CACHE_SIZE = int(os.getenv("FIRESTORE_CACHE_SIZE", "10000"))
+DOC_CACHE_TTL = int(os.getenv("FIRESTORE_CACHE_TTL", "60"))  # seconds
+
+# Listings known to exist (positive results only) - repeat duplicate checks skip Firestore
+EXISTS_CACHE_SIZE = int(os.getenv("EXISTS_CACHE_SIZE", "50000"))
+EXISTS_CACHE_TTL = int(os.getenv("EXISTS_CACHE_TTL", "86400"))  # seconds
+
+# Manual listings and ones stored before hash IDs use auto-IDs, so bulk creates also
+# probe by title+company (set false to trust the hash ID alone)
+LEGACY_LISTING_PROBE = os.getenv("LEGACY_LISTING_PROBE", "true").lower() == "true"
+
+
+def listing_doc_id(title: str, company: str) -> str:
+    """
+    Deterministic document ID for a job/internship listing
+    
+    The (title, company) pair is the duplicate key, so encoding it in the ID
+    lets Firestore reject duplicates on create() - no existence query needed.
+    """
+    key = f"{(title or '').strip().lower()}|{(company or '').strip().lower()}"
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+
+# Retry idempotent writes on transient gRPC errors (3 attempts, jittered backoff)
+retry_on_transient = retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential_jitter(initial=0.2, max=2),
+    retry=retry_if_exception_type((DeadlineExceeded, Aborted, ServiceUnavailable)),
+    reraise=True
+)
+
+
+@retry_on_transient
+def _update_fields(doc_ref, updates: Dict) -> None:
+    """
+    Idempotent field update of `updates`, retried on transient errors
+    
+    update() carries an exists precondition, so a document deleted in the
+    meantime fails with NotFound instead of being recreated as a stub.
+    """
+    doc_ref.update(updates)
+
+
+def _denormalize_skills(user_data: Dict) -> None:
+    """Store skills pre-sorted and pre-joined so readers skip the per-request join"""
+    skills = user_data.get('skills')
+    if skills is not None:
+        user_data['skills_sorted'] = sorted(skills)
+        user_data['skills_csv'] = ', '.join(user_data['skills_sorted'])
+
 
 class FirebaseService:
     """Firebase Firestore database operations"""
@@ -21,6 +86,16 @@ class FirebaseService:
     def __init__(self):
         """Initialize Firebase connection"""
         
+        # doc id -> document dict, refreshed after DOC_CACHE_TTL seconds
+        self._user_cache = TTLCache(maxsize=DOC_CACHE_SIZE, ttl=DOC_CACHE_TTL)
+        self._job_cache = TTLCache(maxsize=DOC_CACHE_SIZE, ttl=DOC_CACHE_TTL)
+        self._internship_cache = TTLCache(maxsize=DOC_CACHE_SIZE, ttl=DOC_CACHE_TTL)
+        # exact (title, company) -> doc id for jobs check_job_exists has already found
+        self._job_exists_cache = TTLCache(maxsize=EXISTS_CACHE_SIZE, ttl=EXISTS_CACHE_TTL)
+        # doc id -> (title, company) key above, so deletes/renames evict without a scan
+        self._job_exists_keys = TTLCache(maxsize=EXISTS_CACHE_SIZE, ttl=EXISTS_CACHE_TTL)
+        self._cache_lock = threading.RLock()
+        
         # Check multiple possible env variable names
         cred_path = os.getenv("FIREBASE_CREDENTIALS_PATH") or os.getenv("FIREBASE_CRED_PATH")
         
@@ -50,6 +125,32 @@ class FirebaseService:
             logger.error(f"❌ Firebase initialization error: {e}")
             self.db = None
     
+    # ========================================
+    # POINT-READ CACHE
+    # ========================================
+    
+    def _cache_get(self, cache: TTLCache, doc_id: str) -> Optional[Dict]:
+        """Return a copy of a cached document (callers may mutate what they get)"""
+        with self._cache_lock:
+            data = cache.get(doc_id)
+        return dict(data) if data is not None else None
+    
+    def _cache_put(self, cache: TTLCache, doc_id: str, data: Dict) -> None:
+        with self._cache_lock:
+            cache[doc_id] = dict(data)
+    
+    def _cache_evict(self, cache: TTLCache, doc_id: str) -> None:
+        with self._cache_lock:
+            cache.pop(doc_id, None)
+    
+    def _evict_job_exists(self, job_ids: List[str]) -> None:
+        """Forget positive check_job_exists results for deleted or renamed jobs"""
+        with self._cache_lock:
+            for job_id in job_ids:
+                key = self._job_exists_keys.pop(job_id, None)
+                if key is not None and self._job_exists_cache.get(key) == job_id:
+                    self._job_exists_cache.pop(key, None)
+    
     # ========================================
     # USER OPERATIONS
     # ========================================
@@ -62,15 +163,15 @@ class FirebaseService:
             return None
         
         try:
-            # Add timestamps
-            user_data['created_at'] = datetime.utcnow()
-            user_data['updated_at'] = datetime.utcnow()
+            # Add timestamps (on a copy - the sentinel must not leak back to the caller)
+            user_data = {**user_data, 'created_at': _SERVER_TS, 'updated_at': _SERVER_TS}
+            _denormalize_skills(user_data)
             
             # Create document
             doc_ref = self.db.collection('users').add(user_data)
             user_id = doc_ref[1].id
             
-            logger.info(f"✅ User created: {user_id}")
+            logger.debug("✅ User created: %s", user_id)
             return user_id
             
         except Exception as e:
@@ -83,12 +184,17 @@ class FirebaseService:
         if not self.db:
             return None
         
+        cached = self._cache_get(self._user_cache, user_id)
+        if cached is not None:
+            return cached
+        
         try:
             doc = self.db.collection('users').document(user_id).get()
             
             if doc.exists:
                 data = doc.to_dict()
                 data['id'] = doc.id
+                self._cache_put(self._user_cache, user_id, data)
                 return data
             return None
             
@@ -96,6 +202,48 @@ class FirebaseService:
             logger.error(f"❌ Error getting user: {e}")
             return None
     
+    def get_users(self, user_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Get several users in one batched read
+        
+        Args:
+            user_ids: User IDs to fetch
+        
+        Returns:
+            Dict of user_id -> user data (missing users are left out)
+        """
+        
+        if not self.db or not user_ids:
+            return {}
+        
+        users = {}
+        missing = []
+        for user_id in dict.fromkeys(user_ids):
+            cached = self._cache_get(self._user_cache, user_id)
+            if cached is not None:
+                users[user_id] = cached
+            else:
+                missing.append(user_id)
+        
+        if not missing:
+            return users
+        
+        try:
+            users_ref = self.db.collection('users')
+            refs = [users_ref.document(user_id) for user_id in missing]
+            
+            for doc in self.db.get_all(refs):
+                if doc.exists:
+                    data = doc.to_dict()
+                    data['id'] = doc.id
+                    self._cache_put(self._user_cache, doc.id, data)
+                    users[doc.id] = data
+        
+        except Exception as e:
+            logger.error(f"❌ Error getting users: {e}")
+        
+        return users
+        
     def get_user_by_email(self, email: str) -> Optional[Dict]:
         """Get user by email"""
         
@@ -123,10 +271,12 @@ class FirebaseService:
             return False
         
         try:
-            updates['updated_at'] = datetime.utcnow()
+            updates = {**updates, 'updated_at': _SERVER_TS}
+            _denormalize_skills(updates)
             
-            self.db.collection('users').document(user_id).update(updates)
-            logger.info(f"✅ User updated: {user_id}")
+            _update_fields(self.db.collection('users').document(user_id), updates)
+            self._cache_evict(self._user_cache, user_id)
+            logger.debug("✅ User updated: %s", user_id)
             return True
             
         except Exception as e:
@@ -155,6 +305,20 @@ class FirebaseService:
             logger.error(f"❌ Error getting users: {e}")
             return []
     
+    def get_user_ids(self, limit: int = 100) -> List[str]:
+        """Get user IDs only (empty projection - no document fields are downloaded)"""
+        
+        if not self.db:
+            return []
+        
+        try:
+            query = self.db.collection('users').select([]).limit(limit)
+            return [doc.id for doc in query.stream()]
+            
+        except Exception as e:
+            logger.error(f"❌ Error getting user IDs: {e}")
+            return []
+    
     # ========================================
     # JOB OPERATIONS
     # ========================================
@@ -167,16 +331,19 @@ class FirebaseService:
             return None
         
         try:
-            # Add timestamps
-            job_data['created_at'] = datetime.utcnow()
-            job_data['updated_at'] = datetime.utcnow()
-            job_data['is_active'] = job_data.get('is_active', True)
+            # Add timestamps (on a copy - the sentinel must not leak back to the caller)
+            job_data = {
+                **job_data,
+                'created_at': _SERVER_TS,
+                'updated_at': _SERVER_TS,
+                'is_active': job_data.get('is_active', True)
+            }
             
-            # Create document
+            # Create document (auto-ID - hash IDs are only for scraped ingestion)
             doc_ref = self.db.collection('jobs').add(job_data)
             job_id = doc_ref[1].id
             
-            logger.info(f"✅ Job created: {job_id}")
+            logger.debug("✅ Job created: %s", job_id)
             return job_id
             
         except Exception as e:
@@ -189,12 +356,17 @@ class FirebaseService:
         if not self.db:
             return None
         
+        cached = self._cache_get(self._job_cache, job_id)
+        if cached is not None:
+            return cached
+        
         try:
             doc = self.db.collection('jobs').document(job_id).get()
             
             if doc.exists:
                 data = doc.to_dict()
                 data['id'] = doc.id
+                self._cache_put(self._job_cache, job_id, data)
                 return data
             return None
             
@@ -202,7 +374,7 @@ class FirebaseService:
             logger.error(f"❌ Error getting job: {e}")
             return None
     
-    def get_all_jobs(self, limit: int = 100, is_active: bool = True) -> List[Dict]:
+    def get_all_jobs(self, limit: int = 100, is_active: bool = True, fields: Optional[List[str]] = None) -> List[Dict]:
         """Get all jobs with optional filters"""
         
         if not self.db:
@@ -217,6 +389,10 @@ class FirebaseService:
             query = query.order_by('created_at', direction=firestore.Query.DESCENDING)
             query = query.limit(limit)
             
+            # Projection: only download the fields the caller needs
+            if fields:
+                query = query.select(fields)
+            
             docs = query.stream()
             
             jobs = []
@@ -238,10 +414,14 @@ class FirebaseService:
             return False
         
         try:
-            updates['updated_at'] = datetime.utcnow()
+            updates = {**updates, 'updated_at': _SERVER_TS}
             
-            self.db.collection('jobs').document(job_id).update(updates)
-            logger.info(f"✅ Job updated: {job_id}")
+            _update_fields(self.db.collection('jobs').document(job_id), updates)
+            self._cache_evict(self._job_cache, job_id)
+            if 'title' in updates or 'company' in updates:
+                # The old (title, company) pair no longer exists
+                self._evict_job_exists([job_id])
+            logger.debug("✅ Job updated: %s", job_id)
             return True
             
         except Exception as e:
@@ -256,19 +436,59 @@ class FirebaseService:
         
         try:
             self.db.collection('jobs').document(job_id).delete()
-            logger.info(f"✅ Job deleted: {job_id}")
+            self._cache_evict(self._job_cache, job_id)
+            self._evict_job_exists([job_id])
+            logger.debug("✅ Job deleted: %s", job_id)
             return True
             
         except Exception as e:
             logger.error(f"❌ Error deleting job: {e}")
             return False
     
+    def get_old_jobs(self, days: int = 30) -> List[Dict]:
+        """
+        Get ids of jobs created more than `days` days ago
+        
+        Args:
+            days: Age threshold in days
+        
+        Returns:
+            Dicts with just 'id' (and 'created_at')
+        """
+        
+        if not self.db:
+            return []
+        
+        try:
+            cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+            query = self.db.collection('jobs')\
+                .where('created_at', '<', cutoff)\
+                .select(['created_at'])
+            
+            jobs = []
+            for doc in query.stream():
+                data = doc.to_dict()
+                data['id'] = doc.id
+                jobs.append(data)
+            
+            return jobs
+            
+        except Exception as e:
+            logger.error(f"❌ Error getting old jobs: {e}")
+            return []
+    
     def check_job_exists(self, title: str, company: str) -> bool:
         """Check if job already exists (avoid duplicates)"""
         
         if not self.db:
             return False
         
+        # Raw pair, matching the exact-case query below
+        key = (title, company)
+        with self._cache_lock:
+            if key in self._job_exists_cache:
+                return True
+        
         try:
             query = self.db.collection('jobs')\
                 .where('title', '==', title)\
@@ -276,7 +496,14 @@ class FirebaseService:
                 .limit(1)
             
             docs = list(query.stream())
-            return len(docs) > 0
+            exists = len(docs) > 0
+            
+            if exists:
+                # Remember the doc id so deletes can evict the entry
+                with self._cache_lock:
+                    self._job_exists_cache[key] = docs[0].id
+                    self._job_exists_keys[docs[0].id] = key
+            return exists
             
         except Exception as e:
             logger.error(f"❌ Error checking job exists: {e}")
@@ -294,16 +521,14 @@ class FirebaseService:
             return None
         
         try:
-            # Add timestamps
-            internship_data['created_at'] = datetime.utcnow()
-            internship_data['updated_at'] = datetime.utcnow()
-            internship_data['is_active'] = True
+            # Add timestamps (on a copy - the sentinel must not leak back to the caller)
+            internship_data = {**internship_data, 'created_at': _SERVER_TS, 'updated_at': _SERVER_TS, 'is_active': True}
             
-            # Create document
+            # Create document (auto-ID - hash IDs are only for scraped ingestion)
             doc_ref = self.db.collection('internships').add(internship_data)
             internship_id = doc_ref[1].id
             
-            logger.info(f"✅ Internship created: {internship_id}")
+            logger.debug("✅ Internship created: %s", internship_id)
             return internship_id
             
         except Exception as e:
@@ -316,12 +541,17 @@ class FirebaseService:
         if not self.db:
             return None
         
+        cached = self._cache_get(self._internship_cache, internship_id)
+        if cached is not None:
+            return cached
+        
         try:
             doc = self.db.collection('internships').document(internship_id).get()
             
             if doc.exists:
                 data = doc.to_dict()
                 data['id'] = doc.id
+                self._cache_put(self._internship_cache, internship_id, data)
                 return data
             return None
             
@@ -329,7 +559,7 @@ class FirebaseService:
             logger.error(f"❌ Error getting internship: {e}")
             return None
     
-    def get_all_internships(self, limit: int = 100, is_active: bool = True) -> List[Dict]:
+    def get_all_internships(self, limit: int = 100, is_active: bool = True, fields: Optional[List[str]] = None) -> List[Dict]:
         """Get all internships"""
         
         if not self.db:
@@ -344,6 +574,10 @@ class FirebaseService:
             query = query.order_by('created_at', direction=firestore.Query.DESCENDING)
             query = query.limit(limit)
             
+            # Projection: only download the fields the caller needs
+            if fields:
+                query = query.select(fields)
+            
             docs = query.stream()
             
             internships = []
@@ -365,10 +599,11 @@ class FirebaseService:
             return False
         
         try:
-            updates['updated_at'] = datetime.utcnow()
+            updates = {**updates, 'updated_at': _SERVER_TS}
             
-            self.db.collection('internships').document(internship_id).update(updates)
-            logger.info(f"✅ Internship updated: {internship_id}")
+            _update_fields(self.db.collection('internships').document(internship_id), updates)
+            self._cache_evict(self._internship_cache, internship_id)
+            logger.debug("✅ Internship updated: %s", internship_id)
             return True
             
         except Exception as e:
@@ -383,7 +618,8 @@ class FirebaseService:
         
         try:
             self.db.collection('internships').document(internship_id).delete()
-            logger.info(f"✅ Internship deleted: {internship_id}")
+            self._cache_evict(self._internship_cache, internship_id)
+            logger.debug("✅ Internship deleted: %s", internship_id)
             return True
             
         except Exception as e:
@@ -420,8 +656,11 @@ class FirebaseService:
             return None
         
         try:
-            application_data['created_at'] = datetime.utcnow()
-            application_data['status'] = application_data.get('status', 'applied')
+            application_data = {
+                **application_data,
+                'created_at': _SERVER_TS,
+                'status': application_data.get('status', 'applied')
+            }
             
             doc_ref = self.db.collection('applications').add(application_data)
             return doc_ref[1].id
@@ -430,6 +669,25 @@ class FirebaseService:
             logger.error(f"❌ Error creating application: {e}")
             return None
     
+    def get_application(self, application_id: str) -> Optional[Dict]:
+        """Get application by ID"""
+        
+        if not self.db:
+            return None
+        
+        try:
+            doc = self.db.collection('applications').document(application_id).get()
+            
+            if doc.exists:
+                data = doc.to_dict()
+                data['id'] = doc.id
+                return data
+            return None
+            
+        except Exception as e:
+            logger.error(f"❌ Error getting application: {e}")
+            return None
+    
     def get_user_applications(self, user_id: str) -> List[Dict]:
         """Get all applications for a user"""
         
@@ -455,28 +713,281 @@ class FirebaseService:
             logger.error(f"❌ Error getting applications: {e}")
             return []
     
-    def update_application_status(self, application_id: str, status: str, rejection_reason: str = None) -> bool:
-        """Update application status (applied, interview, rejected, accepted)"""
+    def get_user_rejections(self, user_id: str) -> List[Dict]:
+        """Get all rejection records for a user"""
+        
+        if not self.db:
+            return []
+        
+        try:
+            docs = self.db.collection('rejections').where('user_id', '==', user_id).stream()
+            
+            rejections = []
+            for doc in docs:
+                data = doc.to_dict()
+                data['id'] = doc.id
+                rejections.append(data)
+            
+            return rejections
+            
+        except Exception as e:
+            logger.error(f"❌ Error getting rejections: {e}")
+            return []
+    
+    def update_application_status(
+        self,
+        application_id: str,
+        status: str,
+        rejection_reason: str = None,
+        user_id: Optional[str] = None
+    ) -> bool:
+        """
+        Update application status (applied, interview, rejected, accepted)
+        
+        Status counts feed the owner's dashboard, so their cached statistics
+        are dropped after the write.
+        
+        Args:
+            application_id: Application document ID
+            status: New status
+            rejection_reason: Stored alongside a rejected status
+            user_id: Application owner (read from the document if not given)
+        
+        Returns:
+            True if the application was updated
+        """
         
         if not self.db:
             return False
         
         try:
+            doc_ref = self.db.collection('applications').document(application_id)
+            
+            if user_id is None:
+                snapshot = doc_ref.get(field_paths=['user_id'])
+                user_id = snapshot.get('user_id') if snapshot.exists else None
+            
             updates = {
                 'status': status,
-                'updated_at': datetime.utcnow()
+                'updated_at': _SERVER_TS
             }
             
             if rejection_reason:
                 updates['rejection_reason'] = rejection_reason
             
-            self.db.collection('applications').document(application_id).update(updates)
+            doc_ref.update(updates)
+            
+            if user_id:
+                get_statistics_service().invalidate(user_id)
             return True
             
         except Exception as e:
             logger.error(f"❌ Error updating application: {e}")
             return False
     
+    def create_rejection(self, rejection_data: Dict) -> Optional[str]:
+        """Create rejection record (feeds the dashboard's rejection analysis)"""
+        
+        if not self.db:
+            return None
+        
+        try:
+            rejection_data = {**rejection_data, 'created_at': _SERVER_TS}
+            
+            doc_ref = self.db.collection('rejections').add(rejection_data)
+            
+            if rejection_data.get('user_id'):
+                get_statistics_service().invalidate(rejection_data['user_id'])
+            return doc_ref[1].id
+            
+        except Exception as e:
+            logger.error(f"❌ Error creating rejection: {e}")
+            return None
+    
+    # ========================================
+    # BULK OPERATIONS
+    # ========================================
+    
+    def bulk_create_jobs(self, jobs: List[Dict]) -> List[Optional[str]]:
+        """Create many jobs with batched writes (same defaults as create_job)"""
+        
+        # Copies - the timestamp sentinel must not leak into the caller's dicts
+        jobs = [
+            {**job_data, 'created_at': _SERVER_TS, 'updated_at': _SERVER_TS, 'is_active': job_data.get('is_active', True)}
+            for job_data in jobs
+        ]
+        
+        doc_ids = [listing_doc_id(doc.get('title'), doc.get('company')) for doc in jobs]
+        legacy_exists = self.check_job_exists if LEGACY_LISTING_PROBE else None
+        return self._bulk_create('jobs', jobs, doc_ids, legacy_exists)
+    
+    def bulk_create_internships(self, internships: List[Dict]) -> List[Optional[str]]:
+        """Create many internships with batched writes (same defaults as create_internship)"""
+        
+        # Copies - the timestamp sentinel must not leak into the caller's dicts
+        internships = [
+            {**internship_data, 'created_at': _SERVER_TS, 'updated_at': _SERVER_TS, 'is_active': True}
+            for internship_data in internships
+        ]
+        
+        doc_ids = [listing_doc_id(doc.get('title'), doc.get('company')) for doc in internships]
+        legacy_exists = self.check_internship_exists if LEGACY_LISTING_PROBE else None
+        return self._bulk_create('internships', internships, doc_ids, legacy_exists)
+    
+    def bulk_create_applications(self, applications: List[Dict]) -> List[Optional[str]]:
+        """Create many applications with batched writes (same defaults as create_application)"""
+        
+        # Copies - the timestamp sentinel must not leak into the caller's dicts
+        applications = [
+            {**application_data, 'created_at': _SERVER_TS, 'status': application_data.get('status', 'applied')}
+            for application_data in applications
+        ]
+        
+        return self._bulk_create('applications', applications)
+    
+    def bulk_delete_jobs(self, job_ids: List[str]) -> int:
+        """
+        Delete many jobs in WriteBatch chunks - one RPC per 500 deletes
+        
+        Args:
+            job_ids: Job document IDs
+        
+        Returns:
+            Number of jobs deleted
+        """
+        
+        if not self.db:
+            return 0
+        
+        collection_ref = self.db.collection('jobs')
+        deleted = 0
+        
+        for start in range(0, len(job_ids), BATCH_WRITE_LIMIT):
+            chunk = job_ids[start:start + BATCH_WRITE_LIMIT]
+            
+            batch = self.db.batch()
+            for job_id in chunk:
+                batch.delete(collection_ref.document(job_id))
+            
+            try:
+                batch.commit()
+                deleted += len(chunk)
+            except Exception as e:
+                logger.error(f"❌ Error deleting jobs batch: {e}")
+                continue
+            
+            with self._cache_lock:
+                for job_id in chunk:
+                    self._job_cache.pop(job_id, None)
+            self._evict_job_exists(chunk)
+        
+        logger.info(f"✅ Bulk deleted {deleted}/{len(job_ids)} jobs")
+        return deleted
+    
+    def _bulk_create(
+        self,
+        collection: str,
+        docs: List[Dict],
+        doc_ids: Optional[List[str]] = None,
+        legacy_exists: Optional[Callable[[str, str], bool]] = None
+    ) -> List[Optional[str]]:
+        """
+        Write documents in WriteBatch chunks - one RPC per 500 docs instead of one each
+        
+        Args:
+            collection: Target collection name
+            docs: Documents to create
+            doc_ids: Deterministic IDs (duplicates are skipped); auto-IDs if None
+            legacy_exists: (title, company) probe for pre-hash-ID documents, run only
+                for docs whose hash ID is not stored yet
+        
+        Returns:
+            Document IDs aligned with docs (None for duplicates and failed writes)
+        """
+        
+        if not self.db:
+            logger.error("❌ Database not initialized")
+            return [None] * len(docs)
+        
+        collection_ref = self.db.collection(collection)
+        
+        # Auto-IDs are generated client-side, so every ID is known before commit
+        if doc_ids is None:
+            refs = [collection_ref.document() for _ in docs]
+        else:
+            # A repeated ID inside one batch would fail the whole commit
+            seen = set()
+            refs = []
+            for doc_id in doc_ids:
+                refs.append(None if doc_id in seen else collection_ref.document(doc_id))
+                seen.add(doc_id)
+        
+        created: List[Optional[str]] = []
+        
+        for start in range(0, len(docs), BATCH_WRITE_LIMIT):
+            chunk = list(zip(refs[start:start + BATCH_WRITE_LIMIT], docs[start:start + BATCH_WRITE_LIMIT]))
+            
+            pending = [ref for ref, _ in chunk if ref is not None]
+            
+            if doc_ids is not None and pending:
+                # One batched read finds the IDs already stored (instead of a query per doc)
+                try:
+                    existing = {
+                        snapshot.id
+                        for snapshot in self.db.get_all(pending, field_paths=['title'])
+                        if snapshot.exists
+                    }
+                except Exception as e:
+                    logger.warning(f"⚠️ Existence check failed, relying on create(): {e}")
+                    existing = set()
+                chunk = [(None if ref is None or ref.id in existing else ref, doc) for ref, doc in chunk]
+                
+                if legacy_exists is not None:
+                    chunk = [
+                        (None if ref is None or legacy_exists(doc.get('title'), doc.get('company')) else ref, doc)
+                        for ref, doc in chunk
+                    ]
+                pending = [ref for ref, _ in chunk if ref is not None]
+            
+            if not pending:
+                created.extend([None] * len(chunk))
+                continue
+            
+            batch = self.db.batch()
+            for ref, doc in chunk:
+                if ref is not None:
+                    batch.create(ref, doc)
+            
+            try:
+                batch.commit()
+                created.extend(ref.id if ref is not None else None for ref, _ in chunk)
+            except AlreadyExists:
+                # Lost a race with another writer - batches are atomic, so retry per document
+                created.extend(self._create_each(chunk))
+            except Exception as e:
+                logger.error(f"❌ Error writing {collection} batch: {e}")
+                created.extend([None] * len(chunk))
+        
+        logger.info(f"✅ Bulk created {sum(1 for doc_id in created if doc_id)}/{len(docs)} {collection}")
+        return created
+    
+    def _create_each(self, chunk: List) -> List[Optional[str]]:
+        """Create (ref, doc) pairs one at a time; None for existing or failed documents"""
+        created = []
+        for ref, doc in chunk:
+            if ref is None:
+                created.append(None)
+                continue
+            try:
+                ref.create(doc)
+                created.append(ref.id)
+            except AlreadyExists:
+                created.append(None)
+            except Exception as e:
+                logger.error(f"❌ Error creating {ref.path}: {e}")
+                created.append(None)
+        return created
+    
     # ========================================
     # STATISTICS
     # ========================================
@@ -488,11 +999,18 @@ class FirebaseService:
             return {}
         
         try:
-            # Count documents in each collection
-            users_count = len(list(self.db.collection('users').limit(1000).stream()))
-            jobs_count = len(list(self.db.collection('jobs').where('is_active', '==', True).limit(1000).stream()))
-            internships_count = len(list(self.db.collection('internships').where('is_active', '==', True).limit(1000).stream()))
-            applications_count = len(list(self.db.collection('applications').limit(1000).stream()))
+            # Server-side count() aggregations - only the totals cross the wire.
+            # The four RPCs are independent, so run them concurrently.
+            queries = [
+                self.db.collection('users'),
+                self.db.collection('jobs').where('is_active', '==', True),
+                self.db.collection('internships').where('is_active', '==', True),
+                self.db.collection('applications')
+            ]
+            with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+                users_count, jobs_count, internships_count, applications_count = executor.map(
+                    self._count, queries
+                )
             
             return {
                 'total_users': users_count,
@@ -504,20 +1022,136 @@ class FirebaseService:
         except Exception as e:
             logger.error(f"❌ Error getting statistics: {e}")
             return {}
+    
+    def _count(self, query) -> int:
+        """Run a count() aggregation for a collection/query"""
+        return int(query.count().get()[0][0].value)
+
+
+class FirebaseAsyncService:
+    """
+    Async Firestore reads for request handlers
+    
+    Built on firestore.AsyncClient so independent reads can be awaited
+    together with asyncio.gather. Background workers keep using the sync
+    FirebaseService; point reads share its TTL cache.
+    """
+    
+    def __init__(self):
+        # The sync service initializes the Firebase app (once) and owns the cache
+        self.sync = get_firebase_service()
+        self.db = firestore_async.client() if self.sync.db else None
+        
+        if self.db:
+            logger.info("✅ Firestore async client ready!")
+    
+    async def get_user_async(self, user_id: str) -> Optional[Dict]:
+        """Get user by ID"""
+        
+        if not self.db:
+            return None
+        
+        cached = self.sync._cache_get(self.sync._user_cache, user_id)
+        if cached is not None:
+            return cached
+        
+        try:
+            doc = await self.db.collection('users').document(user_id).get()
+            
+            if doc.exists:
+                data = doc.to_dict()
+                data['id'] = doc.id
+                self.sync._cache_put(self.sync._user_cache, user_id, data)
+                return data
+            return None
+            
+        except Exception as e:
+            logger.error(f"❌ Error getting user: {e}")
+            return None
+    
+    async def get_user_applications_async(self, user_id: str) -> List[Dict]:
+        """Get all applications for a user"""
+        
+        if not self.db:
+            return []
+        
+        try:
+            query = self.db.collection('applications')\
+                .where('user_id', '==', user_id)\
+                .order_by('created_at', direction=firestore.Query.DESCENDING)
+            
+            return await self._collect(query)
+            
+        except Exception as e:
+            logger.error(f"❌ Error getting applications: {e}")
+            return []
+    
+    async def get_user_rejections_async(self, user_id: str) -> List[Dict]:
+        """Get all rejection records for a user"""
+        
+        if not self.db:
+            return []
+        
+        try:
+            query = self.db.collection('rejections').where('user_id', '==', user_id)
+            return await self._collect(query)
+            
+        except Exception as e:
+            logger.error(f"❌ Error getting rejections: {e}")
+            return []
+    
+    async def get_all_jobs_async(
+        self,
+        limit: int = 100,
+        is_active: bool = True,
+        fields: Optional[List[str]] = None
+    ) -> List[Dict]:
+        """Get all jobs with optional filters"""
+        
+        if not self.db:
+            return []
+        
+        try:
+            query = self.db.collection('jobs')
+            
+            if is_active:
+                query = query.where('is_active', '==', True)
+            
+            query = query.order_by('created_at', direction=firestore.Query.DESCENDING)
+            query = query.limit(limit)
+            
+            if fields:
+                query = query.select(fields)
+            
+            return await self._collect(query)
+            
+        except Exception as e:
+            logger.error(f"❌ Error getting jobs: {e}")
+            return []
+    
+    async def _collect(self, query) -> List[Dict]:
+        """Stream a query into a list of dicts with their document IDs"""
+        results = []
+        async for doc in query.stream():
+            data = doc.to_dict()
+            data['id'] = doc.id
+            results.append(data)
+        return results
 
 
 # ========================================
 # GLOBAL INSTANCE
 # ========================================
 
-firebase_instance = None
-
+@lru_cache(maxsize=1)
 def get_firebase_service() -> FirebaseService:
     """Get or create Firebase service instance"""
-    global firebase_instance
-    if firebase_instance is None:
-        firebase_instance = FirebaseService()
-    return firebase_instance
+    return FirebaseService()
+
+@lru_cache(maxsize=1)
+def get_firebase_async_service() -> FirebaseAsyncService:
+    """Get or create async Firebase service instance (shares one AsyncClient)"""
+    return FirebaseAsyncService()
 
 def init_db():
     """Initialize database (called on startup)"""
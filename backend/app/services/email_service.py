@@ -4,19 +4,266 @@ Send job match notifications to users
 Supports Gmail, Outlook, and custom SMTP
 """
 
+import bisect
 import smtplib
+import queue
+import re
+import threading
+import time
+from email import charset as email_charset
+from email import policy as email_policy
+from email.generator import BytesGenerator
+from io import BytesIO
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 import os
 from dotenv import load_dotenv
 import logging
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
+import aiosmtplib
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+from markupsafe import Markup
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+# Authenticated SMTP connections kept open between sends
+SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", 5))
+# Retire a pooled connection after this many messages
+SMTP_MAX_MESSAGES_PER_CONN = int(os.getenv("SMTP_MAX_MESSAGES_PER_CONN", 100))
+# Seconds to wait for the TCP connect vs. for each command/data reply once
+# connected (slow links need the longer one; a dead host should fail fast)
+SMTP_CONNECT_TIMEOUT = float(os.getenv("SMTP_CONNECT_TIMEOUT", 10))
+SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT", 60))
+# Coroutines draining the async send queue (one persistent connection each)
+ASYNC_SMTP_WORKERS = int(os.getenv("ASYNC_SMTP_WORKERS", 1))
+ASYNC_SEND_QUEUE_SIZE = int(os.getenv("ASYNC_SEND_QUEUE_SIZE", 1000))
+# Outbound rate limit shared by sync and async sends (provider throttling)
+EMAIL_RATE_PER_MINUTE = float(os.getenv("EMAIL_RATE_PER_MINUTE", 90))
+EMAIL_RATE_BURST = int(os.getenv("EMAIL_RATE_BURST", 90))
+# Max seconds a send waits for a token before failing
+EMAIL_RATE_WAIT = float(os.getenv("EMAIL_RATE_WAIT", 30))
+# Abort the rest of a batch once this many sends were tried and over this share failed
+BATCH_ABORT_MIN_ATTEMPTS = int(os.getenv("BATCH_ABORT_MIN_ATTEMPTS", 10))
+BATCH_ABORT_FAILURE_RATIO = float(os.getenv("BATCH_ABORT_FAILURE_RATIO", 0.33))
+
+# Email templates (compiled once; bytecode cached on disk across restarts)
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates", "email")
+
+# Job cards per digest email
+DIGEST_MAX_JOBS = 5
+
+# Score tiers, lowest first: a score reaching _SCORE_CUTS[i - 1] lands in _SCORE_TIERS[i]
+_SCORE_CUTS = (70, 80, 90)
+_SCORE_TIERS = (
+    ("👍", "POTENTIAL"),
+    ("✨", "GOOD"),
+    ("🎯", "GREAT"),
+    ("🔥", "EXCELLENT"),
+)
+
+
+# Comments and indentation stripped from .html templates when they are compiled
+_HTML_COMMENT = re.compile(r'<!--.*?-->', re.S)
+_LINE_BREAK = re.compile(r'(>|%\})?\s*\n\s*(<|\{%)?')
+
+# SMTP caps lines at 998 bytes; 8bit bodies must respect it themselves
+SMTP_MAX_LINE = 998
+
+# Prebuilt body charsets (no per-message charset lookup):
+# - 8bit: raw UTF-8, used when the server advertises 8BITMIME
+# - quoted-printable otherwise: mostly-ASCII HTML stays ~1x its size
+#   (base64 adds a third)
+_UTF8_8BIT = email_charset.Charset('utf-8')
+_UTF8_8BIT.body_encoding = None
+_UTF8_QP = email_charset.Charset('utf-8')
+_UTF8_QP.body_encoding = email_charset.QP
+
+
+def _collapse_line_break(match: re.Match) -> str:
+    """Drop indentation; keep one newline between tags so lines stay short"""
+    before, after = match.group(1) or '', match.group(2) or ''
+    return before + ('\n' if before and after else ' ') + after
+
+
+def _fits_8bit(content: str) -> bool:
+    """True if every line fits the SMTP line limit once UTF-8 encoded"""
+    return all(len(line.encode()) <= SMTP_MAX_LINE for line in content.split('\n'))
+
+
+# Wire format for DATA: our compat32 messages with CRLF line endings (what
+# send_message uses; policy.SMTP can't fold their raw non-ASCII headers)
+_SMTP_POLICY = email_policy.compat32.clone(linesep='\r\n')
+
+
+def _flatten(msg: MIMEMultipart) -> bytes:
+    """Serialize a message to the bytes sent after DATA (one generator walk)"""
+    buf = BytesIO()
+    BytesGenerator(buf, mangle_from_=False, policy=_SMTP_POLICY).flatten(msg)
+    return buf.getvalue()
+
+
+def _mail_options(msg: MIMEMultipart) -> Tuple[str, ...]:
+    """MAIL FROM parameters the message needs (BODY=8BITMIME for raw UTF-8 parts)"""
+    if any(part.get('Content-Transfer-Encoding') == '8bit' for part in msg.walk()):
+        return ('BODY=8BITMIME',)
+    return ()
+
+
+class _MinifyingLoader(FileSystemLoader):
+    """FileSystemLoader that minifies HTML templates once, before compilation"""
+    
+    def get_source(self, environment, template):
+        source, filename, uptodate = super().get_source(environment, template)
+        if template.endswith(".html.j2"):
+            source = _HTML_COMMENT.sub('', source)
+            source = _LINE_BREAK.sub(_collapse_line_break, source).strip()
+        return source, filename, uptodate
+
+
+def _format_inr(amount) -> str:
+    """Format a rupee amount with thousands separators ('N/A' if missing)"""
+    if isinstance(amount, (int, float)):
+        return f"₹{amount:,}"
+    return "N/A"
+
+
+_LEADING_PERIOD = re.compile(br'(?m)^\.')
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket
+    
+    Holds up to `capacity` tokens, refilled continuously at `refill_per_sec`.
+    Callers that find it empty wait for the next token instead of being dropped.
+    """
+    
+    def __init__(self, capacity: int, refill_per_sec: float):
+        self.capacity = capacity
+        self.refill_per_sec = refill_per_sec
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._cond = threading.Condition()
+    
+    def _try_take(self) -> float:
+        """Take a token if available; returns 0, or the seconds until one is (lock held)"""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.refill_per_sec)
+        self._updated = now
+        
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.refill_per_sec
+    
+    def acquire(self, blocking: bool = True, timeout: Optional[float] = None) -> bool:
+        """Take one token, waiting up to `timeout` seconds if blocking"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        
+        with self._cond:
+            while True:
+                wait = self._try_take()
+                if not wait:
+                    return True
+                if not blocking:
+                    return False
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    wait = min(wait, remaining)
+                self._cond.wait(wait)
+    
+    async def acquire_async(self, timeout: Optional[float] = None) -> bool:
+        """Take one token without blocking the event loop"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        
+        while True:
+            with self._cond:
+                wait = self._try_take()
+            if not wait:
+                return True
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            await asyncio.sleep(wait)
+
+
+class PipeliningSMTP(smtplib.SMTP):
+    """
+    smtplib.SMTP that pipelines the envelope when the server allows it
+    
+    With the PIPELINING extension (RFC 2920) MAIL FROM, every RCPT TO and
+    DATA go out in one write and their replies are read back afterwards,
+    so a message costs one round-trip before the body instead of 2 + N.
+    Servers without the extension use the standard lock-step sendmail.
+    
+    The TCP connect is bounded by SMTP_CONNECT_TIMEOUT; the `timeout` passed
+    to the constructor applies to everything after it.
+    """
+    
+    def _get_socket(self, host, port, timeout):
+        sock = super()._get_socket(host, port, SMTP_CONNECT_TIMEOUT)
+        sock.settimeout(timeout)
+        return sock
+    
+    def sendmail(self, from_addr, to_addrs, msg, mail_options=(), rcpt_options=()):
+        self.ehlo_or_helo_if_needed()
+        if not self.has_extn('pipelining'):
+            return super().sendmail(from_addr, to_addrs, msg, mail_options, rcpt_options)
+        
+        if isinstance(to_addrs, str):
+            to_addrs = [to_addrs]
+        if isinstance(msg, str):
+            msg = smtplib._fix_eols(msg).encode('ascii')
+        
+        mail_params = "".join(f" {option}" for option in mail_options)
+        rcpt_params = "".join(f" {option}" for option in rcpt_options)
+        commands = [f"mail FROM:{smtplib.quoteaddr(from_addr)}{mail_params}"]
+        commands.extend(f"rcpt TO:{smtplib.quoteaddr(addr)}{rcpt_params}" for addr in to_addrs)
+        commands.append("data")
+        self.send("".join(cmd + smtplib.CRLF for cmd in commands))
+        
+        # Replies arrive in command order: MAIL, each RCPT, then DATA
+        mail_code, mail_resp = self.getreply()
+        refused = {}
+        for addr in to_addrs:
+            code, resp = self.getreply()
+            if code not in (250, 251):
+                refused[addr] = (code, resp)
+        data_code, data_resp = self.getreply()
+        
+        if mail_code != 250:
+            self._abort(mail_code)
+            raise smtplib.SMTPSenderRefused(mail_code, mail_resp, from_addr)
+        if data_code != 354:
+            self._abort(data_code)
+            if len(refused) == len(to_addrs):
+                raise smtplib.SMTPRecipientsRefused(refused)
+            raise smtplib.SMTPDataError(data_code, data_resp)
+        
+        body = _LEADING_PERIOD.sub(b'..', msg)
+        if not body.endswith(smtplib.bCRLF):
+            body += smtplib.bCRLF
+        self.send(body + b"." + smtplib.bCRLF)
+        
+        code, resp = self.getreply()
+        if code != 250:
+            self._abort(code)
+            raise smtplib.SMTPDataError(code, resp)
+        return refused
+    
+    def _abort(self, code: int):
+        """Reset the transaction, or drop the socket if the server is closing it"""
+        if code == 421:
+            self.close()
+        else:
+            self._rset()
+
 class EmailService:
     """Send email notifications to users"""
     
@@ -27,14 +274,176 @@ class EmailService:
         self.password = os.getenv("SMTP_PASSWORD")
         self.app_name = os.getenv("APP_NAME", "Intelligent Job Matcher")
         
-        # Thread pool for async email sending
-        self.executor = ThreadPoolExecutor(max_workers=5)
+        # Precompiled email templates
+        self._env = Environment(
+            loader=_MinifyingLoader(TEMPLATES_DIR),
+            autoescape=select_autoescape(enabled_extensions=("html.j2",)),
+            auto_reload=False,
+            bytecode_cache=FileSystemBytecodeCache()
+        )
+        # Fixed for the process lifetime - bound once instead of passed per render
+        self._env.globals["app_name"] = self.app_name
+        self._from_header = f"{self.app_name} <{self.email}>"
+        
+        self._tpl_password_reset_html = self._env.get_template("password_reset.html.j2")
+        self._tpl_password_reset_text = self._env.get_template("password_reset.txt.j2")
+        self._tpl_job_match_html = self._env.get_template("job_match.html.j2")
+        self._tpl_job_card_html = self._env.get_template("job_card.html.j2")
+        self._tpl_job_match_text = self._env.get_template("job_match.txt.j2")
+        self._tpl_job_digest_html = self._env.get_template("job_digest.html.j2")
+        self._tpl_welcome_html = self._env.get_template("welcome.html.j2")
+        
+        # Throttle outbound mail to the provider's limits
+        self._bucket = TokenBucket(
+            capacity=EMAIL_RATE_BURST,
+            refill_per_sec=EMAIL_RATE_PER_MINUTE / 60
+        )
+        
+        # Async sends: queue drained by aiosmtplib worker coroutines
+        # (created lazily on the running event loop)
+        self._send_queue: Optional[asyncio.Queue] = None
+        self._send_workers: List[asyncio.Task] = []
+        self._send_loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # Pool of logged-in SMTP connections (skips TCP+TLS+AUTH per email)
+        self._pool: "queue.Queue[smtplib.SMTP]" = queue.Queue(maxsize=SMTP_POOL_SIZE)
+        self._pool_lock = threading.Lock()
+        
+        # Learned from the first connection's EHLO: send raw UTF-8 bodies?
+        self._server_8bitmime = False
         
         if not self.email or not self.password:
             logger.warning("⚠️ Email credentials not configured")
         else:
             logger.info(f"✅ Email service ready: {self.email}")
     
+    def _open_conn(self) -> smtplib.SMTP:
+        """Open a new authenticated SMTP connection"""
+        conn = PipeliningSMTP(self.smtp_server, self.smtp_port, timeout=SMTP_TIMEOUT)
+        try:
+            conn.starttls()
+            conn.login(self.email, self.password)
+        except Exception:
+            self._discard_conn(conn)
+            raise
+        self._server_8bitmime = conn.has_extn('8bitmime')
+        conn.messages_sent = 0
+        return conn
+    
+    def _acquire_conn(self) -> smtplib.SMTP:
+        """Borrow a pooled connection, or open one if the pool is empty"""
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            return self._open_conn()
+    
+    def _release_conn(self, conn: smtplib.SMTP):
+        """
+        Return a connection to the pool
+        
+        Connections that have sent SMTP_MAX_MESSAGES_PER_CONN messages, fail
+        the NOOP health check, or don't fit in the pool are closed instead.
+        """
+        if conn.messages_sent >= SMTP_MAX_MESSAGES_PER_CONN:
+            self._discard_conn(conn)
+            return
+        
+        try:
+            healthy = conn.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            healthy = False
+        
+        if not healthy:
+            self._discard_conn(conn)
+            return
+        
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            self._discard_conn(conn)
+    
+    @staticmethod
+    def _discard_conn(conn: smtplib.SMTP):
+        """Close a connection, ignoring errors from dead sockets"""
+        try:
+            conn.quit()
+        except (smtplib.SMTPException, OSError):
+            conn.close()
+    
+    def close_all(self):
+        """Close every pooled SMTP connection (called on app shutdown)"""
+        with self._pool_lock:
+            closed = 0
+            while True:
+                try:
+                    conn = self._pool.get_nowait()
+                except queue.Empty:
+                    break
+                self._discard_conn(conn)
+                closed += 1
+        
+        if closed:
+            logger.info(f"✅ Closed {closed} pooled SMTP connection(s)")
+    
+    def _deliver(self, conn: smtplib.SMTP, msg: MIMEMultipart) -> smtplib.SMTP:
+        """
+        Send a message, reconnecting once if the server dropped the connection
+        
+        Waits for a rate-limit token first. The message is flattened once,
+        so a retry resends the same bytes. Returns the connection to keep
+        using. On failure the connection is closed and the error re-raised.
+        """
+        if not self._bucket.acquire(timeout=EMAIL_RATE_WAIT):
+            self._discard_conn(conn)
+            raise TimeoutError(f"send rate limit: no token within {EMAIL_RATE_WAIT:.0f}s")
+        
+        body = _flatten(msg)
+        to_addrs = [msg['To']]
+        mail_options = _mail_options(msg)
+        
+        try:
+            conn.sendmail(self.email, to_addrs, body, mail_options)
+        except smtplib.SMTPServerDisconnected:
+            # Pooled connection went stale - retry once on a fresh one
+            self._discard_conn(conn)
+            conn = self._open_conn()
+            try:
+                conn.sendmail(self.email, to_addrs, body, mail_options)
+            except Exception:
+                self._discard_conn(conn)
+                raise
+        except Exception:
+            self._discard_conn(conn)
+            raise
+        
+        conn.messages_sent += 1
+        return conn
+    
+    def _build_message(
+        self,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        text_content: str = ""
+    ) -> MIMEMultipart:
+        """Build a multipart/alternative message from our sender address"""
+        msg = MIMEMultipart('alternative')
+        msg['From'] = self._from_header
+        msg['To'] = to_email
+        msg['Subject'] = subject
+        
+        # Attach both plain text and HTML
+        if text_content:
+            msg.attach(MIMEText(text_content, 'plain', self._body_charset(text_content)))
+        msg.attach(MIMEText(html_content, 'html', self._body_charset(html_content)))
+        return msg
+    
+    def _body_charset(self, content: str) -> email_charset.Charset:
+        """Raw 8bit when the server takes it and no line is too long, else quoted-printable"""
+        if self._server_8bitmime and _fits_8bit(content):
+            return _UTF8_8BIT
+        return _UTF8_QP
+    
     def _send_email_sync(
         self,
         to_email: str,
@@ -60,22 +469,10 @@ class EmailService:
             return False
         
         try:
-            # Create message
-            msg = MIMEMultipart('alternative')
-            msg['From'] = f"{self.app_name} <{self.email}>"
-            msg['To'] = to_email
-            msg['Subject'] = subject
+            msg = self._build_message(to_email, subject, html_content, text_content)
             
-            # Attach both plain text and HTML
-            if text_content:
-                msg.attach(MIMEText(text_content, 'plain'))
-            msg.attach(MIMEText(html_content, 'html'))
-            
-            # Send email
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.email, self.password)
-                server.send_message(msg)
+            # Send email on a pooled connection
+            self._release_conn(self._deliver(self._acquire_conn(), msg))
             
             logger.info(f"✅ Email sent to {to_email}")
             return True
@@ -84,6 +481,68 @@ class EmailService:
             logger.error(f"❌ Failed to send email to {to_email}: {e}")
             return False
     
+    def send_batch(self, messages: List[MIMEMultipart]) -> List[Optional[bool]]:
+        """
+        Send several messages over a single SMTP session
+        
+        When the server starts rejecting (throttling, auth lockout, outage) the
+        rest of the batch would fail too, so sending stops once
+        BATCH_ABORT_FAILURE_RATIO of at least BATCH_ABORT_MIN_ATTEMPTS sends failed.
+        
+        Args:
+            messages: Messages built with _build_message / build_job_match_message
+        
+        Returns:
+            Per message, in input order: True if sent, False if it failed,
+            None if skipped because the batch was aborted
+        """
+        
+        if not messages:
+            return []
+        
+        if not self.email or not self.password:
+            logger.warning("⚠️ Email credentials not configured")
+            return [False] * len(messages)
+        
+        results = []
+        failures = 0
+        conn = None
+        
+        for msg in messages:
+            if (
+                len(results) >= BATCH_ABORT_MIN_ATTEMPTS
+                and failures / len(results) > BATCH_ABORT_FAILURE_RATIO
+            ):
+                logger.warning(
+                    f"⚠️ Aborting batch, failure rate {failures / len(results):.0%} - "
+                    f"skipping {len(messages) - len(results)} emails"
+                )
+                results.extend([None] * (len(messages) - len(results)))
+                break
+            
+            try:
+                if conn is None:
+                    conn = self._acquire_conn()
+                elif conn.messages_sent >= SMTP_MAX_MESSAGES_PER_CONN:
+                    self._discard_conn(conn)
+                    conn = self._open_conn()
+                
+                conn = self._deliver(conn, msg)
+                results.append(True)
+                
+            except Exception as e:
+                # _deliver already closed the connection - open a new one next time
+                logger.error(f"❌ Failed to send email to {msg['To']}: {e}")
+                conn = None
+                failures += 1
+                results.append(False)
+        
+        if conn is not None:
+            self._release_conn(conn)
+        
+        logger.info(f"✅ Batch sent: {results.count(True)}/{len(messages)} emails")
+        return results
+    
     async def send_email_async(
         self,
         to_email: str,
@@ -91,16 +550,147 @@ class EmailService:
         html_content: str,
         text_content: str = ""
     ) -> bool:
-        """Send email asynchronously"""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            self.executor,
-            self._send_email_sync,
-            to_email,
-            subject,
-            html_content,
-            text_content
+        """Send email asynchronously via the send queue"""
+        
+        if not self.email or not self.password:
+            logger.warning("⚠️ Email credentials not configured")
+            return False
+        
+        try:
+            msg = self._build_message(to_email, subject, html_content, text_content)
+        except Exception as e:
+            logger.error(f"❌ Failed to send email to {to_email}: {e}")
+            return False
+        
+        self._ensure_send_workers()
+        fut = self._send_loop.create_future()
+        await self._send_queue.put((msg, fut))
+        
+        success = await fut
+        if success:
+            logger.info(f"✅ Email sent to {to_email}")
+        return success
+    
+    def _ensure_send_workers(self):
+        """Start the queue and worker coroutines on the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._send_loop is loop:
+            return
+        
+        # First use, or the previous loop has gone away (e.g. asyncio.run in a task)
+        self._send_loop = loop
+        self._send_queue = asyncio.Queue(maxsize=ASYNC_SEND_QUEUE_SIZE)
+        self._send_workers = [
+            loop.create_task(self._send_worker()) for _ in range(ASYNC_SMTP_WORKERS)
+        ]
+    
+    async def _send_worker(self):
+        """Drain the send queue over one persistent aiosmtplib connection"""
+        queue_ = self._send_queue
+        conn = None
+        
+        try:
+            while True:
+                msg, fut = await queue_.get()
+                try:
+                    conn = await self._deliver_async(conn, msg)
+                    success = True
+                except asyncio.CancelledError:
+                    fut.cancel()
+                    raise
+                except Exception as e:
+                    logger.error(f"❌ Failed to send email to {msg['To']}: {e}")
+                    conn = await self._close_async_conn(conn)
+                    success = False
+                finally:
+                    queue_.task_done()
+                
+                if not fut.done():
+                    fut.set_result(success)
+        finally:
+            await self._close_async_conn(conn)
+    
+    async def _deliver_async(
+        self,
+        conn: Optional[aiosmtplib.SMTP],
+        msg: MIMEMultipart
+    ) -> aiosmtplib.SMTP:
+        """
+        Send a message on conn, (re)connecting as needed
+        
+        Returns the connection to keep using. A connection the server dropped
+        is replaced once; connections are retired after
+        SMTP_MAX_MESSAGES_PER_CONN messages like the sync pool.
+        """
+        if not await self._bucket.acquire_async(timeout=EMAIL_RATE_WAIT):
+            raise TimeoutError(f"send rate limit: no token within {EMAIL_RATE_WAIT:.0f}s")
+        
+        if conn is not None and conn.messages_sent >= SMTP_MAX_MESSAGES_PER_CONN:
+            conn = await self._close_async_conn(conn)
+        
+        body = _flatten(msg)
+        to_addrs = [msg['To']]
+        mail_options = _mail_options(msg)
+        
+        for attempt in range(2):
+            if conn is None or not conn.is_connected:
+                conn = await self._open_async_conn()
+            try:
+                await conn.sendmail(self.email, to_addrs, body, mail_options=mail_options)
+            except aiosmtplib.SMTPServerDisconnected:
+                conn = await self._close_async_conn(conn)
+                if attempt:
+                    raise
+                continue
+            
+            conn.messages_sent += 1
+            return conn
+    
+    async def _open_async_conn(self) -> aiosmtplib.SMTP:
+        """Open a new authenticated aiosmtplib connection"""
+        conn = aiosmtplib.SMTP(
+            hostname=self.smtp_server,
+            port=self.smtp_port,
+            use_tls=False,
+            start_tls=True,
+            timeout=SMTP_TIMEOUT
         )
+        await asyncio.wait_for(conn.connect(), SMTP_CONNECT_TIMEOUT)
+        try:
+            await conn.login(self.email, self.password)
+        except Exception:
+            await self._close_async_conn(conn)
+            raise
+        self._server_8bitmime = conn.supports_extension('8bitmime')
+        conn.messages_sent = 0
+        return conn
+    
+    @staticmethod
+    async def _close_async_conn(conn: Optional[aiosmtplib.SMTP]) -> None:
+        """Close an aiosmtplib connection, ignoring errors from dead sockets"""
+        if conn is None:
+            return None
+        try:
+            await conn.quit()
+        except (aiosmtplib.SMTPException, OSError):
+            conn.close()
+        return None
+    
+    async def close_async(self):
+        """Stop the send workers and close their connections (called on app shutdown)"""
+        workers, self._send_workers = self._send_workers, []
+        for task in workers:
+            task.cancel()
+        if workers:
+            await asyncio.gather(*workers, return_exceptions=True)
+        
+        # Don't leave callers waiting on messages that will never be sent
+        while self._send_queue is not None and not self._send_queue.empty():
+            _, fut = self._send_queue.get_nowait()
+            fut.cancel()
+        
+        self._send_loop = None
+        self._send_queue = None
     
     async def send_password_reset_email(
         self,
@@ -122,74 +712,9 @@ class EmailService:
         
         subject = "🔐 HIRESTORM - Password Reset Request"
         
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        </head>
-        <body style="font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; margin: 0; padding: 0; background-color: #EAEFEF;">
-            <div style="max-width: 600px; margin: 0 auto; background: white; padding: 0;">
-                
-                <!-- Header -->
-                <div style="background: linear-gradient(135deg, #2D3E50 0%, #1a252f 100%); padding: 30px; text-align: center;">
-                    <h1 style="color: #FF9F56; margin: 0; font-size: 28px; font-weight: 900; letter-spacing: -2px;">
-                        HIRESTORM
-                    </h1>
-                    <p style="color: rgba(255,255,255,0.9); margin: 10px 0 0 0;">
-                        Password Reset Request
-                    </p>
-                </div>
-                
-                <!-- Content -->
-                <div style="padding: 30px;">
-                    
-                    <p style="font-size: 16px; color: #333;">
-                        Hi <strong>{user_name}</strong>,
-                    </p>
-                    
-                    <p style="font-size: 16px; color: #333;">
-                        We received a request to reset your password. Click the button below to create a new password:
-                    </p>
-                    
-                    <div style="text-align: center; margin: 30px 0;">
-                        <a href="{reset_link}" 
-                           style="background: #FF9F56; color: white; padding: 15px 40px; text-decoration: none; border-radius: 8px; font-weight: bold; display: inline-block;">
-                            🔑 Reset Password
-                        </a>
-                    </div>
-                    
-                    <p style="font-size: 14px; color: #666;">
-                        If you didn't request a password reset, you can safely ignore this email.
-                    </p>
-                    
-                    <p style="font-size: 14px; color: #666;">
-                        This link will expire in 1 hour for security reasons.
-                    </p>
-                    
-                    <hr style="border: none; border-top: 1px solid #eee; margin: 30px 0;">
-                    
-                    <p style="font-size: 12px; color: #999; text-align: center;">
-                        © 2024 HIRESTORM | Your Career Partner
-                    </p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-        
-        text_content = f"""
-        Hi {user_name},
-        
-        We received a request to reset your password.
-        
-        Click this link to reset: {reset_link}
-        
-        If you didn't request this, please ignore this email.
-        
-        - HIRESTORM Team
-        """
+        context = {"user_name": user_name, "reset_link": reset_link}
+        html_content = self._tpl_password_reset_html.render(context)
+        text_content = self._tpl_password_reset_text.render(context)
         
         return await self.send_email_async(to_email, subject, html_content, text_content)
     
@@ -215,174 +740,99 @@ class EmailService:
             Success status
         """
         
-        # Determine emoji based on match score
-        if match_score >= 90:
-            emoji = "🔥"
-            match_text = "EXCELLENT"
-        elif match_score >= 80:
-            emoji = "🎯"
-            match_text = "GREAT"
-        elif match_score >= 70:
-            emoji = "✨"
-            match_text = "GOOD"
-        else:
-            emoji = "👍"
-            match_text = "POTENTIAL"
-        
-        subject = f"{emoji} {match_text} Match: {job.get('title')} at {job.get('company')} ({match_score:.0f}%)"
+        subject, html_content, text_content = self._render_job_match(
+            user_name, job, match_score, skill_gaps
+        )
+        return self._send_email_sync(user_email, subject, html_content, text_content)
+    
+    def build_job_match_message(
+        self,
+        user_email: str,
+        user_name: str,
+        job: Dict,
+        match_score: float,
+        skill_gaps: List[str] = [],
+        job_card: Optional[Markup] = None
+    ) -> MIMEMultipart:
+        """Build a job match notification for send_batch (job_card from build_job_card)"""
+        subject, html_content, text_content = self._render_job_match(
+            user_name, job, match_score, skill_gaps, job_card
+        )
+        return self._build_message(user_email, subject, html_content, text_content)
+    
+    def build_job_card(self, job: Dict) -> Markup:
+        """
+        Render the recipient-independent job card of a match notification
         
-        # Skills gap section
-        skill_gap_html = ""
-        if skill_gaps:
-            skill_gap_html = f"""
-            <div style="background: #FFF3CD; padding: 15px; border-radius: 8px; margin: 15px 0;">
-                <p style="margin: 0; color: #856404;">
-                    <strong>⚠️ Skills to brush up:</strong> {', '.join(skill_gaps[:5])}
-                </p>
-            </div>
-            """
-        else:
-            skill_gap_html = """
-            <div style="background: #D4EDDA; padding: 15px; border-radius: 8px; margin: 15px 0;">
-                <p style="margin: 0; color: #155724;">
-                    <strong>✅ You have all required skills!</strong>
-                </p>
-            </div>
-            """
-        
-        # Salary section
-        salary_html = ""
+        Render it once per job and pass it to build_job_match_message for
+        every recipient; only the greeting, score and skill gaps differ.
+        """
+        salary_range = None
         if job.get('salary_min') or job.get('salary_max'):
-            salary_min = job.get('salary_min', 'N/A')
-            salary_max = job.get('salary_max', 'N/A')
-            salary_html = f"""
-            <p style="margin: 8px 0;">
-                <strong>💰 Salary:</strong> ₹{salary_min:,} - ₹{salary_max:,}
-            </p>
-            """
-        
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        </head>
-        <body style="font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; margin: 0; padding: 0; background-color: #f4f4f4;">
-            <div style="max-width: 600px; margin: 0 auto; background: white; padding: 0;">
-                
-                <!-- Header -->
-                <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 30px; text-align: center;">
-                    <h1 style="color: white; margin: 0; font-size: 24px;">
-                        {emoji} New Job Match Found!
-                    </h1>
-                    <p style="color: rgba(255,255,255,0.9); margin: 10px 0 0 0;">
-                        Based on your profile and skills
-                    </p>
-                </div>
-                
-                <!-- Content -->
-                <div style="padding: 30px;">
-                    
-                    <p style="font-size: 16px; color: #333;">
-                        Hi <strong>{user_name}</strong>,
-                    </p>
-                    
-                    <p style="font-size: 16px; color: #333;">
-                        Great news! We found a job that matches your profile with 
-                        <span style="color: #667eea; font-weight: bold;">{match_score:.0f}% compatibility</span>!
-                    </p>
-                    
-                    <!-- Job Card -->
-                    <div style="background: #f8f9fa; border-radius: 12px; padding: 20px; margin: 20px 0; border-left: 4px solid #667eea;">
-                        
-                        <h2 style="margin: 0 0 10px 0; color: #333; font-size: 20px;">
-                            {job.get('title', 'Job Title')}
-                        </h2>
-                        
-                        <p style="margin: 5px 0; color: #666; font-size: 16px;">
-                            <strong>🏢 Company:</strong> {job.get('company', 'Company')}
-                        </p>
-                        
-                        <p style="margin: 5px 0; color: #666; font-size: 16px;">
-                            <strong>📍 Location:</strong> {job.get('location', 'India')}
-                        </p>
-                        
-                        <p style="margin: 5px 0; color: #666; font-size: 16px;">
-                            <strong>💼 Type:</strong> {job.get('job_type', 'Full-time').title()}
-                        </p>
-                        
-                        {salary_html}
-                        
-                        <p style="margin: 15px 0 5px 0; color: #666; font-size: 14px;">
-                            <strong>🛠️ Required Skills:</strong>
-                        </p>
-                        <p style="margin: 5px 0; color: #333;">
-                            {', '.join(job.get('required_skills', [])[:8]) or 'Not specified'}
-                        </p>
-                        
-                    </div>
-                    
-                    <!-- Match Score Badge -->
-                    <div style="text-align: center; margin: 25px 0;">
-                        <div style="display: inline-block; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 15px 30px; border-radius: 50px; font-size: 18px;">
-                            <strong>Match Score: {match_score:.0f}%</strong>
-                        </div>
-                    </div>
-                    
-                    <!-- Skill Gaps -->
-                    {skill_gap_html}
-                    
-                    <!-- CTA Button -->
-                    <div style="text-align: center; margin: 30px 0;">
-                        <a href="{job.get('url', '#')}" 
-                           style="display: inline-block; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 15px 40px; text-decoration: none; border-radius: 8px; font-size: 16px; font-weight: bold;">
-                            🚀 Apply Now
-                        </a>
-                    </div>
-                    
-                    <p style="font-size: 14px; color: #666; margin-top: 30px;">
-                        Don't wait too long - great opportunities don't last!
-                    </p>
-                    
-                </div>
-                
-                <!-- Footer -->
-                <div style="background: #f8f9fa; padding: 20px; text-align: center; border-top: 1px solid #eee;">
-                    <p style="margin: 0; color: #666; font-size: 12px;">
-                        You received this email because you're registered on {self.app_name}
-                    </p>
-                    <p style="margin: 10px 0 0 0; color: #666; font-size: 12px;">
-                        <a href="#" style="color: #667eea;">Manage Preferences</a> | 
-                        <a href="#" style="color: #667eea;">Unsubscribe</a>
-                    </p>
-                </div>
-                
-            </div>
-        </body>
-        </html>
+            salary_range = f"{_format_inr(job.get('salary_min'))} - {_format_inr(job.get('salary_max'))}"
+        
+        return Markup(self._tpl_job_card_html.render(job=job, salary_range=salary_range))
+    
+    def send_job_match_batch(self, job: Dict, recipients: List[Dict]) -> List[Optional[bool]]:
         """
+        Send one job's match notifications over a single SMTP session
         
-        text_content = f"""
-        Hi {user_name},
-
-        Great news! We found a job that matches your profile with {match_score:.0f}% compatibility!
-
-        Job: {job.get('title')} at {job.get('company')}
-        Location: {job.get('location')}
-        Type: {job.get('job_type')}
-
-        Match Score: {match_score:.0f}%
+        Args:
+            job: Job details
+            recipients: Dicts with email, name, score and skill_gaps
         
-        Skills Gap: {', '.join(skill_gaps) if skill_gaps else 'None! You have all required skills!'}
-
-        Apply Now: {job.get('url', 'Check our portal')}
-
-        Best regards,
-        {self.app_name} Team
+        Returns:
+            Status per recipient, in input order (see send_batch)
         """
+        if not recipients:
+            return []
+        
+        job_card = self.build_job_card(job)
+        
+        messages = []
+        for recipient in recipients:
+            try:
+                messages.append(self.build_job_match_message(
+                    user_email=recipient["email"],
+                    user_name=recipient["name"],
+                    job=job,
+                    match_score=recipient["score"],
+                    skill_gaps=recipient["skill_gaps"],
+                    job_card=job_card
+                ))
+            except Exception as e:
+                logger.error(f"❌ Failed to build email for {recipient.get('email')}: {e}")
+                messages.append(None)
+        
+        sent = iter(self.send_batch([msg for msg in messages if msg is not None]))
+        return [msg is not None and next(sent) for msg in messages]
+    
+    def _render_job_match(
+        self,
+        user_name: str,
+        job: Dict,
+        match_score: float,
+        skill_gaps: List[str],
+        job_card: Optional[Markup] = None
+    ) -> Tuple[str, str, str]:
+        """Render subject, HTML and text bodies of a job match notification"""
         
-        return self._send_email_sync(user_email, subject, html_content, text_content)
+        emoji, match_text = _SCORE_TIERS[bisect.bisect_right(_SCORE_CUTS, match_score)]
+        
+        subject = f"{emoji} {match_text} Match: {job.get('title')} at {job.get('company')} ({match_score:.0f}%)"
+        
+        context = {
+            "user_name": user_name,
+            "job": job,
+            "job_card": job_card if job_card is not None else self.build_job_card(job),
+            "match_score": match_score,
+            "emoji": emoji,
+            "skill_gaps": skill_gaps
+        }
+        html_content = self._tpl_job_match_html.render(context)
+        text_content = self._tpl_job_match_text.render(context)
+        
+        return subject, html_content, text_content
     
     async def send_job_match_notification_async(
         self,
@@ -393,16 +843,10 @@ class EmailService:
         skill_gaps: List[str] = []
     ) -> bool:
         """Send job match notification asynchronously"""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            self.executor,
-            self.send_job_match_notification,
-            user_email,
-            user_name,
-            job,
-            match_score,
-            skill_gaps
+        subject, html_content, text_content = self._render_job_match(
+            user_name, job, match_score, skill_gaps
         )
+        return await self.send_email_async(user_email, subject, html_content, text_content)
     
     def send_multiple_job_matches(
         self,
@@ -425,115 +869,58 @@ class EmailService:
         if not jobs:
             return False
         
-        subject = f"🎯 {len(jobs)} New Jobs Match Your Profile!"
+        subject, html_content = self._render_job_digest(user_name, jobs)
+        return self._send_email_sync(user_email, subject, html_content)
+    
+    def send_job_digest_batch(self, digests: List[Dict]) -> List[Optional[bool]]:
+        """
+        Send several users their digest over a single SMTP session
         
-        # Build jobs HTML
-        jobs_html = ""
-        for i, job_data in enumerate(jobs[:5], 1):  # Max 5 jobs per email
-            job = job_data.get('job', job_data)
-            score = job_data.get('match_score', 0)
-            
-            jobs_html += f"""
-            <div style="background: #f8f9fa; border-radius: 8px; padding: 15px; margin: 15px 0; border-left: 4px solid #667eea;">
-                <h3 style="margin: 0 0 8px 0; color: #333;">
-                    {i}. {job.get('title', 'Job')}
-                </h3>
-                <p style="margin: 4px 0; color: #666;">
-                    🏢 {job.get('company', 'Company')} | 📍 {job.get('location', 'India')}
-                </p>
-                <p style="margin: 8px 0 0 0;">
-                    <span style="background: #667eea; color: white; padding: 4px 12px; border-radius: 20px; font-size: 14px;">
-                        {score:.0f}% Match
-                    </span>
-                </p>
-            </div>
-            """
-        
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <body style="font-family: 'Segoe UI', sans-serif; margin: 0; padding: 0; background: #f4f4f4;">
-            <div style="max-width: 600px; margin: 0 auto; background: white;">
-                
-                <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 30px; text-align: center;">
-                    <h1 style="color: white; margin: 0;">🎯 {len(jobs)} New Job Matches!</h1>
-                </div>
-                
-                <div style="padding: 30px;">
-                    <p style="font-size: 16px; color: #333;">
-                        Hi <strong>{user_name}</strong>,
-                    </p>
-                    
-                    <p style="font-size: 16px; color: #333;">
-                        We found <strong>{len(jobs)} new jobs</strong> that match your profile!
-                    </p>
-                    
-                    {jobs_html}
-                    
-                    <div style="text-align: center; margin: 30px 0;">
-                        <a href="#" style="display: inline-block; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 15px 40px; text-decoration: none; border-radius: 8px; font-weight: bold;">
-                            View All Matches
-                        </a>
-                    </div>
-                </div>
-                
-                <div style="background: #f8f9fa; padding: 20px; text-align: center;">
-                    <p style="margin: 0; color: #666; font-size: 12px;">
-                        {self.app_name} | AI-Powered Job Matching
-                    </p>
-                </div>
-                
-            </div>
-        </body>
-        </html>
+        Args:
+            digests: Dicts with email, name and jobs (as for send_multiple_job_matches)
+        
+        Returns:
+            Status per digest, in input order (see send_batch)
         """
+        if not digests:
+            return []
+        
+        messages = []
+        for digest in digests:
+            try:
+                subject, html_content = self._render_job_digest(digest["name"], digest["jobs"])
+                messages.append(self._build_message(digest["email"], subject, html_content))
+            except Exception as e:
+                logger.error(f"❌ Failed to build digest for {digest.get('email')}: {e}")
+                messages.append(None)
+        
+        sent = iter(self.send_batch([msg for msg in messages if msg is not None]))
+        return [msg is not None and next(sent) for msg in messages]
+    
+    def _render_job_digest(self, user_name: str, jobs: List[Dict]) -> Tuple[str, str]:
+        """Render subject and HTML body of a digest"""
         
-        return self._send_email_sync(user_email, subject, html_content)
+        subject = f"🎯 {len(jobs)} New Jobs Match Your Profile!"
+        
+        # Cards for the first few jobs only; the headline counts all of them
+        items = [
+            {'job': job_data.get('job', job_data), 'match_score': job_data.get('match_score', 0)}
+            for job_data in jobs[:DIGEST_MAX_JOBS]
+        ]
+        
+        html_content = self._tpl_job_digest_html.render(
+            user_name=user_name,
+            jobs=items,
+            total=len(jobs)
+        )
+        return subject, html_content
     
     def send_welcome_email(self, user_email: str, user_name: str) -> bool:
         """Send welcome email to new user"""
         
         subject = f"🎉 Welcome to {self.app_name}!"
         
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <body style="font-family: 'Segoe UI', sans-serif; margin: 0; padding: 0; background: #f4f4f4;">
-            <div style="max-width: 600px; margin: 0 auto; background: white;">
-                
-                <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 40px; text-align: center;">
-                    <h1 style="color: white; margin: 0;">Welcome Aboard! 🚀</h1>
-                </div>
-                
-                <div style="padding: 30px;">
-                    <p style="font-size: 18px; color: #333;">
-                        Hi <strong>{user_name}</strong>,
-                    </p>
-                    
-                    <p style="font-size: 16px; color: #333; line-height: 1.6;">
-                        Welcome to <strong>{self.app_name}</strong>! We're excited to help you find your dream job using AI-powered matching.
-                    </p>
-                    
-                    <h3 style="color: #667eea;">What's Next?</h3>
-                    
-                    <div style="margin: 20px 0;">
-                        <p style="margin: 10px 0;">📄 <strong>Upload your resume</strong> - We'll auto-extract your skills</p>
-                        <p style="margin: 10px 0;">🎯 <strong>Get matched</strong> - Our AI finds the best jobs for you</p>
-                        <p style="margin: 10px 0;">📊 <strong>See rejection risk</strong> - Know before you apply</p>
-                        <p style="margin: 10px 0;">📧 <strong>Get alerts</strong> - New matching jobs in your inbox</p>
-                    </div>
-                    
-                    <div style="text-align: center; margin: 30px 0;">
-                        <a href="#" style="display: inline-block; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 15px 40px; text-decoration: none; border-radius: 8px; font-weight: bold;">
-                            Complete Your Profile
-                        </a>
-                    </div>
-                </div>
-                
-            </div>
-        </body>
-        </html>
-        """
+        html_content = self._tpl_welcome_html.render(user_name=user_name)
         
         return self._send_email_sync(user_email, subject, html_content)
 
@@ -3,8 +3,14 @@ Notification Service
 Finds matching users for new jobs and sends email notifications
 """
 
-from typing import List, Dict
+from cachetools import TTLCache
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import List, Dict, Optional, Tuple
 import logging
+import os
+import threading
+import time
 from app.services.database import get_firebase_service
 from app.services.ai_matcher import get_matcher
 from app.services.pinecone_service import get_pinecone_service
@@ -12,6 +18,60 @@ from app.services.email_service import get_email_service
 
 logger = logging.getLogger(__name__)
 
+# Send match notifications from the Celery email worker instead of the caller
+NOTIFY_VIA_QUEUE = os.getenv("NOTIFY_VIA_QUEUE", "false").lower() == "true"
+
+# Max users notified per job
+MAX_USERS_PER_JOB = 50
+
+# Skill-gap results reused across jobs ingested close together
+SKILL_GAP_CACHE_SIZE = int(os.getenv("SKILL_GAP_CACHE_SIZE", 10000))
+SKILL_GAP_CACHE_TTL = int(os.getenv("SKILL_GAP_CACHE_TTL", 300))  # seconds
+
+# Job fields the notification templates use (the rest may not be JSON-serializable)
+EMAIL_JOB_FIELDS = (
+    "title", "company", "location", "job_type",
+    "salary_min", "salary_max", "required_skills", "url"
+)
+
+# Log cumulative per-phase timings (embed/pinecone/firebase/smtp) at DEBUG every N jobs
+PHASE_LOG_EVERY = int(os.getenv("NOTIFY_PHASE_LOG_EVERY", 50))
+
+# phase -> [calls, total seconds]
+_phase_totals: Dict[str, List[float]] = {}
+_phase_lock = threading.Lock()
+_jobs_timed = 0
+
+
+@contextmanager
+def _phase(name: str):
+    """Add the wall time of the block to the totals for a notification phase"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        with _phase_lock:
+            totals = _phase_totals.setdefault(name, [0, 0.0])
+            totals[0] += 1
+            totals[1] += elapsed
+
+
+def _log_phase_totals(jobs: int = 1):
+    """Count notified jobs and log the phase breakdown every PHASE_LOG_EVERY of them"""
+    global _jobs_timed
+    with _phase_lock:
+        previous = _jobs_timed
+        _jobs_timed += jobs
+        if _jobs_timed // PHASE_LOG_EVERY == previous // PHASE_LOG_EVERY:
+            return
+        summary = ", ".join(
+            f"{name}: {total:.2f}s/{int(calls)} calls"
+            for name, (calls, total) in sorted(_phase_totals.items(), key=lambda kv: -kv[1][1])
+        )
+    logger.debug(f"⏱️ Notification phases after {_jobs_timed} jobs - {summary}")
+
+
 class NotificationService:
     """Handle job match notifications"""
     
@@ -23,6 +83,23 @@ class NotificationService:
         
         # Minimum match score to notify (%)
         self.min_match_score = 70
+        
+        # (user skills, required skills) -> gaps; user records are cached by FirebaseService
+        self._skill_gap_cache = TTLCache(maxsize=SKILL_GAP_CACHE_SIZE, ttl=SKILL_GAP_CACHE_TTL)
+        self._skill_gap_lock = threading.Lock()
+    
+    def _skill_gaps(self, user_skills: List[str], required_skills: List[str]) -> List[str]:
+        """find_skill_gaps, memoized (many users share skill sets, many jobs share requirements)"""
+        key = (frozenset(user_skills), tuple(required_skills))
+        
+        with self._skill_gap_lock:
+            gaps = self._skill_gap_cache.get(key)
+        if gaps is None:
+            gaps = self.matcher.find_skill_gaps(list(user_skills), list(required_skills))
+            with self._skill_gap_lock:
+                self._skill_gap_cache[key] = gaps
+        
+        return list(gaps)
     
     def notify_matching_users_for_job(self, job_data: Dict, job_id: str) -> Dict:
         """
@@ -38,93 +115,292 @@ class NotificationService:
         
         logger.info(f"🔔 Finding matching users for job: {job_data.get('title')}")
         
-        stats = {
+        try:
+            # Step 1: Create job embedding (for searching users)
+            with _phase("embed"):
+                job_embedding = self.matcher.create_job_embedding(job_data, for_search=True)
+            
+            # Step 2: Find matching users in Pinecone
+            with _phase("pinecone"):
+                matching_users = self.pinecone.find_matching_users(
+                    job_embedding=job_embedding,
+                    top_k=MAX_USERS_PER_JOB,
+                    fields=[]  # only ids and scores are used
+                )
+            
+        except Exception as e:
+            logger.error(f"❌ Notification error: {e}")
+            return self._new_stats(job_data, job_id)
+        
+        stats = self._notify_matches(job_data, job_id, matching_users)
+        _log_phase_totals()
+        return stats
+    
+    def notify_matching_users_for_jobs(self, jobs: List[Tuple[Dict, str]]) -> List[Dict]:
+        """
+        Notify matching users for several new jobs at once
+        
+        All jobs are embedded in one batched forward pass and their Pinecone
+        lookups run concurrently, instead of one model call + round-trip per job.
+        Users matched to more than one of the jobs get a single digest email.
+        
+        Args:
+            jobs: (job_data, job_id) pairs
+        
+        Returns:
+            Stats per job, in input order
+        """
+        
+        if not jobs:
+            return []
+        
+        logger.info(f"🔔 Finding matching users for {len(jobs)} jobs")
+        
+        try:
+            with _phase("embed"):
+                job_embeddings = self.matcher.create_job_embeddings(
+                    [job_data for job_data, _ in jobs],
+                    for_search=True
+                )
+            with _phase("pinecone"):
+                matches_per_job = self.pinecone.find_matching_users_batch(
+                    job_embeddings,
+                    top_k=MAX_USERS_PER_JOB,
+                    fields=[]  # only ids and scores are used
+                )
+            
+        except Exception as e:
+            logger.error(f"❌ Notification error: {e}")
+            return [self._new_stats(job_data, job_id) for job_data, job_id in jobs]
+        
+        if NOTIFY_VIA_QUEUE:
+            # The email worker sends per job; it does not coalesce across jobs
+            all_stats = [
+                self._notify_matches(job_data, job_id, matching_users)
+                for (job_data, job_id), matching_users in zip(jobs, matches_per_job)
+            ]
+        else:
+            all_stats = self._notify_matches_coalesced(jobs, matches_per_job)
+        _log_phase_totals(len(jobs))
+        return all_stats
+    
+    @staticmethod
+    def _new_stats(job_data: Dict, job_id: str) -> Dict:
+        return {
             "job_id": job_id,
             "job_title": job_data.get('title'),
             "users_matched": 0,
             "emails_sent": 0,
             "emails_failed": 0,
-            "matched_users": []
+            "emails_queued": 0,
+            "matched_users": [],
+            "aborted": []  # user IDs skipped after the batch hit too many failures
         }
+    
+    def _notify_matches(self, job_data: Dict, job_id: str, matching_users: List[Dict]) -> Dict:
+        """Email the users Pinecone matched to a job (steps 3-5 of notification)"""
+        
+        stats = self._new_stats(job_data, job_id)
         
         try:
-            # Step 1: Create job embedding (for searching users)
-            job_embedding = self.matcher.create_job_embedding(job_data, for_search=True)
+            recipients = self._collect_recipients(job_data, matching_users, stats)
+            if recipients:
+                self._send_job_emails(job_data, recipients, stats)
             
-            # Step 2: Find matching users in Pinecone
-            matching_users = self.pinecone.find_matching_users(
-                job_embedding=job_embedding,
-                top_k=50  # Max 50 users per job notification
+        except Exception as e:
+            logger.error(f"❌ Notification error: {e}")
+        
+        return stats
+    
+    def _notify_matches_coalesced(
+        self,
+        jobs: List[Tuple[Dict, str]],
+        matches_per_job: List[List[Dict]]
+    ) -> List[Dict]:
+        """
+        Email the users Pinecone matched to several jobs, one email per user
+        
+        A user matched to a single job gets the usual match notification; a
+        user matched to several gets one digest listing them all instead of
+        one email per job.
+        """
+        
+        all_stats = []
+        recipients_per_job = []
+        
+        for (job_data, job_id), matching_users in zip(jobs, matches_per_job):
+            stats = self._new_stats(job_data, job_id)
+            try:
+                recipients = self._collect_recipients(job_data, matching_users, stats)
+            except Exception as e:
+                logger.error(f"❌ Notification error: {e}")
+                recipients = []
+            all_stats.append(stats)
+            recipients_per_job.append(recipients)
+        
+        # user_id -> [(job index, recipient)]
+        matches_per_user = defaultdict(list)
+        for index, recipients in enumerate(recipients_per_job):
+            for recipient in recipients:
+                matches_per_user[recipient["user_id"]].append((index, recipient))
+        
+        digest_users = [entries for entries in matches_per_user.values() if len(entries) > 1]
+        digest_user_ids = {entries[0][1]["user_id"] for entries in digest_users}
+        
+        for (job_data, _), recipients, stats in zip(jobs, recipients_per_job, all_stats):
+            single = [r for r in recipients if r["user_id"] not in digest_user_ids]
+            if not single:
+                continue
+            try:
+                self._send_job_emails(job_data, single, stats)
+            except Exception as e:
+                logger.error(f"❌ Notification error: {e}")
+        
+        if digest_users:
+            try:
+                self._send_digests(jobs, digest_users, all_stats)
+            except Exception as e:
+                logger.error(f"❌ Digest error: {e}")
+        
+        return all_stats
+    
+    def _collect_recipients(self, job_data: Dict, matching_users: List[Dict], stats: Dict) -> List[Dict]:
+        """Steps 3-4: keep matches above the minimum score that have an email address"""
+        
+        # Pinecone returns matches best-first, so the top score decides if anyone qualifies
+        if not matching_users or matching_users[0]['score'] < self.min_match_score:
+            logger.info("⚠️ No matching users above minimum score in Pinecone")
+            return []
+        
+        logger.info(f"📊 Found {len(matching_users)} potential matches in Pinecone")
+        
+        # Step 3: Cut the sorted list at the first score below the minimum
+        # (bisect assumes ascending order and scores are descending, so scan; the
+        # scan stops at the cutoff, which sits near the front for most jobs)
+        cutoff = next(
+            (i for i, match in enumerate(matching_users) if match['score'] < self.min_match_score),
+            len(matching_users)
+        )
+        matching_users = matching_users[:cutoff]
+        stats["users_matched"] = len(matching_users)
+        
+        # Get full user details from Firebase in one batched read
+        with _phase("firebase"):
+            users = self.firebase.get_users([m['id'] for m in matching_users])
+        
+        # Step 4: Collect recipients
+        recipients = []
+        
+        for match in matching_users:
+            user_id = match['id']
+            score = match['score']
+            user = users.get(user_id)
+            
+            if not user:
+                logger.warning(f"⚠️ User {user_id} not found in Firebase")
+                continue
+            
+            # Check if user has email
+            user_email = user.get('email')
+            if not user_email:
+                continue
+            
+            # Calculate skill gaps
+            skill_gaps = self._skill_gaps(
+                user.get('skills') or [],
+                job_data.get('required_skills') or []
             )
             
-            if not matching_users:
-                logger.info("⚠️ No matching users found in Pinecone")
-                return stats
+            recipients.append({
+                "user_id": user_id,
+                "email": user_email,
+                "name": user.get('full_name', 'User'),
+                "score": score,
+                "skill_gaps": skill_gaps
+            })
+        
+        return recipients
+    
+    def _send_job_emails(self, job_data: Dict, recipients: List[Dict], stats: Dict):
+        """Step 5: Hand off to the email worker, or send over one SMTP session"""
+        
+        if NOTIFY_VIA_QUEUE and self._enqueue(job_data, recipients):
+            stats["emails_queued"] = len(recipients)
+            logger.info(f"📨 Queued {len(recipients)} notification emails")
+            return
+        
+        with _phase("smtp"):
+            results = self.email_service.send_job_match_batch(job_data, recipients)
+        
+        for recipient, success in zip(recipients, results):
+            self._record_result(stats, recipient, success)
+        
+        logger.info(f"🎉 Notification complete: {stats['emails_sent']} emails sent")
+    
+    def _send_digests(
+        self,
+        jobs: List[Tuple[Dict, str]],
+        digest_users: List[List[Tuple[int, Dict]]],
+        all_stats: List[Dict]
+    ):
+        """Send one digest per user matched to several jobs, crediting each job's stats"""
+        
+        digests = []
+        for entries in digest_users:
+            # Best match first (the digest only shows the first DIGEST_MAX_JOBS)
+            entries.sort(key=lambda entry: entry[1]["score"], reverse=True)
+            recipient = entries[0][1]
+            digests.append({
+                "email": recipient["email"],
+                "name": recipient["name"],
+                "jobs": [
+                    {"job": jobs[index][0], "match_score": r["score"]}
+                    for index, r in entries
+                ]
+            })
+        
+        with _phase("smtp"):
+            results = self.email_service.send_job_digest_batch(digests)
+        
+        for entries, success in zip(digest_users, results):
+            for index, recipient in entries:
+                self._record_result(all_stats[index], recipient, success)
+        
+        logger.info(f"📬 Sent {sum(1 for success in results if success)}/{len(digests)} multi-job digests")
+    
+    @staticmethod
+    def _record_result(stats: Dict, recipient: Dict, success: Optional[bool]):
+        """Tally one recipient's send status (None = skipped by an aborted batch)"""
+        if success:
+            stats["emails_sent"] += 1
+            stats["matched_users"].append({
+                "user_id": recipient["user_id"],
+                "email": recipient["email"],
+                "score": round(recipient["score"], 2)
+            })
+            logger.info(f"✅ Email sent to {recipient['email']} (Score: {recipient['score']:.1f}%)")
+        elif success is None:
+            stats["aborted"].append(recipient["user_id"])
+        else:
+            stats["emails_failed"] += 1
+    
+    def _enqueue(self, job_data: Dict, recipients: List[Dict]) -> bool:
+        """
+        Queue a job's notification emails for the Celery email worker
+        
+        Returns:
+            False if the broker is unreachable (caller sends inline instead)
+        """
+        try:
+            from app.tasks.email_tasks import send_job_match_emails
             
-            logger.info(f"📊 Found {len(matching_users)} potential matches in Pinecone")
-            
-            # Step 3: Filter by minimum score and send emails
-            for match in matching_users:
-                user_id = match['id']
-                score = match['score']
-                
-                # Skip low matches
-                if score < self.min_match_score:
-                    continue
-                
-                stats["users_matched"] += 1
-                
-                # Get full user details from Firebase
-                user = self.firebase.get_user(user_id)
-                
-                if not user:
-                    logger.warning(f"⚠️ User {user_id} not found in Firebase")
-                    continue
-                
-                # Check if user has email
-                user_email = user.get('email')
-                if not user_email:
-                    continue
-                
-                user_name = user.get('full_name', 'User')
-                
-                # Calculate skill gaps
-                skill_gaps = self.matcher.find_skill_gaps(
-                    user.get('skills', []),
-                    job_data.get('required_skills', [])
-                )
-                
-                # Send email notification
-                try:
-                    success = self.email_service.send_job_match_notification(
-                        user_email=user_email,
-                        user_name=user_name,
-                        job=job_data,
-                        match_score=score,
-                        skill_gaps=skill_gaps
-                    )
-                    
-                    if success:
-                        stats["emails_sent"] += 1
-                        stats["matched_users"].append({
-                            "user_id": user_id,
-                            "email": user_email,
-                            "score": round(score, 2)
-                        })
-                        logger.info(f"✅ Email sent to {user_email} (Score: {score:.1f}%)")
-                    else:
-                        stats["emails_failed"] += 1
-                        
-                except Exception as e:
-                    logger.error(f"❌ Failed to send email to {user_email}: {e}")
-                    stats["emails_failed"] += 1
-            
-            logger.info(f"🎉 Notification complete: {stats['emails_sent']} emails sent")
-            return stats
+            job = {field: job_data.get(field) for field in EMAIL_JOB_FIELDS if field in job_data}
+            send_job_match_emails.delay(job, recipients)
+            return True
             
         except Exception as e:
-            logger.error(f"❌ Notification error: {e}")
-            return stats
+            logger.error(f"❌ Could not queue notification emails, sending inline: {e}")
+            return False
     
     def notify_user_for_new_matches(self, user_id: str, min_score: float = 70) -> Dict:
         """
@@ -159,7 +435,8 @@ class NotificationService:
             # Find matching jobs in Pinecone
             matching_jobs = self.pinecone.find_matching_jobs(
                 user_embedding=user_embedding,
-                top_k=10
+                top_k=10,
+                fields=[]  # full jobs are read from Firebase
             )
             
             if not matching_jobs:
@@ -4,15 +4,75 @@ Updated for BAAI model (768 dimensions)
 """
 
 from pinecone import Pinecone
+from concurrent.futures import ThreadPoolExecutor
 import os
-from typing import List, Dict, Optional
+import threading
+from typing import List, Dict, Optional, Tuple
 import numpy as np
 import logging
 from dotenv import load_dotenv
 
+try:
+    # gRPC data plane: one persistent HTTP/2 channel for all queries/upserts; optional
+    from pinecone.grpc import PineconeGRPC as Pinecone
+except ImportError:
+    pass
+
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+# Concurrent requests for batch lookups/upserts (Index.query takes one vector per call)
+PINECONE_QUERY_WORKERS = int(os.getenv("PINECONE_QUERY_WORKERS", 8))
+# Vectors per upsert request (Pinecone's recommended batch size)
+PINECONE_UPSERT_BATCH = int(os.getenv("PINECONE_UPSERT_BATCH", 100))
+# IDs per delete request (Pinecone accepts up to 1000)
+PINECONE_DELETE_BATCH = int(os.getenv("PINECONE_DELETE_BATCH", 1000))
+# Index host (skips list_indexes/describe_index at startup); otherwise looked
+# up once and cached in PINECONE_HOST_CACHE_DIR
+PINECONE_INDEX_HOST = os.getenv("PINECONE_INDEX_HOST")
+PINECONE_HOST_CACHE_DIR = os.getenv(
+    "PINECONE_HOST_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache")
+)
+# Keep users/jobs/resumes in their own namespaces (queries then scan only that
+# type instead of filtering the whole index on metadata). Existing indexes
+# store everything in the default namespace - re-upsert before enabling.
+PINECONE_TYPE_NAMESPACES = os.getenv("PINECONE_TYPE_NAMESPACES", "false").lower() == "true"
+
+def _unit_rows(embeddings) -> np.ndarray:
+    """L2-normalize embeddings row-wise as float32 (one vectorized pass)"""
+    rows = np.ascontiguousarray(embeddings, dtype=np.float32)
+    return rows / (np.linalg.norm(rows, axis=-1, keepdims=True) + 1e-12)
+
+
+def _query_vector(embedding) -> List[float]:
+    """Unit-length query vector as the list the Pinecone client sends"""
+    return _unit_rows(embedding).tolist()
+
+
+def _metadata(match, fields: Optional[List[str]]) -> Dict:
+    """A match's metadata, trimmed to fields (None = all)"""
+    metadata = match.get('metadata') or {}
+    if fields is None:
+        return metadata
+    return {field: metadata[field] for field in fields if field in metadata}
+
+
+def _scope(kind: str, extra_filter: Optional[Dict] = None) -> Dict:
+    """Query kwargs selecting vectors of one type: its namespace, or a metadata filter"""
+    if not extra_filter:
+        return _BASE_SCOPES[kind]
+    if PINECONE_TYPE_NAMESPACES:
+        return {"namespace": kind, "filter": extra_filter}
+    return {"filter": {"type": kind, **extra_filter}}
+
+
+# Scopes for queries without extra filters, built once (callers only unpack them)
+_BASE_SCOPES = {
+    kind: {"namespace": kind} if PINECONE_TYPE_NAMESPACES else {"filter": {"type": kind}}
+    for kind in ("user", "job", "resume")
+}
+
+
 class PineconeService:
     """Pinecone vector database operations for BAAI embeddings (768-dim)"""
     
@@ -20,6 +80,7 @@ class PineconeService:
         """Initialize Pinecone connection"""
         
         self.api_key = os.getenv("PINECONE_API_KEY")
+        self._query_pool = ThreadPoolExecutor(max_workers=PINECONE_QUERY_WORKERS)
         self.index_name = os.getenv("PINECONE_INDEX_NAME", "job-matcher")
         
         if not self.api_key:
@@ -28,8 +89,16 @@ class PineconeService:
             return
         
         try:
-            # Initialize Pinecone with new API
-            self.pc = Pinecone(api_key=self.api_key)
+            # Initialize Pinecone with new API; size its connection pool for
+            # the concurrent batch requests made from _query_pool
+            self.pc = Pinecone(api_key=self.api_key, pool_threads=PINECONE_QUERY_WORKERS)
+            
+            # Known host - connect directly, no control-plane calls
+            host = PINECONE_INDEX_HOST or self._read_cached_host()
+            if host:
+                self.index = self.pc.Index(host=host)
+                logger.info("✅ Pinecone initialized from known index host (BAAI 768-dim)")
+                return
             
             # Check if index exists
             existing_indexes = self.pc.list_indexes()
@@ -39,20 +108,43 @@ class PineconeService:
                 logger.info(f"📊 Creating Pinecone index: {self.index_name}")
                 logger.info("   Dimension: 768 (BAAI/bge-base-en-v1.5)")
                 
+                # Vectors are stored and queried unit-length, so dot product = cosine
                 self.pc.create_index(
                     name=self.index_name,
                     dimension=768,  # BAAI model dimension (was 384 for MiniLM)
-                    metric="cosine"
+                    metric="dotproduct"
                 )
                 logger.info("✅ Index created with 768 dimensions")
             
-            self.index = self.pc.Index(self.index_name)
+            host = self.pc.describe_index(self.index_name).host
+            self._write_cached_host(host)
+            
+            self.index = self.pc.Index(host=host)
             logger.info("✅ Pinecone initialized successfully (BAAI 768-dim)")
             
         except Exception as e:
             logger.error(f"❌ Pinecone initialization error: {e}")
             self.index = None
     
+    def _host_cache_path(self) -> str:
+        return os.path.join(PINECONE_HOST_CACHE_DIR, f"pinecone_host_{self.index_name}")
+    
+    def _read_cached_host(self) -> Optional[str]:
+        """Index host saved by an earlier process (None if not cached yet)"""
+        try:
+            with open(self._host_cache_path()) as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+    
+    def _write_cached_host(self, host: str):
+        try:
+            os.makedirs(PINECONE_HOST_CACHE_DIR, exist_ok=True)
+            with open(self._host_cache_path(), "w") as f:
+                f.write(host)
+        except OSError as e:
+            logger.warning(f"⚠️ Could not cache Pinecone host: {e}")
+    
     def upsert_user_embedding(
         self, 
         user_id: str, 
@@ -75,30 +167,11 @@ class PineconeService:
             logger.warning("⚠️ Pinecone not available")
             return False
         
-        try:
-            # Add type to metadata
-            metadata['type'] = 'user'
-            
-            # Convert numpy array to list
-            vector_list = embedding.tolist() if isinstance(embedding, np.ndarray) else embedding
-            
-            # Upsert to Pinecone
-            self.index.upsert(
-                vectors=[
-                    {
-                        "id": f"user_{user_id}",
-                        "values": vector_list,
-                        "metadata": metadata
-                    }
-                ]
-            )
-            
-            logger.debug(f"✅ User embedding stored: {user_id} (768-dim)")
-            return True
-            
-        except Exception as e:
-            logger.error(f"❌ Error storing user embedding: {e}")
+        if not self._upsert_many('user', [(user_id, embedding, metadata)]):
             return False
+        
+        logger.debug(f"✅ User embedding stored: {user_id} (768-dim)")
+        return True
     
     def upsert_job_embedding(
         self, 
@@ -122,30 +195,32 @@ class PineconeService:
             logger.warning("⚠️ Pinecone not available")
             return False
         
-        try:
-            # Add type to metadata
-            metadata['type'] = 'job'
-            
-            # Convert numpy array to list
-            vector_list = embedding.tolist() if isinstance(embedding, np.ndarray) else embedding
-            
-            # Upsert to Pinecone
-            self.index.upsert(
-                vectors=[
-                    {
-                        "id": f"job_{job_id}",
-                        "values": vector_list,
-                        "metadata": metadata
-                    }
-                ]
-            )
-            
-            logger.debug(f"✅ Job embedding stored: {job_id} (768-dim)")
-            return True
-            
-        except Exception as e:
-            logger.error(f"❌ Error storing job embedding: {e}")
+        if not self._upsert_many('job', [(job_id, embedding, metadata)]):
             return False
+        
+        logger.debug(f"✅ Job embedding stored: {job_id} (768-dim)")
+        return True
+    
+    def upsert_job_embeddings(self, jobs: List[Tuple[str, np.ndarray, Dict]]) -> bool:
+        """
+        Store many job embeddings in batched upserts
+        
+        Args:
+            jobs: (job_id, 768-dim vector, metadata) triples
+        
+        Returns:
+            Success status (False if any batch failed)
+        """
+        
+        if not self.index:
+            logger.warning("⚠️ Pinecone not available")
+            return False
+        
+        if not self._upsert_many('job', jobs):
+            return False
+        
+        logger.info(f"✅ Stored {len(jobs)} job embeddings")
+        return True
     
     def upsert_resume_embedding(
         self,
@@ -168,33 +243,85 @@ class PineconeService:
         if not self.index:
             return False
         
+        if not self._upsert_many('resume', [(user_id, embedding, metadata)]):
+            return False
+        
+        logger.debug(f"✅ Resume embedding stored: {user_id}")
+        return True
+    
+    def _upsert_many(self, kind: str, items: List[Tuple[str, np.ndarray, Dict]]) -> bool:
+        """
+        Upsert (id, embedding, metadata) items as "{kind}_{id}" vectors
+        
+        Sets metadata['type'] to kind, and normalizes and converts all
+        embeddings to lists in one call.
+        """
+        if not items:
+            return True
+        
         try:
-            metadata['type'] = 'resume'
-            
-            vector_list = embedding.tolist() if isinstance(embedding, np.ndarray) else embedding
-            
-            self.index.upsert(
-                vectors=[
-                    {
-                        "id": f"resume_{user_id}",
-                        "values": vector_list,
-                        "metadata": metadata
-                    }
-                ]
-            )
+            values = _unit_rows([embedding for _, embedding, _ in items]).tolist()
+            vectors = []
+            for (item_id, _, metadata), vector_list in zip(items, values):
+                metadata['type'] = kind
+                vectors.append({
+                    "id": f"{kind}_{item_id}",
+                    "values": vector_list,
+                    "metadata": metadata
+                })
+            return self.upsert_batch(vectors, namespace=kind if PINECONE_TYPE_NAMESPACES else None)
             
-            logger.debug(f"✅ Resume embedding stored: {user_id}")
+        except Exception as e:
+            logger.error(f"❌ Error storing {kind} embeddings: {e}")
+            return False
+    
+    def upsert_batch(
+        self,
+        vectors: List[Dict],
+        namespace: Optional[str] = None,
+        batch_size: int = PINECONE_UPSERT_BATCH
+    ) -> bool:
+        """
+        Upsert vectors in chunks of batch_size, sending the chunks concurrently
+        
+        Args:
+            vectors: Dicts with id, values (list of floats) and metadata
+            namespace: Target namespace (None = default namespace)
+            batch_size: Vectors per upsert request
+        
+        Returns:
+            Success status (False if any chunk failed)
+        """
+        
+        if not self.index:
+            return False
+        
+        chunks = [vectors[i:i + batch_size] for i in range(0, len(vectors), batch_size)]
+        if len(chunks) == 1:
+            # Single request - no need for the pool
+            chunks_ok = [self._upsert_chunk(chunks[0], namespace)]
+        else:
+            chunks_ok = list(self._query_pool.map(lambda chunk: self._upsert_chunk(chunk, namespace), chunks))
+        
+        return all(chunks_ok)
+    
+    def _upsert_chunk(self, vectors: List[Dict], namespace: Optional[str] = None) -> bool:
+        try:
+            if namespace:
+                self.index.upsert(vectors=vectors, namespace=namespace)
+            else:
+                self.index.upsert(vectors=vectors)
             return True
-            
         except Exception as e:
-            logger.error(f"❌ Error storing resume embedding: {e}")
+            logger.error(f"❌ Error upserting {len(vectors)} vectors: {e}")
             return False
     
     def find_matching_jobs(
         self, 
         user_embedding: np.ndarray, 
         top_k: int = 20,
-        filter_dict: Optional[Dict] = None
+        filter_dict: Optional[Dict] = None,
+        fields: Optional[List[str]] = None
     ) -> List[Dict]:
         """
         Find jobs similar to user profile using BAAI vector search
@@ -203,6 +330,7 @@ class PineconeService:
             user_embedding: User's 768-dim vector (BAAI)
             top_k: Number of results to return
             filter_dict: Optional filters (e.g., {"source": "adzuna"})
+            fields: Metadata fields to return (None = all, [] = fetch none)
         
         Returns:
             List of matching jobs with scores
@@ -212,30 +340,33 @@ class PineconeService:
             logger.warning("⚠️ Pinecone not available")
             return []
         
+        return self._query_jobs(_query_vector(user_embedding), top_k, filter_dict, fields)
+    
+    def _query_jobs(
+        self,
+        vector_list: List[float],
+        top_k: int,
+        filter_dict: Optional[Dict] = None,
+        fields: Optional[List[str]] = None
+    ) -> List[Dict]:
+        """find_matching_jobs for an already normalized vector list"""
         try:
-            # Build filter
-            query_filter = {"type": "job"}
-            if filter_dict:
-                query_filter.update(filter_dict)
-            
-            # Convert numpy array to list
-            vector_list = user_embedding.tolist() if isinstance(user_embedding, np.ndarray) else user_embedding
-            
             # Query Pinecone
             results = self.index.query(
                 vector=vector_list,
                 top_k=top_k,
-                include_metadata=True,
-                filter=query_filter
+                include_values=False,
+                include_metadata=fields != [],
+                **_scope("job", filter_dict)
             )
             
             # Parse results
             matches = []
             for match in results['matches']:
                 matches.append({
-                    'id': match['id'].replace('job_', ''),
+                    'id': match['id'][4:],  # strip "job_"
                     'score': match['score'] * 100,  # Convert to percentage
-                    'metadata': match.get('metadata', {})
+                    'metadata': _metadata(match, fields)
                 })
             
             logger.info(f"✅ Found {len(matches)} matching jobs (BAAI search)")
@@ -245,10 +376,44 @@ class PineconeService:
             logger.error(f"❌ Error querying Pinecone: {e}")
             return []
     
+    def find_matching_jobs_batch(
+        self,
+        user_embeddings: np.ndarray,
+        top_k: int = 20,
+        filter_dict: Optional[Dict] = None,
+        fields: Optional[List[str]] = None
+    ) -> List[List[Dict]]:
+        """
+        Find matching jobs for several users at once
+        
+        The queries run concurrently, so the batch costs about one round-trip
+        instead of one per user.
+        
+        Args:
+            user_embeddings: (N, 768) array, one row per user
+            top_k: Number of results per user
+            filter_dict: Optional filters (e.g., {"source": "adzuna"})
+            fields: Metadata fields to return (None = all, [] = fetch none)
+        
+        Returns:
+            One list of matching jobs per user, in input order
+        """
+        
+        if not self.index or len(user_embeddings) == 0:
+            return [[] for _ in range(len(user_embeddings))]
+        
+        vector_lists = _query_vector(user_embeddings)
+        
+        return list(self._query_pool.map(
+            lambda vector_list: self._query_jobs(vector_list, top_k, filter_dict, fields),
+            vector_lists
+        ))
+    
     def find_matching_users(
         self, 
         job_embedding: np.ndarray, 
-        top_k: int = 20
+        top_k: int = 20,
+        fields: Optional[List[str]] = None
     ) -> List[Dict]:
         """
         Find users matching a job (reverse matching)
@@ -256,6 +421,7 @@ class PineconeService:
         Args:
             job_embedding: Job's 768-dim vector
             top_k: Number of results
+            fields: Metadata fields to return (None = all, [] = fetch none)
         
         Returns:
             List of matching users with scores
@@ -264,22 +430,30 @@ class PineconeService:
         if not self.index:
             return []
         
+        return self._query_users(_query_vector(job_embedding), top_k, fields)
+    
+    def _query_users(
+        self,
+        vector_list: List[float],
+        top_k: int,
+        fields: Optional[List[str]] = None
+    ) -> List[Dict]:
+        """find_matching_users for an already normalized vector list"""
         try:
-            vector_list = job_embedding.tolist() if isinstance(job_embedding, np.ndarray) else job_embedding
-            
             results = self.index.query(
                 vector=vector_list,
                 top_k=top_k,
-                include_metadata=True,
-                filter={"type": "user"}
+                include_values=False,
+                include_metadata=fields != [],
+                **_scope("user")
             )
             
             matches = []
             for match in results['matches']:
                 matches.append({
-                    'id': match['id'].replace('user_', ''),
+                    'id': match['id'][5:],  # strip "user_"
                     'score': match['score'] * 100,
-                    'metadata': match.get('metadata', {})
+                    'metadata': _metadata(match, fields)
                 })
             
             logger.info(f"✅ Found {len(matches)} matching users")
@@ -289,6 +463,38 @@ class PineconeService:
             logger.error(f"❌ Error querying users: {e}")
             return []
     
+    def find_matching_users_batch(
+        self,
+        job_embeddings: np.ndarray,
+        top_k: int = 20,
+        fields: Optional[List[str]] = None
+    ) -> List[List[Dict]]:
+        """
+        Find matching users for several jobs at once
+        
+        The queries run concurrently, so the batch costs about one round-trip
+        instead of one per job.
+        
+        Args:
+            job_embeddings: (N, 768) array, one row per job
+            top_k: Number of results per job
+            fields: Metadata fields to return (None = all, [] = fetch none)
+        
+        Returns:
+            One list of matching users per job, in input order
+        """
+        
+        if not self.index or len(job_embeddings) == 0:
+            return [[] for _ in range(len(job_embeddings))]
+        
+        # Normalize and convert the whole (N, 768) matrix in one call, not per row
+        vector_lists = _query_vector(job_embeddings)
+        
+        return list(self._query_pool.map(
+            lambda vector_list: self._query_users(vector_list, top_k, fields),
+            vector_lists
+        ))
+    
     def find_matching_resumes(
         self,
         query_embedding: np.ndarray,
@@ -309,19 +515,22 @@ class PineconeService:
             return []
         
         try:
-            vector_list = query_embedding.tolist() if isinstance(query_embedding, np.ndarray) else query_embedding
+            vector_list = _query_vector(query_embedding)
             
+            # Only metadata.skills is used; Pinecone has no server-side field
+            # projection, so the whole (small) resume metadata comes back
             results = self.index.query(
                 vector=vector_list,
                 top_k=top_k,
+                include_values=False,
                 include_metadata=True,
-                filter={"type": "resume"}
+                **_scope("resume")
             )
             
             matches = []
             for match in results['matches']:
                 matches.append({
-                    'user_id': match['id'].replace('resume_', ''),
+                    'user_id': match['id'][7:],  # strip "resume_"
                     'score': match['score'] * 100,
                     'skills': match.get('metadata', {}).get('skills', '')
                 })
@@ -332,6 +541,49 @@ class PineconeService:
             logger.error(f"❌ Error finding resumes: {e}")
             return []
     
+    def delete_embeddings(self, vector_ids: List[str], batch_size: int = PINECONE_DELETE_BATCH) -> bool:
+        """
+        Delete many vectors in chunks of batch_size, sending the chunks concurrently
+        
+        Args:
+            vector_ids: IDs to delete (e.g., "job_123")
+            batch_size: IDs per delete request
+        
+        Returns:
+            Success status (False if any chunk failed)
+        """
+        
+        if not self.index:
+            return False
+        
+        # Group by namespace (the id prefix) when vectors are namespaced by type
+        by_namespace: Dict[Optional[str], List[str]] = {}
+        for vector_id in vector_ids:
+            namespace = vector_id.split('_', 1)[0] if PINECONE_TYPE_NAMESPACES else None
+            by_namespace.setdefault(namespace, []).append(vector_id)
+        
+        chunks = [
+            (namespace, ids[i:i + batch_size])
+            for namespace, ids in by_namespace.items()
+            for i in range(0, len(ids), batch_size)
+        ]
+        if not chunks:
+            return True
+        
+        chunks_ok = list(self._query_pool.map(lambda chunk: self._delete_chunk(*chunk), chunks))
+        return all(chunks_ok)
+    
+    def _delete_chunk(self, namespace: Optional[str], vector_ids: List[str]) -> bool:
+        try:
+            if namespace:
+                self.index.delete(ids=vector_ids, namespace=namespace)
+            else:
+                self.index.delete(ids=vector_ids)
+            return True
+        except Exception as e:
+            logger.error(f"❌ Error deleting {len(vector_ids)} vectors: {e}")
+            return False
+    
     def delete_embedding(self, vector_id: str) -> bool:
         """
         Delete a vector from Pinecone
@@ -347,7 +599,11 @@ class PineconeService:
             return False
         
         try:
-            self.index.delete(ids=[vector_id])
+            if PINECONE_TYPE_NAMESPACES:
+                # The id prefix is the vector's type, i.e. its namespace
+                self.index.delete(ids=[vector_id], namespace=vector_id.split('_', 1)[0])
+            else:
+                self.index.delete(ids=[vector_id])
             logger.debug(f"✅ Deleted embedding: {vector_id}")
             return True
         except Exception as e:
@@ -375,10 +631,18 @@ class PineconeService:
 
 # Global instance
 pinecone_instance = None
+_pinecone_lock = threading.Lock()
 
 def get_pinecone_service() -> PineconeService:
     """Get or create Pinecone service instance"""
     global pinecone_instance
     if pinecone_instance is None:
-        pinecone_instance = PineconeService()
-    return pinecone_instance
\ No newline at end of file
+        with _pinecone_lock:
+            if pinecone_instance is None:
+                pinecone_instance = PineconeService()
+    return pinecone_instance
+
+
+def get_pinecone_index():
+    """Shared index connection (None if Pinecone is not configured)"""
+    return get_pinecone_service().index
\ No newline at end of file
@@ -1,27 +1,230 @@
 import os
+import asyncio
+import hashlib
 import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional
+import numpy as np
+from cachetools import LRUCache, TTLCache
 from dotenv import load_dotenv
 from langchain_pinecone import PineconeVectorStore
-from langchain_community.embeddings import HuggingFaceEmbeddings
+from langchain_core.embeddings import Embeddings
 from langchain_groq import ChatGroq
 from langchain_core.prompts import PromptTemplate
 from langchain_core.runnables import RunnablePassthrough
 from langchain_core.output_parsers import StrOutputParser
+from app.services.pinecone_service import get_pinecone_index
+from app.services.ai_matcher import get_matcher
 
 # Load environment variables
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+# Documents retrieved per question
+RETRIEVAL_K = 3
+
+# Most recent chat messages included in the prompt
+CHAT_HISTORY_MESSAGES = 10
+
+# Query embeddings kept for repeated questions
+QUERY_EMBEDDING_CACHE_SIZE = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", 1024))
+
+# Concurrent questions are embedded together: up to EMBED_BATCH_MAX per forward
+# pass, waiting at most EMBED_BATCH_WAIT seconds for the batch to fill
+EMBED_BATCH_MAX = int(os.getenv("EMBED_BATCH_MAX", 16))
+EMBED_BATCH_WAIT = float(os.getenv("EMBED_BATCH_WAIT", 0.005))
+
+# Semantic answer cache: a question this similar (cosine) to an earlier one with
+# the same user context and chat history reuses that answer
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", 0.95))
+SEMANTIC_CACHE_TTL = int(os.getenv("SEMANTIC_CACHE_TTL", 3600))  # seconds
+SEMANTIC_CACHE_NAMESPACES = int(os.getenv("SEMANTIC_CACHE_NAMESPACES", 1000))
+SEMANTIC_CACHE_PER_NAMESPACE = 32
+
 # Singleton instances
 _qa_chain = None
 _retriever = None
+_embeddings = None
+_vectorstore = None
+
+
+class SemanticQueryCache:
+    """
+    RAG answers keyed by normalized query embedding
+    
+    Entries live in namespaces (one per user context + chat history), so a
+    hit never crosses users or conversation states. Lookup is a dot product
+    against the namespace's few stored queries.
+    """
+    
+    def __init__(
+        self,
+        threshold: float = SEMANTIC_CACHE_THRESHOLD,
+        ttl: float = SEMANTIC_CACHE_TTL,
+        max_namespaces: int = SEMANTIC_CACHE_NAMESPACES,
+        max_entries: int = SEMANTIC_CACHE_PER_NAMESPACE
+    ):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # namespace -> [(unit query vector, stored at, result)]
+        self._namespaces = TTLCache(maxsize=max_namespaces, ttl=ttl)
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def namespace(*parts: str) -> str:
+        return hashlib.sha1("\x00".join(parts).encode()).hexdigest()
+    
+    def get(self, namespace: str, vector: np.ndarray) -> Optional[Dict]:
+        """Cached result for the most similar unexpired query, if similar enough"""
+        now = time.monotonic()
+        with self._lock:
+            entries = self._namespaces.get(namespace)
+            if not entries:
+                return None
+            entries[:] = [entry for entry in entries if now - entry[1] < self.ttl]
+            if not entries:
+                return None
+            
+            similarities = np.stack([entry[0] for entry in entries]) @ vector
+            best = int(np.argmax(similarities))
+            if similarities[best] >= self.threshold:
+                return entries[best][2]
+        return None
+    
+    def put(self, namespace: str, vector: np.ndarray, result: Dict):
+        with self._lock:
+            entries = self._namespaces.get(namespace) or []
+            entries.append((vector, time.monotonic(), result))
+            del entries[:-self.max_entries]
+            self._namespaces[namespace] = entries
+
+
+_query_cache = SemanticQueryCache()
+
+
+class MatcherEmbeddings(Embeddings):
+    """
+    LangChain embeddings backed by the job matcher's BAAI model
+    
+    Shares the one loaded model (and its ONNX/int8 backend when configured)
+    instead of loading a second copy through HuggingFaceEmbeddings. Texts
+    are embedded without the query instruction, like HuggingFaceEmbeddings,
+    so vectors match the ones the RAG documents were indexed with.
+    """
+    
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return get_matcher().embed_texts(texts).tolist()
+    
+    def embed_query(self, text: str) -> List[float]:
+        return get_matcher().embed_texts([text])[0].tolist()
+
+
+def _unit_vector(embedding: List[float]) -> np.ndarray:
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class QueryEmbeddingBatcher:
+    """
+    Embed concurrent questions in shared forward passes
+    
+    One worker thread makes all model calls: it takes the first pending
+    question, collects more for up to max_wait (at most max_batch in all) and
+    embeds them together. Callers get a concurrent Future per question, which
+    async code awaits without blocking the event loop.
+    """
+    
+    def __init__(self, max_batch: int = EMBED_BATCH_MAX, max_wait: float = EMBED_BATCH_WAIT):
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._pending = queue.Queue()
+        self._worker = None
+        self._start_lock = threading.Lock()
+    
+    def submit(self, text: str) -> Future:
+        """Queue a text; the future resolves to its unit embedding"""
+        future = Future()
+        if self._worker is None:
+            with self._start_lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(
+                        target=self._run, name="query-embedder", daemon=True
+                    )
+                    self._worker.start()
+        self._pending.put((text, future))
+        return future
+    
+    def _run(self):
+        while True:
+            batch = [self._pending.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._pending.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            # Skip questions whose caller already gave up
+            batch = [(text, future) for text, future in batch if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            
+            try:
+                vectors = _embeddings.embed_documents([text for text, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            
+            for (_, future), vector in zip(batch, vectors):
+                future.set_result(_unit_vector(vector))
+
+
+_query_batcher = QueryEmbeddingBatcher()
+
+# question -> unit embedding (a repeated question skips the BAAI forward pass)
+_query_vectors = LRUCache(maxsize=QUERY_EMBEDDING_CACHE_SIZE)
+_query_vectors_lock = threading.Lock()
+
+
+def _cache_query_vector(query: str, vector: np.ndarray) -> np.ndarray:
+    vector.setflags(write=False)  # shared by every caller of the cached entry
+    with _query_vectors_lock:
+        _query_vectors[query] = vector
+    return vector
+
+
+def _embed_query(query: str) -> np.ndarray:
+    """Unit query embedding, from the cache or the batcher (blocks this thread)"""
+    with _query_vectors_lock:
+        vector = _query_vectors.get(query)
+    if vector is None:
+        vector = _cache_query_vector(query, _query_batcher.submit(query).result())
+    return vector
+
+
+async def _embed_query_async(query: str) -> np.ndarray:
+    """Unit query embedding, awaited without blocking the event loop"""
+    with _query_vectors_lock:
+        vector = _query_vectors.get(query)
+    if vector is None:
+        vector = _cache_query_vector(query, await asyncio.wrap_future(_query_batcher.submit(query)))
+    return vector
 
 def format_docs(docs):
     return "\n\n".join(doc.page_content for doc in docs)
 
 def get_qa_chain():
     """Get or initialize the QA chain components"""
-    global _qa_chain, _retriever
+    global _qa_chain, _retriever, _embeddings, _vectorstore
     
     if _qa_chain and _retriever:
         return _qa_chain, _retriever
@@ -43,20 +246,18 @@ def get_qa_chain():
         
         # 2. Setup Embeddings (Must match what we used for indexing)
         logger.info("📥 Loading Embedding Model (BAAI)...")
-        embeddings = HuggingFaceEmbeddings(model_name="BAAI/bge-base-en-v1.5")
+        embeddings = MatcherEmbeddings()
         
-        # 3. Connect to Pinecone Memory
-        index_name = os.getenv("PINECONE_INDEX_NAME", "job-matcher")
-        pinecone_api_key = os.getenv("PINECONE_API_KEY")
+        # 3. Connect to Pinecone Memory (reuse PineconeService's index connection)
+        index = get_pinecone_index()
         
-        if not pinecone_api_key:
-            logger.error("❌ PINECONE_API_KEY not found")
+        if index is None:
+            logger.error("❌ Pinecone index not available (check PINECONE_API_KEY)")
             return None, None
             
         vectorstore = PineconeVectorStore(
-            index_name=index_name, 
-            embedding=embeddings,
-            pinecone_api_key=pinecone_api_key
+            index=index,
+            embedding=embeddings
         )
         
         # 4. Create RAG Prompt
@@ -76,6 +277,9 @@ def get_qa_chain():
         9. Keep greetings short and professional.
         10. Talk to the user in the same language they use.
         
+        User Context:
+        {user_context}
+        
         Context:
         {context}
         
@@ -90,11 +294,13 @@ def get_qa_chain():
         
         PROMPT = PromptTemplate(
             template=prompt_template, 
-            input_variables=["context", "question", "chat_history"]
+            input_variables=["user_context", "context", "question", "chat_history"]
         )
         
         # 5. Create Manual Retrieval Chain (LCEL)
-        _retriever = vectorstore.as_retriever(search_kwargs={"k": 3})
+        _retriever = vectorstore.as_retriever(search_kwargs={"k": RETRIEVAL_K})
+        _embeddings = embeddings
+        _vectorstore = vectorstore
         
         _qa_chain = (
             PROMPT
@@ -114,18 +320,18 @@ def format_chat_history(history: list) -> str:
     if not history:
         return "No previous history."
     
-    formatted = []
-    for msg in history:
-        role = msg.get("role", "unknown").title()
-        content = msg.get("content", "")
-        formatted.append(f"{role}: {content}")
-        
-    # Limit to last 10 messages to save tokens
-    return "\n".join(formatted[-10:])
+    # Only the last few messages are sent (saves tokens) - format just those
+    return "\n".join(
+        f"{msg.get('role', 'unknown').title()}: {msg.get('content', '')}"
+        for msg in history[-CHAT_HISTORY_MESSAGES:]
+    )
 
-def ask_career_coach(query: str, chat_history: list = [], context: dict = None):
+def ask_career_coach(query: str, chat_history: list = None, context: str = None):
     """
     Main function to ask specific career questions.
+    
+    `context` is the caller's user/profile block; it sits after the static
+    instructions and before the retrieved documents in the prompt.
     """
     chain, retriever = get_qa_chain()
     
@@ -135,24 +341,87 @@ def ask_career_coach(query: str, chat_history: list = [], context: dict = None):
         }
     
     try:
-        # 1. Retrieve docs manually
-        docs = retriever.invoke(query)
-        context_str = format_docs(docs)
-        
-        # 2. Format history
         history_str = format_chat_history(chat_history)
+        
+        # 1. Embed the query once - for the cache lookup and for retrieval
+        namespace = _query_cache.namespace(context or "", history_str)
+        query_vector = _embed_query(query)
+        
+        cached = _query_cache.get(namespace, query_vector)
+        if cached:
+            logger.info("⚡ Semantic cache hit")
+            return dict(cached)
+        
+        # 2. Retrieve docs manually
+        docs = _vectorstore.similarity_search_by_vector(query_vector.tolist(), k=RETRIEVAL_K)
+        context_str = format_docs(docs)
 
         # 3. Invoke generation chain
         response_text = chain.invoke({
+            "user_context": context or "Not provided.",
             "context": context_str, 
             "question": query,
             "chat_history": history_str
         })
         
+        result = {
+            "answer": response_text,
+            "source_docs": [doc.page_content for doc in docs]
+        }
+        _query_cache.put(namespace, query_vector, result)
+        return result
+    except Exception as e:
+        logger.error(f"❌ RAG Query Error: {e}")
+        return {"error": str(e)}
+
+async def ask_career_coach_async(query: str, chat_history: list = None, context: str = None):
+    """
+    Async variant of ask_career_coach.
+    
+    Awaits retrieval and the Groq chain (LangChain's async path), so the
+    event loop keeps serving other requests while the LLM call is in flight.
+    """
+    if _qa_chain and _retriever:
+        chain, retriever = _qa_chain, _retriever
+    else:
+        # First call loads the embedding model - keep that off the event loop
+        chain, retriever = await asyncio.to_thread(get_qa_chain)
+    
+    if not chain:
         return {
+            "error": "RAG engine not initialized"
+        }
+    
+    try:
+        history_str = format_chat_history(chat_history)
+        
+        # 1. Embed the query once - for the cache lookup and for retrieval
+        namespace = _query_cache.namespace(context or "", history_str)
+        query_vector = await _embed_query_async(query)
+        
+        cached = _query_cache.get(namespace, query_vector)
+        if cached:
+            logger.info("⚡ Semantic cache hit")
+            return dict(cached)
+        
+        # 2. Retrieve docs
+        docs = await _vectorstore.asimilarity_search_by_vector(query_vector.tolist(), k=RETRIEVAL_K)
+        context_str = format_docs(docs)
+
+        # 3. Invoke generation chain
+        response_text = await chain.ainvoke({
+            "user_context": context or "Not provided.",
+            "context": context_str, 
+            "question": query,
+            "chat_history": history_str
+        })
+        
+        result = {
             "answer": response_text,
             "source_docs": [doc.page_content for doc in docs]
         }
+        _query_cache.put(namespace, query_vector, result)
+        return result
     except Exception as e:
         logger.error(f"❌ RAG Query Error: {e}")
         return {"error": str(e)}
@@ -3,12 +3,69 @@ Rejection Analyzer Service
 Analyzes why user is getting rejected and provides recommendations
 """
 
-from typing import List, Dict
+from typing import List, Dict, Optional
 from collections import Counter
+from datetime import datetime, timedelta, timezone
+from itertools import chain
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
+# Rejection categories in breakdown order (unknown reasons count as "other")
+REJECTION_REASONS = ("skill_gap", "experience_gap", "overqualified", "location_mismatch", "other")
+
+# Fixed suggestions per top rejection reason (skill-specific lines are added per call)
+_STATIC_SUGGESTIONS = {
+    "skill_gap": (
+        "📚 Take free courses on Coursera, Udemy, or freeCodeCamp",
+        "💻 Build 2-3 portfolio projects showcasing these skills",
+        "📝 Update your resume to highlight relevant skills",
+        "🔗 Add completed projects to your GitHub profile"
+    ),
+    "experience_gap": (
+        "🔰 Focus on entry-level and junior positions",
+        "🤝 Consider internships to gain experience",
+        "📝 Highlight your projects and learning in resume",
+        "💼 Look for companies hiring freshers",
+        "🎯 Apply to startups (more flexible requirements)"
+    ),
+    "overqualified": (
+        "📈 Apply for senior/lead positions",
+        "💼 Look for management or architect roles",
+        "🎯 Target companies with larger budgets",
+        "🏢 Consider roles at bigger organizations",
+        "💡 Highlight leadership experience"
+    ),
+    "location_mismatch": (
+        "🌍 Focus on remote positions",
+        "📍 Update your location preferences",
+        "🚗 Consider relocation if possible",
+        "💻 Apply to remote-first companies"
+    ),
+    "other": (
+        "✅ Keep applying - consistency is key!",
+        "🔍 Use our AI matching to find better-fit jobs",
+        "📧 Set up email alerts for new matching jobs",
+        "📊 Review your application strategy"
+    ),
+}
+
+# Trend compares rejections in the last TREND_WINDOW_DAYS with the window before
+TREND_WINDOW_DAYS = 14
+
+
+def _timestamp(value) -> Optional[datetime]:
+    """Record timestamp as an aware datetime (Firestore datetime or ISO string)"""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
 class RejectionAnalyzer:
     """Analyze rejection patterns and generate insights"""
     
@@ -41,35 +98,20 @@ class RejectionAnalyzer:
         
         logger.info(f"🔍 Analyzing {len(rejections)} rejections...")
         
-        # Count rejection reasons
-        rejection_reasons = {
-            "skill_gap": 0,
-            "experience_gap": 0,
-            "overqualified": 0,
-            "location_mismatch": 0,
-            "other": 0
-        }
-        
-        all_missing_skills = []
+        # Count rejection reasons in one pass, then fold unknown ones into "other"
+        reason_counter = Counter(rejection.get('reason', 'other') for rejection in rejections)
         
-        for rejection in rejections:
-            # Categorize rejection
-            reason = rejection.get('reason', 'other')
-            if reason in rejection_reasons:
-                rejection_reasons[reason] += 1
-            else:
-                rejection_reasons['other'] += 1
-            
-            # Collect missing skills
-            skill_gaps = rejection.get('skill_gaps', [])
-            if skill_gaps:
-                all_missing_skills.extend(skill_gaps)
+        rejection_reasons = dict.fromkeys(REJECTION_REASONS, 0)
+        for reason, count in reason_counter.items():
+            rejection_reasons[reason if reason in rejection_reasons else 'other'] += count
         
         # Find top reason
         top_reason = max(rejection_reasons, key=rejection_reasons.get)
         
-        # Get most common missing skills
-        skill_counter = Counter(all_missing_skills)
+        # Get most common missing skills (counted straight from the records)
+        skill_counter = Counter(chain.from_iterable(
+            rejection.get('skill_gaps') or () for rejection in rejections
+        ))
         top_missing_skills = skill_counter.most_common(10)
         
         # Generate suggestions based on analysis
@@ -119,53 +161,13 @@ class RejectionAnalyzer:
         
         suggestions = []
         
-        if top_reason == "skill_gap":
-            if missing_skills:
-                top_3_skills = [skill for skill, _ in missing_skills[:3]]
-                suggestions.append(
-                    f"🎓 Learn these high-demand skills: {', '.join(top_3_skills)}"
-                )
-            
-            suggestions.extend([
-                "📚 Take free courses on Coursera, Udemy, or freeCodeCamp",
-                "💻 Build 2-3 portfolio projects showcasing these skills",
-                "📝 Update your resume to highlight relevant skills",
-                "🔗 Add completed projects to your GitHub profile"
-            ])
-        
-        elif top_reason == "experience_gap":
-            suggestions.extend([
-                "🔰 Focus on entry-level and junior positions",
-                "🤝 Consider internships to gain experience",
-                "📝 Highlight your projects and learning in resume",
-                "💼 Look for companies hiring freshers",
-                "🎯 Apply to startups (more flexible requirements)"
-            ])
-        
-        elif top_reason == "overqualified":
-            suggestions.extend([
-                "📈 Apply for senior/lead positions",
-                "💼 Look for management or architect roles",
-                "🎯 Target companies with larger budgets",
-                "🏢 Consider roles at bigger organizations",
-                "💡 Highlight leadership experience"
-            ])
-        
-        elif top_reason == "location_mismatch":
-            suggestions.extend([
-                "🌍 Focus on remote positions",
-                "📍 Update your location preferences",
-                "🚗 Consider relocation if possible",
-                "💻 Apply to remote-first companies"
-            ])
+        if top_reason == "skill_gap" and missing_skills:
+            top_3_skills = [skill for skill, _ in missing_skills[:3]]
+            suggestions.append(
+                f"🎓 Learn these high-demand skills: {', '.join(top_3_skills)}"
+            )
         
-        else:
-            suggestions.extend([
-                "✅ Keep applying - consistency is key!",
-                "🔍 Use our AI matching to find better-fit jobs",
-                "📧 Set up email alerts for new matching jobs",
-                "📊 Review your application strategy"
-            ])
+        suggestions.extend(_STATIC_SUGGESTIONS.get(top_reason, _STATIC_SUGGESTIONS["other"]))
         
         # Add specific skill learning resources
         if missing_skills:
@@ -180,6 +182,9 @@ class RejectionAnalyzer:
         """
         Analyze if rejection rate is improving or worsening
         
+        Counts rejections in the last TREND_WINDOW_DAYS and in the window
+        before it (one pass over the records' created_at timestamps).
+        
         Args:
             rejections: List of rejection records
         
@@ -190,17 +195,25 @@ class RejectionAnalyzer:
         if len(rejections) < 3:
             return "Not enough data for trend analysis"
         
-        # Simple trend: compare first half vs second half
-        mid_point = len(rejections) // 2
-        first_half = rejections[:mid_point]
-        second_half = rejections[mid_point:]
+        recent_start = datetime.now(timezone.utc) - timedelta(days=TREND_WINDOW_DAYS)
+        older_start = recent_start - timedelta(days=TREND_WINDOW_DAYS)
         
-        # If we had timestamps, we'd use those
-        # For now, assume list is chronological
+        recent = older = 0
+        for rejection in rejections:
+            rejected_at = _timestamp(rejection.get('created_at'))
+            if rejected_at is None:
+                continue
+            if rejected_at >= recent_start:
+                recent += 1
+            elif rejected_at >= older_start:
+                older += 1
+        
+        if recent + older < 3:
+            return "Not enough data for trend analysis"
         
-        if len(second_half) < len(first_half):
+        if recent < older:
             return "Improving - Fewer recent rejections"
-        elif len(second_half) > len(first_half):
+        elif recent > older:
             return "Worsening - More recent rejections"
         else:
             return "Stable - Consistent rejection rate"
@@ -251,10 +264,13 @@ class RejectionAnalyzer:
 
 # Global instance
 analyzer_instance = None
+_analyzer_lock = threading.Lock()
 
 def get_rejection_analyzer() -> RejectionAnalyzer:
     """Get or create rejection analyzer instance"""
     global analyzer_instance
     if analyzer_instance is None:
-        analyzer_instance = RejectionAnalyzer()
+        with _analyzer_lock:
+            if analyzer_instance is None:
+                analyzer_instance = RejectionAnalyzer()
     return analyzer_instance
\ No newline at end of file
@@ -4,37 +4,134 @@ Extracts skills, experience, and other info from PDF resumes
 """
 
 import PyPDF2
+import ahocorasick
 import re
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 import os
 import logging
 
+try:
+    import pypdfium2 as pdfium  # Native PDFium text extraction; optional
+except ImportError:
+    pdfium = None
+
 logger = logging.getLogger(__name__)
 
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == '_'
+
+
+def _is_boundary(text: str, pos: int) -> bool:
+    """Same test as regex \\b between text[pos - 1] and text[pos]"""
+    before = pos > 0 and _is_word_char(text[pos - 1])
+    after = pos < len(text) and _is_word_char(text[pos])
+    return before != after
+
+
+# Common tech skill keywords
+SKILL_KEYWORDS: Tuple[str, ...] = (
+    'python', 'java', 'javascript', 'typescript', 'react', 'angular', 'vue',
+    'node.js', 'nodejs', 'express', 'django', 'flask', 'fastapi',
+    'sql', 'mysql', 'postgresql', 'mongodb', 'redis', 'cassandra',
+    'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'gitlab',
+    'machine learning', 'deep learning', 'ai', 'artificial intelligence',
+    'data science', 'data analysis', 'pandas', 'numpy', 'tensorflow', 'pytorch',
+    'html', 'css', 'bootstrap', 'tailwind', 'sass', 'scss',
+    'git', 'github', 'bitbucket', 'jira', 'agile', 'scrum',
+    'rest api', 'graphql', 'microservices', 'api',
+    'c++', 'c#', 'go', 'golang', 'rust', 'php', 'ruby', 'kotlin', 'swift',
+    'spring', 'hibernate', 'next.js', 'vue.js', 'angular.js',
+    'firebase', 'mongodb', 'dynamodb', 'elasticsearch',
+    'linux', 'unix', 'bash', 'shell scripting',
+    'ci/cd', 'devops', 'terraform', 'ansible',
+    'figma', 'photoshop', 'ui/ux', 'design',
+    'testing', 'jest', 'mocha', 'pytest', 'selenium',
+    'excel', 'powerpoint', 'tableau', 'power bi'
+)
+
+# Compiled once per process and shared by every parser instance
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+
+# Indian phone patterns
+_PHONE_RES = (
+    re.compile(r'\+91[\s-]?\d{10}'),  # +91 1234567890
+    re.compile(r'\d{10}'),  # 1234567890
+    re.compile(r'\d{5}[\s-]?\d{5}'),  # 12345 67890
+    re.compile(r'\(\d{3}\)[\s-]?\d{3}[\s-]?\d{4}')  # (123) 456-7890
+)
+
+
+def _build_skill_automaton(keywords: Tuple[str, ...]) -> ahocorasick.Automaton:
+    """Every skill in one automaton -> a single pass over the resume text"""
+    automaton = ahocorasick.Automaton()
+    for skill in keywords:
+        automaton.add_word(skill, (len(skill), skill.title()))
+    automaton.make_automaton()
+    return automaton
+
+
+_SKILL_AUTOMATON = _build_skill_automaton(SKILL_KEYWORDS)
+
+# Experience indicators, checked senior -> mid -> entry
+EXPERIENCE_KEYWORDS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ('senior', (
+        'senior', 'lead', 'principal', 'architect', 'manager',
+        '7+ years', '8+ years', '10+ years', '5-7 years',
+        'team lead', 'tech lead'
+    )),
+    ('mid', (
+        'mid-level', 'intermediate',
+        '3+ years', '4+ years', '5+ years',
+        '2-4 years', '3-5 years'
+    )),
+    ('entry', (
+        'entry', 'junior', 'fresher', 'graduate',
+        'internship', 'trainee', '0-2 years', '1 year'
+    ))
+)
+
+EDUCATION_KEYWORDS: Tuple[str, ...] = (
+    'b.tech', 'btech', 'bachelor of technology',
+    'b.e', 'bachelor of engineering',
+    'bca', 'bachelor of computer application',
+    'm.tech', 'mtech', 'master of technology',
+    'm.e', 'master of engineering',
+    'mca', 'master of computer application',
+    'bsc', 'bachelor of science',
+    'msc', 'master of science',
+    'mba', 'master of business administration',
+    'phd', 'doctorate'
+)
+
+
+def _build_experience_automaton() -> ahocorasick.Automaton:
+    """Tag each keyword with (level rank, list position, level, keyword)"""
+    automaton = ahocorasick.Automaton()
+    for rank, (level, keywords) in enumerate(EXPERIENCE_KEYWORDS):
+        for position, keyword in enumerate(keywords):
+            automaton.add_word(keyword, (rank, position, level, keyword))
+    automaton.make_automaton()
+    return automaton
+
+
+def _build_education_automaton() -> ahocorasick.Automaton:
+    automaton = ahocorasick.Automaton()
+    for edu in EDUCATION_KEYWORDS:
+        automaton.add_word(edu, edu.upper())
+    automaton.make_automaton()
+    return automaton
+
+
+_EXPERIENCE_AUTOMATON = _build_experience_automaton()
+_EDUCATION_AUTOMATON = _build_education_automaton()
+
+
 class ResumeParser:
     """Parse resume and extract information"""
     
     def __init__(self):
-        # Common tech skill keywords
-        self.skill_keywords = [
-            'python', 'java', 'javascript', 'typescript', 'react', 'angular', 'vue',
-            'node.js', 'nodejs', 'express', 'django', 'flask', 'fastapi',
-            'sql', 'mysql', 'postgresql', 'mongodb', 'redis', 'cassandra',
-            'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'gitlab',
-            'machine learning', 'deep learning', 'ai', 'artificial intelligence',
-            'data science', 'data analysis', 'pandas', 'numpy', 'tensorflow', 'pytorch',
-            'html', 'css', 'bootstrap', 'tailwind', 'sass', 'scss',
-            'git', 'github', 'bitbucket', 'jira', 'agile', 'scrum',
-            'rest api', 'graphql', 'microservices', 'api',
-            'c++', 'c#', 'go', 'golang', 'rust', 'php', 'ruby', 'kotlin', 'swift',
-            'spring', 'hibernate', 'next.js', 'vue.js', 'angular.js',
-            'firebase', 'mongodb', 'dynamodb', 'elasticsearch',
-            'linux', 'unix', 'bash', 'shell scripting',
-            'ci/cd', 'devops', 'terraform', 'ansible',
-            'figma', 'photoshop', 'ui/ux', 'design',
-            'testing', 'jest', 'mocha', 'pytest', 'selenium',
-            'excel', 'powerpoint', 'tableau', 'power bi'
-        ]
+        self.skill_keywords = SKILL_KEYWORDS
     
     def extract_text_from_pdf(self, file_path: str) -> str:
         """
@@ -47,14 +144,10 @@ class ResumeParser:
             Extracted text as string
         """
         try:
-            text = ""
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                
-                for page in pdf_reader.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
+            if pdfium is not None:
+                text = self._extract_text_pdfium(file_path)
+            else:
+                text = self._extract_text_pypdf2(file_path)
             
             logger.info(f"✅ Extracted {len(text)} characters from PDF")
             return text
@@ -63,6 +156,37 @@ class ResumeParser:
             logger.error(f"❌ Error reading PDF: {e}")
             return ""
     
+    def _extract_text_pdfium(self, file_path: str) -> str:
+        """Extract page text with PDFium (C++), far faster than pure-Python parsing"""
+        parts = []
+        pdf = pdfium.PdfDocument(file_path)
+        try:
+            for page in pdf:
+                textpage = page.get_textpage()
+                page_text = textpage.get_text_range()
+                textpage.close()
+                page.close()
+                if page_text:
+                    parts.append(page_text)
+        finally:
+            pdf.close()
+        
+        return "\n".join(parts)
+    
+    def _extract_text_pypdf2(self, file_path: str) -> str:
+        """Fallback extraction when pypdfium2 isn't installed"""
+        # Collect pages and join once (repeated += reallocates the whole text)
+        parts = []
+        with open(file_path, 'rb') as file:
+            pdf_reader = PyPDF2.PdfReader(file)
+            
+            for page in pdf_reader.pages:
+                page_text = page.extract_text()
+                if page_text:
+                    parts.append(page_text)
+        
+        return "\n".join(parts)
+    
     def extract_email(self, text: str) -> str:
         """
         Extract email from text
@@ -73,8 +197,7 @@ class ResumeParser:
         Returns:
             Email address or empty string
         """
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, text)
+        emails = _EMAIL_RE.findall(text)
         
         if emails:
             logger.debug(f"✅ Email found: {emails[0]}")
@@ -92,132 +215,82 @@ class ResumeParser:
         Returns:
             Phone number or empty string
         """
-        # Indian phone patterns
-        phone_patterns = [
-            r'\+91[\s-]?\d{10}',  # +91 1234567890
-            r'\d{10}',  # 1234567890
-            r'\d{5}[\s-]?\d{5}',  # 12345 67890
-            r'\(\d{3}\)[\s-]?\d{3}[\s-]?\d{4}'  # (123) 456-7890
-        ]
-        
-        for pattern in phone_patterns:
-            phones = re.findall(pattern, text)
+        for pattern in _PHONE_RES:
+            phones = pattern.findall(text)
             if phones:
                 logger.debug(f"✅ Phone found: {phones[0]}")
                 return phones[0]
         
         return ""
     
-    def extract_skills(self, text: str) -> List[str]:
+    def extract_skills(self, text: str, text_lower: Optional[str] = None) -> List[str]:
         """
         Extract technical skills from text
         
         Args:
             text: Resume text
+            text_lower: Pre-lowercased text (computed if not given)
         
         Returns:
             List of found skills
         """
-        text_lower = text.lower()
-        found_skills = []
+        if text_lower is None:
+            text_lower = text.lower()
+        found_skills = set()
         
-        for skill in self.skill_keywords:
-            # Match whole word or with common variations
-            if re.search(r'\b' + re.escape(skill) + r'\b', text_lower):
-                # Capitalize properly
-                found_skills.append(skill.title())
+        # Overlapping hits are all reported ("rest api" and "api"), same as
+        # checking each skill separately; keep only whole-word matches
+        for end, (length, skill_name) in _SKILL_AUTOMATON.iter(text_lower):
+            start = end - length + 1
+            if _is_boundary(text_lower, start) and _is_boundary(text_lower, end + 1):
+                found_skills.add(skill_name)
         
-        # Remove duplicates and sort
-        found_skills = sorted(list(set(found_skills)))
+        found_skills = sorted(found_skills)
         
         logger.info(f"✅ Found {len(found_skills)} skills")
         return found_skills
     
-    def extract_experience(self, text: str) -> str:
+    def extract_experience(self, text: str, text_lower: Optional[str] = None) -> str:
         """
         Try to determine experience level from text
         
         Args:
             text: Resume text
+            text_lower: Pre-lowercased text (computed if not given)
         
         Returns:
             'entry', 'mid', or 'senior'
         """
-        text_lower = text.lower()
+        if text_lower is None:
+            text_lower = text.lower()
         
-        # Senior level indicators
-        senior_keywords = [
-            'senior', 'lead', 'principal', 'architect', 'manager',
-            '7+ years', '8+ years', '10+ years', '5-7 years',
-            'team lead', 'tech lead'
-        ]
-        
-        # Mid level indicators
-        mid_keywords = [
-            'mid-level', 'intermediate', 
-            '3+ years', '4+ years', '5+ years',
-            '2-4 years', '3-5 years'
-        ]
-        
-        # Entry level indicators
-        entry_keywords = [
-            'entry', 'junior', 'fresher', 'graduate',
-            'internship', 'trainee', '0-2 years', '1 year'
-        ]
-        
-        # Check for senior
-        for keyword in senior_keywords:
-            if keyword in text_lower:
-                logger.debug(f"✅ Experience: Senior (found '{keyword}')")
-                return 'senior'
-        
-        # Check for mid
-        for keyword in mid_keywords:
-            if keyword in text_lower:
-                logger.debug(f"✅ Experience: Mid (found '{keyword}')")
-                return 'mid'
-        
-        # Check for entry
-        for keyword in entry_keywords:
-            if keyword in text_lower:
-                logger.debug(f"✅ Experience: Entry (found '{keyword}')")
-                return 'entry'
+        # Lowest (rank, position) hit = first keyword the level-by-level checks would find
+        hits = [priority for _, priority in _EXPERIENCE_AUTOMATON.iter(text_lower)]
+        if hits:
+            _, _, level, keyword = min(hits)
+            logger.debug(f"✅ Experience: {level.title()} (found '{keyword}')")
+            return level
         
         # Default to entry
         logger.debug("✅ Experience: Entry (default)")
         return 'entry'
     
-    def extract_education(self, text: str) -> List[str]:
+    def extract_education(self, text: str, text_lower: Optional[str] = None) -> List[str]:
         """
         Extract education qualifications
         
         Args:
             text: Resume text
+            text_lower: Pre-lowercased text (computed if not given)
         
         Returns:
             List of degrees/qualifications
         """
-        text_lower = text.lower()
+        if text_lower is None:
+            text_lower = text.lower()
         
-        education_keywords = [
-            'b.tech', 'btech', 'bachelor of technology',
-            'b.e', 'bachelor of engineering',
-            'bca', 'bachelor of computer application',
-            'm.tech', 'mtech', 'master of technology',
-            'm.e', 'master of engineering',
-            'mca', 'master of computer application',
-            'bsc', 'bachelor of science',
-            'msc', 'master of science',
-            'mba', 'master of business administration',
-            'phd', 'doctorate'
-        ]
-        
-        found_education = []
-        for edu in education_keywords:
-            if edu in text_lower:
-                found_education.append(edu.upper())
-        
-        return list(set(found_education))
+        found_education = {edu for _, edu in _EDUCATION_AUTOMATON.iter(text_lower)}
+        return list(found_education)
     
     def parse_resume(self, file_path: str) -> Dict:
         """
@@ -241,13 +314,16 @@ class ResumeParser:
             logger.error("❌ Could not extract text from PDF")
             return {"error": "Could not extract text from PDF"}
         
+        # Lowercase once for all keyword extractors
+        text_lower = text.lower()
+        
         # Parse information
         parsed_data = {
             "email": self.extract_email(text),
             "phone": self.extract_phone(text),
-            "skills": self.extract_skills(text),
-            "experience_level": self.extract_experience(text),
-            "education": self.extract_education(text),
+            "skills": self.extract_skills(text, text_lower),
+            "experience_level": self.extract_experience(text, text_lower),
+            "education": self.extract_education(text, text_lower),
             "raw_text_preview": text[:500]  # First 500 chars for preview
         }
         
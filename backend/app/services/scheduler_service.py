@@ -3,16 +3,75 @@ Background Job Scheduler
 Automatically scrapes jobs at regular intervals
 """
 
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.interval import IntervalTrigger
 from datetime import datetime
+from typing import Dict, List, Tuple
+import asyncio
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
+# Keywords fetched at once (HTTP-bound); kept modest for the APIs' rate limits
+SCRAPE_KEYWORD_CONCURRENCY = int(os.getenv("SCRAPE_KEYWORD_CONCURRENCY", "5"))
+
 # Global scheduler instance
 scheduler = None
 
+
+async def _fetch_keyword(scraper, keyword: str, semaphore: asyncio.Semaphore) -> List[Dict]:
+    """Run one keyword's (blocking) source searches on a worker thread"""
+    async with semaphore:
+        logger.info(f"🔍 Scraping: {keyword}")
+        return await asyncio.to_thread(
+            scraper.search_all_sources,
+            keywords=keyword,
+            location="India",
+            max_results_per_source=10
+        )
+
+
+def _store_keyword_jobs(firebase, matcher, pinecone, notification_service, jobs: List[Dict]) -> Tuple[int, int]:
+    """
+    Store one keyword's jobs, embed + upsert the new ones, and notify matching users
+    
+    Returns:
+        (new jobs stored, emails sent)
+    """
+    # Store in one batched write - existing jobs come back as None
+    job_ids = firebase.bulk_create_jobs(jobs)
+    new_jobs = [
+        (job_data, job_id)
+        for job_data, job_id in zip(jobs, job_ids)
+        if job_id
+    ]
+    
+    # Create this keyword's embeddings in one pass and upsert them together
+    if new_jobs:
+        try:
+            job_embeddings = matcher.create_job_embeddings([job_data for job_data, _ in new_jobs])
+            pinecone.upsert_job_embeddings([
+                (job_id, job_embedding, {
+                    "job_id": job_id,
+                    "title": job_data["title"],
+                    "company": job_data["company"],
+                    "type": "job"
+                })
+                for (job_data, job_id), job_embedding in zip(new_jobs, job_embeddings)
+            ])
+        except Exception as e:
+            logger.error(f"Embedding error: {e}")
+    
+    # Notify matching users for this keyword's new jobs in one batch
+    emails = 0
+    try:
+        for stats in notification_service.notify_matching_users_for_jobs(new_jobs):
+            emails += stats.get("emails_sent", 0)
+    except Exception as e:
+        logger.error(f"Notification error: {e}")
+    
+    return len(new_jobs), emails
+
+
 async def scrape_jobs_task():
     """
     Background task to scrape jobs
@@ -31,7 +90,7 @@ async def scrape_jobs_task():
         from app.services.notification_service import get_notification_service
         
         firebase = get_firebase_service()
-        matcher = get_matcher()
+        matcher = await asyncio.to_thread(get_matcher)  # May still be loading the model
         pinecone = get_pinecone_service()
         scraper = get_unified_scraper()
         notification_service = get_notification_service()
@@ -53,53 +112,26 @@ async def scrape_jobs_task():
         total_stored = 0
         total_emails = 0
         
-        for keyword in keywords:
-            logger.info(f"🔍 Scraping: {keyword}")
+        # Fetch every keyword concurrently, then store/notify keyword by keyword
+        semaphore = asyncio.Semaphore(SCRAPE_KEYWORD_CONCURRENCY)
+        results = await asyncio.gather(
+            *(_fetch_keyword(scraper, keyword, semaphore) for keyword in keywords),
+            return_exceptions=True
+        )
+        
+        for keyword, jobs in zip(keywords, results):
+            if isinstance(jobs, Exception):
+                logger.error(f"❌ Error scraping '{keyword}': {jobs}")
+                continue
             
             try:
-                jobs = scraper.search_all_sources(
-                    keywords=keyword,
-                    location="India",
-                    max_results_per_source=10
+                # Store/embed/notify are all blocking (Firestore, model, Pinecone,
+                # SMTP) - run the whole step on a worker thread, off the event loop
+                stored, emails = await asyncio.to_thread(
+                    _store_keyword_jobs, firebase, matcher, pinecone, notification_service, jobs
                 )
-                
-                for job_data in jobs:
-                    # Check duplicate
-                    if firebase.check_job_exists(job_data["title"], job_data["company"]):
-                        continue
-                    
-                    # Store job
-                    job_id = firebase.create_job(job_data)
-                    if not job_id:
-                        continue
-                    
-                    # Create embedding
-                    try:
-                        job_embedding = matcher.create_job_embedding(job_data)
-                        pinecone.upsert_job_embedding(
-                            job_id=job_id,
-                            embedding=job_embedding,
-                            metadata={
-                                "job_id": job_id,
-                                "title": job_data["title"],
-                                "company": job_data["company"],
-                                "type": "job"
-                            }
-                        )
-                    except Exception as e:
-                        logger.error(f"Embedding error: {e}")
-                    
-                    total_stored += 1
-                    
-                    # Notify matching users
-                    try:
-                        stats = notification_service.notify_matching_users_for_job(
-                            job_data=job_data,
-                            job_id=job_id
-                        )
-                        total_emails += stats.get("emails_sent", 0)
-                    except Exception as e:
-                        logger.error(f"Notification error: {e}")
+                total_stored += stored
+                total_emails += emails
                 
             except Exception as e:
                 logger.error(f"❌ Error scraping '{keyword}': {e}")
@@ -124,6 +156,10 @@ def start_scheduler():
         logger.warning("⚠️ Scheduler already running")
         return scheduler
     
+    # Imported here so processes that never start the scheduler skip APScheduler
+    from apscheduler.schedulers.asyncio import AsyncIOScheduler
+    from apscheduler.triggers.interval import IntervalTrigger
+    
     scheduler = AsyncIOScheduler()
     
     # Add job scraping task - runs every 6 hours
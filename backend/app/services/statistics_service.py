@@ -5,15 +5,32 @@ Provides rejection analysis, skill gaps, timeline data, and recommendations
 """
 
 from typing import Dict, List
-from collections import Counter
+from cachetools import TTLCache
+from collections import Counter, defaultdict
 from datetime import datetime, timedelta
 import logging
+import os
+import threading
 
 logger = logging.getLogger(__name__)
 
+# Per-user dashboard cache (dashboards poll; stats only need to be ~1 min fresh)
+STATS_CACHE_SIZE = int(os.getenv("STATS_CACHE_SIZE", "1000"))
+STATS_CACHE_TTL = int(os.getenv("STATS_CACHE_TTL", "60"))  # seconds
+
 class StatisticsService:
     """Calculate comprehensive statistics for user dashboard"""
     
+    def __init__(self):
+        # user_id -> computed statistics, recomputed after STATS_CACHE_TTL seconds
+        self._cache = TTLCache(maxsize=STATS_CACHE_SIZE, ttl=STATS_CACHE_TTL)
+        self._cache_lock = threading.Lock()
+    
+    def invalidate(self, user_id: str) -> None:
+        """Drop a user's cached statistics (call after their applications change)"""
+        with self._cache_lock:
+            self._cache.pop(user_id, None)
+    
     def get_user_statistics(self, user_id: str, firebase_db) -> Dict:
         """
         Get comprehensive statistics for user
@@ -26,6 +43,12 @@ class StatisticsService:
             Complete statistics dictionary
         """
         
+        with self._cache_lock:
+            cached = self._cache.get(user_id)
+        if cached is not None:
+            logger.debug(f"📊 Statistics cache hit for user {user_id}")
+            return cached
+        
         logger.info(f"📊 Calculating statistics for user {user_id}")
         
         # Get user data
@@ -55,6 +78,9 @@ class StatisticsService:
             "performance_metrics": self._calculate_performance_metrics(applications)
         }
         
+        with self._cache_lock:
+            self._cache[user_id] = stats
+        
         logger.info("✅ Statistics calculated successfully")
         return stats
     
@@ -73,11 +99,12 @@ class StatisticsService:
                 "interview": 0
             }
         
-        # Count by status
-        rejected = sum(1 for app in applications if app.get('status') == 'rejected')
-        accepted = sum(1 for app in applications if app.get('status') == 'accepted')
-        pending = sum(1 for app in applications if app.get('status') == 'applied')
-        interview = sum(1 for app in applications if app.get('status') == 'interview')
+        # Count by status (one pass)
+        status_counts = Counter(app.get('status') for app in applications)
+        rejected = status_counts['rejected']
+        accepted = status_counts['accepted']
+        pending = status_counts['applied']
+        interview = status_counts['interview']
         
         return {
             "total_applications": total,
@@ -101,11 +128,16 @@ class StatisticsService:
                 "best_match_score": 0
             }
         
-        total_match_score = sum(app.get('match_score', 0) for app in applications)
-        total_rejection_prob = sum(app.get('rejection_probability', 0) for app in applications)
-        
-        match_scores = [app.get('match_score', 0) for app in applications if app.get('match_score')]
-        best_match = max(match_scores) if match_scores else 0
+        # Sums and best score in one pass
+        total_match_score = 0
+        total_rejection_prob = 0
+        best_match = 0
+        for app in applications:
+            match_score = app.get('match_score', 0)
+            total_match_score += match_score
+            if match_score > best_match:
+                best_match = match_score
+            total_rejection_prob += app.get('rejection_probability', 0)
         
         return {
             "total": total,
@@ -131,35 +163,29 @@ class StatisticsService:
         
         # Trend analysis (last 30 days)
         thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-        recent_rejections = []
-        
+        recent_count = 0
         for r in rejections:
             created_at = r.get('created_at')
-            if created_at:
-                # Handle both timestamp and datetime objects
-                if hasattr(created_at, 'timestamp'):
-                    rejection_date = created_at
-                else:
-                    rejection_date = created_at
-                
-                if rejection_date >= thirty_days_ago:
-                    recent_rejections.append(r)
+            if created_at and created_at >= thirty_days_ago:
+                recent_count += 1
         
         # Determine trend
-        if len(recent_rejections) < len(rejections) / 2:
+        if recent_count < len(rejections) / 2:
             trend = "Improving"
-        elif len(recent_rejections) > len(rejections) / 2:
+        elif recent_count > len(rejections) / 2:
             trend = "Needs Attention"
         else:
             trend = "Stable"
         
+        top_reason = reasons.most_common(1)[0][0] if reasons else None
+        
         return {
             "total": len(rejections),
             "reasons": dict(reasons),
-            "top_reason": reasons.most_common(1)[0][0] if reasons else None,
+            "top_reason": top_reason,
             "trend": trend,
-            "recent_count": len(recent_rejections),
-            "improvement_tips": self._get_improvement_tips(reasons.most_common(1)[0][0] if reasons else None)
+            "recent_count": recent_count,
+            "improvement_tips": self._get_improvement_tips(top_reason)
         }
     
     def _analyze_skill_gaps(self, rejections: List[Dict]) -> Dict:
@@ -211,46 +237,33 @@ class StatisticsService:
         
         thirty_days_ago = datetime.utcnow() - timedelta(days=30)
         
-        # Filter recent applications
-        recent_apps = []
+        # date -> [applications, rejections, acceptances], filled in one pass
+        counts = defaultdict(lambda: [0, 0, 0])
         for app in applications:
             applied_date = app.get('applied_at')
-            if applied_date:
-                # Handle both timestamp and datetime
-                if hasattr(applied_date, 'timestamp'):
-                    app_date = applied_date
-                else:
-                    app_date = applied_date
-                
-                if app_date >= thirty_days_ago:
-                    recent_apps.append(app)
-        
-        # Group by date
-        timeline = {}
-        for app in recent_apps:
-            applied_date = app.get('applied_at')
-            if applied_date:
-                date_key = applied_date.strftime('%Y-%m-%d') if hasattr(applied_date, 'strftime') else str(applied_date)[:10]
-                
-                if date_key not in timeline:
-                    timeline[date_key] = {
-                        "date": date_key,
-                        "applications": 0,
-                        "rejections": 0,
-                        "acceptances": 0
-                    }
-                
-                timeline[date_key]["applications"] += 1
-                
-                if app.get('status') == 'rejected':
-                    timeline[date_key]["rejections"] += 1
-                elif app.get('status') == 'accepted':
-                    timeline[date_key]["acceptances"] += 1
+            if not applied_date or applied_date < thirty_days_ago:
+                continue
+            
+            date_key = applied_date.strftime('%Y-%m-%d') if hasattr(applied_date, 'strftime') else str(applied_date)[:10]
+            slots = counts[date_key]
+            slots[0] += 1
+            
+            app_status = app.get('status')
+            if app_status == 'rejected':
+                slots[1] += 1
+            elif app_status == 'accepted':
+                slots[2] += 1
         
         # Convert to sorted list
-        timeline_list = sorted(timeline.values(), key=lambda x: x['date'])
-        
-        return timeline_list
+        return [
+            {
+                "date": date_key,
+                "applications": slots[0],
+                "rejections": slots[1],
+                "acceptances": slots[2]
+            }
+            for date_key, slots in sorted(counts.items())
+        ]
     
     def _generate_recommendations(
         self, 
@@ -0,0 +1,48 @@
+"""
+Background Tasks for Email Notifications
+Sends job match emails off the request path
+"""
+
+from typing import Dict, List
+from app.tasks.scraping_tasks import celery_app
+from app.services.email_service import get_email_service
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Retry failed recipients after 30s, 60s, 120s
+MAX_SEND_RETRIES = 3
+RETRY_BASE_DELAY = 30
+
+
+@celery_app.task(bind=True, max_retries=MAX_SEND_RETRIES, acks_late=True)
+def send_job_match_emails(self, job_data: Dict, recipients: List[Dict]):
+    """
+    Background task: Send one job's match notifications
+    
+    All recipients share one SMTP session; only the ones that failed (or were
+    skipped when the batch aborted) are retried.
+    
+    Args:
+        job_data: Job fields used by the email template
+        recipients: Dicts with user_id, email, name, score and skill_gaps
+    """
+    
+    results = get_email_service().send_job_match_batch(job_data, recipients)
+    failed = [recipient for recipient, success in zip(recipients, results) if not success]
+    
+    logger.info(
+        f"📧 {job_data.get('title')}: {len(recipients) - len(failed)} sent, {len(failed)} failed"
+    )
+    
+    if failed and self.request.retries < self.max_retries:
+        raise self.retry(
+            args=(job_data, failed),
+            countdown=RETRY_BASE_DELAY * 2 ** self.request.retries
+        )
+    
+    return {
+        'status': 'success' if not failed else 'partial',
+        'emails_sent': len(recipients) - len(failed),
+        'emails_failed': len(failed)
+    }
@@ -3,10 +3,10 @@ Background Tasks for Job Scraping
 Fetches from Adzuna + Indeed daily
 """
 
-from celery import Celery
+from celery import Celery, group
+from celery.signals import worker_process_init
 from app.services.database import get_firebase_service
 from app.services.pinecone_service import get_pinecone_service
-from app.services.ai_matcher import get_matcher
 from app.scrapers import get_unified_scraper
 import logging
 import os
@@ -15,16 +15,101 @@ logger = logging.getLogger(__name__)
 
 # Initialize Celery
 redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
-celery_app = Celery('tasks', broker=redis_url)
+celery_app = Celery('tasks', broker=redis_url, include=['app.tasks.email_tasks'])
+
+# Long scrape tasks: reserve one task at a time so short ones (emails, cleanup)
+# go to idle workers instead of queueing behind a scrape; ack after completion
+# so a crashed worker's task is redelivered (job IDs are deterministic, so a
+# re-run scrape doesn't duplicate anything)
+celery_app.conf.update(
+    worker_prefetch_multiplier=1,
+    task_acks_late=True
+)
+
+# Long scrapes and cleanup get their own queues so they can't starve the
+# email tasks on the default "celery" queue. Run a worker per queue, e.g.:
+#   celery -A app.tasks.scraping_tasks worker -Q scrape -c 2
+#   celery -A app.tasks.scraping_tasks worker -Q cleanup -c 1
+#   celery -A app.tasks.scraping_tasks worker -Q celery
+celery_app.conf.task_routes = {
+    'app.tasks.scraping_tasks.scrape_and_store_jobs': {'queue': 'scrape'},
+    'app.tasks.scraping_tasks.scrape_keyword': {'queue': 'scrape'},
+    'app.tasks.scraping_tasks.cleanup_old_jobs': {'queue': 'cleanup'},
+}
+
+@worker_process_init.connect
+def warm_services(**kwargs):
+    """
+    Create the service singletons as each worker process starts
+    
+    The getters already cache per process; this moves the model load and
+    client handshakes off the first task's latency. ai_matcher is imported
+    here (not at module top) so the prefork master never loads torch or the
+    model before forking; each child loads its own copy after the fork.
+    """
+    try:
+        from app.services.ai_matcher import get_matcher
+        
+        get_firebase_service()
+        get_pinecone_service()
+        get_matcher()
+        get_unified_scraper()
+        logger.info("✅ Worker services ready")
+    except Exception as e:
+        logger.error(f"❌ Error warming worker services: {e}")
+
+
+# Keywords to search (one subtask each)
+SCRAPE_KEYWORDS = (
+    "python developer",
+    "java developer",
+    "javascript developer",
+    "react developer",
+    "backend engineer",
+    "frontend developer",
+    "full stack developer",
+    "data scientist",
+    "data analyst",
+    "machine learning engineer",
+    "devops engineer"
+)
+
 
 @celery_app.task
 def scrape_and_store_jobs():
     """
     Background task: Scrape jobs from Adzuna + Indeed
     Runs daily at 2 AM
+    
+    Fans out one scrape_keyword subtask per keyword so the searches run on
+    every free worker slot instead of one after another.
+    """
+    
+    logger.info(f"🚀 Dispatching job scraping for {len(SCRAPE_KEYWORDS)} keywords...")
+    
+    group(scrape_keyword.s(keyword) for keyword in SCRAPE_KEYWORDS).apply_async()
+    
+    return {
+        'status': 'dispatched',
+        'keywords': len(SCRAPE_KEYWORDS)
+    }
+
+
+@celery_app.task
+def scrape_keyword(keyword: str):
+    """
+    Background subtask: Scrape and store one keyword from ALL sources
+    
+    Subtasks can race on jobs found under several keywords; listing IDs are
+    deterministic, so only the first create wins and the rest are skipped.
+    
+    Args:
+        keyword: Search keywords
     """
     
-    logger.info("🚀 Starting job scraping from ALL sources...")
+    logger.info(f"🔍 Searching '{keyword}' across Adzuna + Indeed...")
+    
+    from app.services.ai_matcher import get_matcher
     
     # Get services
     firebase = get_firebase_service()
@@ -32,85 +117,52 @@ def scrape_and_store_jobs():
     matcher = get_matcher()
     scraper = get_unified_scraper()
     
-    # Keywords to search
-    keywords_list = [
-        "python developer",
-        "java developer",
-        "javascript developer",
-        "react developer",
-        "backend engineer",
-        "frontend developer",
-        "full stack developer",
-        "data scientist",
-        "data analyst",
-        "machine learning engineer",
-        "devops engineer"
-    ]
-    
-    # Fetch from BOTH Adzuna + Indeed
-    logger.info(f"🔍 Searching {len(keywords_list)} keywords across Adzuna + Indeed...")
-    
-    all_jobs = scraper.search_by_keywords_list(
-        keywords_list=keywords_list,
+    jobs = scraper.search_all_sources(
+        keywords=keyword,
         location="india",
-        max_results_per_keyword=25  # 25 per keyword per source
+        max_results_per_source=25  # 25 per keyword per source
     )
     
-    logger.info(f"📥 Total jobs fetched: {len(all_jobs)}")
+    logger.info(f"📥 '{keyword}': {len(jobs)} jobs fetched")
+    
+    # Store in Firebase with batched writes (one existence read + one commit per 500 jobs)
+    job_ids = firebase.bulk_create_jobs(jobs)
+    stored_jobs = [
+        (job_data, job_id)
+        for job_data, job_id in zip(jobs, job_ids)
+        if job_id
+    ]
+    total_stored = len(stored_jobs)
     
-    # Store in Firebase + Pinecone
-    total_stored = 0
+    # Per-job lines are DEBUG only; the summary below covers INFO
+    if logger.isEnabledFor(logging.DEBUG):
+        for job_data, _ in stored_jobs:
+            logger.debug("💾 Stored: %s (%s)", job_data['title'], job_data['source'])
     
-    for job_data in all_jobs:
+    # Generate all embeddings in one pass and store them in batched Pinecone upserts
+    if stored_jobs:
         try:
-            # Check if job already exists
-            if firebase.check_job_exists(
-                title=job_data['title'],
-                company=job_data['company']
-            ):
-                logger.debug(f"⏭️  Skipping duplicate: {job_data['title']}")
-                continue
-            
-            # Store in Firebase
-            job_id = firebase.create_job(job_data)
-            
-            if not job_id:
-                continue
-            
-            logger.info(f"💾 Stored: {job_data['title']} ({job_data['source']})")
-            
-            # Generate embedding
-            job_embedding = matcher.create_job_embedding(job_data)
-            
-            # Store in Pinecone
-            pinecone.upsert_job_embedding(
-                job_id=job_id,
-                embedding=job_embedding,
-                metadata={
+            job_embeddings = matcher.create_job_embeddings([job_data for job_data, _ in stored_jobs])
+            pinecone.upsert_job_embeddings([
+                (job_id, job_embedding, {
                     'job_id': job_id,
                     'title': job_data['title'],
                     'company': job_data['company'],
                     'type': 'job',
                     'source': job_data['source']  # adzuna or indeed
-                }
-            )
-            
-            logger.debug(f"🔢 Embedding stored in Pinecone")
-            
-            total_stored += 1
-            
+                })
+                for (job_data, job_id), job_embedding in zip(stored_jobs, job_embeddings)
+            ])
+            logger.debug("🔢 %d embeddings stored in Pinecone", len(stored_jobs))
         except Exception as e:
-            logger.error(f"❌ Error processing job: {e}")
-            continue
+            logger.error(f"❌ Error storing embeddings: {e}")
     
-    logger.info(f"🎉 Job scraping complete!")
-    logger.info(f"📊 Summary:")
-    logger.info(f"   - Total fetched: {len(all_jobs)}")
-    logger.info(f"   - New jobs stored: {total_stored}")
+    logger.info(f"🎉 '{keyword}' complete: {total_stored} new of {len(jobs)} fetched")
     
     return {
         'status': 'success',
-        'total_fetched': len(all_jobs),
+        'keyword': keyword,
+        'total_fetched': len(jobs),
         'jobs_stored': total_stored
     }
 
@@ -124,13 +176,13 @@ def cleanup_old_jobs():
     firebase = get_firebase_service()
     pinecone = get_pinecone_service()
     
-    old_jobs = firebase.get_old_jobs(days=30)
+    old_job_ids = [job['id'] for job in firebase.get_old_jobs(days=30)]
     
-    for job in old_jobs:
-        firebase.delete_job(job['id'])
-        pinecone.delete_embedding(f"job_{job['id']}")
+    # Batched deletes: 500 docs per Firestore commit, 1000 ids per Pinecone request
+    deleted = firebase.bulk_delete_jobs(old_job_ids)
+    pinecone.delete_embeddings([f"job_{job_id}" for job_id in old_job_ids])
     
-    logger.info(f"✅ Deleted {len(old_jobs)} old jobs")
+    logger.info(f"✅ Deleted {deleted} old jobs")
 
 
 # Schedule tasks
@@ -0,0 +1,80 @@
+"""
+Import Diagnostics
+Checks every LangChain / RAG import the chatbot needs in a single process
+
+Replaces the old one-off scripts (check_core, debug_imports, deep_import,
+find_qa, inspect_langchain, list_langchain, verify_rag), which each paid
+for a fresh interpreter and a fresh langchain import.
+
+Usage: python diagnose.py
+"""
+
+import importlib
+import importlib.util
+import os
+import sys
+from importlib.metadata import PackageNotFoundError, version
+from typing import Optional
+
+# (label, module path, attribute to look up or None)
+CHECKS = (
+    ("langchain_core RunnablePassthrough", "langchain_core.runnables", "RunnablePassthrough"),
+    ("langchain_core StrOutputParser", "langchain_core.output_parsers", "StrOutputParser"),
+    ("langchain_core PromptTemplate", "langchain_core.prompts", "PromptTemplate"),
+    ("langchain.chains", "langchain.chains", None),
+    ("RetrievalQA in langchain.chains", "langchain.chains", "RetrievalQA"),
+    ("RetrievalQA in langchain.chains.retrieval_qa.base", "langchain.chains.retrieval_qa.base", "RetrievalQA"),
+    ("RetrievalQA in langchain_community.chains", "langchain_community.chains", "RetrievalQA"),
+    ("rag_engine", "app.services.rag_engine", None),
+)
+
+
+def check(label: str, module_path: str, attr: Optional[str] = None) -> bool:
+    """Import a module (only if it can be found) and optionally one attribute"""
+    try:
+        # find_spec locates the module without executing it
+        if importlib.util.find_spec(module_path) is None:
+            print(f"FAILED {label}: {module_path} not installed")
+            return False
+
+        module = importlib.import_module(module_path)
+        if attr:
+            getattr(module, attr)
+
+        print(f"SUCCESS: {label}")
+        return True
+
+    except Exception as e:
+        print(f"FAILED {label}: {e}")
+        return False
+
+
+def describe_langchain():
+    """Print the installed langchain version and package location"""
+    # Targeted metadata lookup (pkg_resources scans all of sys.path on import)
+    try:
+        print(f"LangChain version: {version('langchain')}")
+    except PackageNotFoundError as e:
+        print(f"Could not get version: {e}")
+
+    spec = importlib.util.find_spec("langchain")
+    if spec is None or not spec.origin:
+        print("LangChain not installed")
+        return
+
+    path = os.path.dirname(spec.origin)
+    print(f"LangChain path: {path}")
+    try:
+        print(f"Contents: {sorted(os.listdir(path))}")
+    except Exception as e:
+        print(f"Error listing: {e}")
+
+
+if __name__ == "__main__":
+    print(f"Python: {sys.executable}")
+    describe_langchain()
+
+    # RetrievalQA lives in one of several places depending on the version,
+    # so some FAILED lines are expected
+    results = [check(*entry) for entry in CHECKS]
+    print(f"\n{sum(results)}/{len(results)} checks passed")